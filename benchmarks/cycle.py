@@ -0,0 +1,245 @@
+"""End-to-end benchmark of root_agent decision cycles, replayed offline from a recording.
+
+Usage (from the repository root):
+    python -m benchmarks.cycle --record --fixture benchmarks/fixtures/btc_cycle.jsonl.gz --asset BTC
+    python -m benchmarks.cycle --fixture benchmarks/fixtures/btc_cycle.jsonl.gz --runs 5 --output cycle.json
+    python -m benchmarks.cycle --fixture benchmarks/fixtures/btc_cycle.jsonl.gz --baseline cycle.json --max-regression 0.2
+
+With --record one live cycle is run (it needs every API key, and places a
+real order unless EXCHANGE_BACKEND=simulated) and all its external calls
+(CoinGecko, CryptoPanic, Telegram, OpenAI embeddings, Gemini, the exchange)
+are written to the fixture. Otherwise the fixture is replayed: every cycle
+runs without network access, with the recorded latencies scaled by
+--latency-scale (0 measures only the code of this repository).
+
+Each run starts from cold in-process caches and an empty in-memory trade
+journal. Reported per run, with medians over the runs:
+- wall time of the cycle and of its phases: the root agent's tool calls
+  grouped into discovery / acquisition / execution, and "reasoning" (time
+  spent outside any root-level tool, i.e. mostly root model turns);
+- tool calls and model calls per agent, and external calls per service.
+With --baseline the medians are compared with an earlier --output (e.g. of
+the previous commit): a time more than --max-regression slower (and at least
+--min-delta-seconds), or any extra tool or external call, is a regression
+and makes the benchmark exit with status 1.
+"""
+import argparse
+import asyncio
+from collections import Counter
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Root agent tools by workflow phase (see root_agent/prompt.py)
+PHASES = {
+    "discovery": ("load_policy", "get_market_snapshot", "get_recent_news_from_cryptopanic", "google_search_agent"),
+    "acquisition": ("data_acquisition", "business_analyst_1", "business_analyst_2", "technical_analyst",
+                    "get_trade_history"),
+    "execution": ("submit_trade", "format_trade_request", "policy_enforcer", "trader", "log_policy_rejection"),
+}
+ROOT_AGENT_NAME = "root_agent"
+
+
+def _phase_of(tool_name: str) -> str:
+    for phase, tools in PHASES.items():
+        if tool_name in tools:
+            return phase
+    return "other"
+
+
+def _union_seconds(intervals: list) -> float:
+    """Total length covered by (start, end) intervals, counting overlaps once."""
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _profiler_plugin():
+    from google.adk.plugins.base_plugin import BasePlugin
+
+    class CycleProfiler(BasePlugin):
+        """Times every tool call and counts model calls of every agent in the cycle."""
+
+        def __init__(self):
+            super().__init__(name="cycle_profiler")
+            self.tool_calls = []
+            self.model_calls = Counter()
+            self._started = {}
+
+        async def before_model_callback(self, *, callback_context, llm_request):
+            self.model_calls[callback_context.agent_name] += 1
+            return None
+
+        async def before_tool_callback(self, *, tool, tool_args, tool_context):
+            self._started[tool_context.function_call_id] = time.perf_counter()
+            return None
+
+        def _finish(self, tool, tool_context, ok: bool):
+            started = self._started.pop(tool_context.function_call_id, None)
+            if started is not None:
+                self.tool_calls.append((tool_context.agent_name, tool.name, started, time.perf_counter(), ok))
+
+        async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+            self._finish(tool, tool_context, True)
+            return None
+
+        async def on_tool_error_callback(self, *, tool, tool_args, tool_context, error):
+            self._finish(tool, tool_context, False)
+            return None
+
+    return CycleProfiler()
+
+
+def _reset_caches(work_dir: str):
+    """Cold in-process caches and an empty journal, so every run does the same work."""
+    from root_agent.sub_agents.technical_analyst.tools.volatility import reset_volatility_table
+    from root_agent.sub_agents.trader.tools import portfolio_manager, trade
+    from root_agent.sub_agents.trader.tools.trade_journal import TradeJournal
+    from root_agent.tools.cryptopanic_feed import cryptopanic_feed
+    from root_agent.tools.market_data_cache import market_data_cache
+
+    market_data_cache.clear()
+    cryptopanic_feed.clear()
+    reset_volatility_table()
+    portfolio_manager._binance_client.reset()
+    portfolio_manager.portfolio_snapshot.invalidate()
+    trade.TRADE_LOG_FILE_PATH = os.path.join(work_dir, "trade_log.txt")
+    trade._trade_journal.set(TradeJournal(":memory:"))
+
+
+def run_cycle(cassette, asset: str, work_dir: str) -> dict:
+    """Runs one root agent cycle for `asset` through `cassette` and returns its measurements."""
+    from root_agent.tools.llm_recorder import LlmRecorderPlugin
+    from root_agent.tools.recorder import use_cassette
+    from root_agent.watcher.events import Trigger
+    from root_agent.watcher.watcher import run_agent_cycle_async
+
+    profiler = _profiler_plugin()
+    trigger = Trigger(asset=asset, kind="benchmark", reason=f"benchmark cycle for {asset}", value=0.0,
+                      threshold=0.0, timestamp=time.time())
+    with use_cassette(cassette):
+        _reset_caches(work_dir)
+        started = time.perf_counter()
+        asyncio.run(run_agent_cycle_async(trigger, plugins=[profiler, LlmRecorderPlugin()]))
+        wall = time.perf_counter() - started
+
+    root_calls = [call for call in profiler.tool_calls if call[0] == ROOT_AGENT_NAME]
+    phases = {phase: _union_seconds([(s, e) for _, name, s, e, _ in root_calls if _phase_of(name) == phase])
+              for phase in (*PHASES, "other")}
+    phases["reasoning"] = wall - _union_seconds([(s, e) for _, _, s, e, _ in root_calls])
+    tools = Counter(f"{agent}.{name}" for agent, name, *_ in profiler.tool_calls)
+    return {
+        "wall_seconds": wall,
+        "phase_seconds": phases,
+        "tool_calls": dict(tools),
+        "tool_errors": sum(1 for *_, ok in profiler.tool_calls if not ok),
+        "model_calls": dict(profiler.model_calls),
+        "external_calls": cassette.stats()["calls"],
+        "replay_misses": cassette.stats()["misses"],
+    }
+
+
+def summarize(runs: list) -> dict:
+    """Medians of the timings; counts are taken from the last run (replays are deterministic)."""
+    last = runs[-1]
+    return {
+        "commit": _git_commit(),
+        "runs": len(runs),
+        "wall_seconds": round(statistics.median(r["wall_seconds"] for r in runs), 3),
+        "phase_seconds": {phase: round(statistics.median(r["phase_seconds"][phase] for r in runs), 3)
+                          for phase in last["phase_seconds"]},
+        **{name: last[name] for name in ("tool_calls", "tool_errors", "model_calls", "external_calls", "replay_misses")},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, max_regression: float, min_delta_seconds: float) -> list[str]:
+    """Regressions of `current` against `baseline` (both `summarize` results)."""
+    regressions = []
+    timings = {"wall": (current["wall_seconds"], baseline["wall_seconds"])}
+    for phase, seconds in current["phase_seconds"].items():
+        timings[phase] = (seconds, baseline["phase_seconds"].get(phase, 0.0))
+    for name, (now, before) in timings.items():
+        if now - before >= min_delta_seconds and now > before * (1 + max_regression):
+            regressions.append(f"{name} time {before:.3f}s -> {now:.3f}s")
+    for group in ("tool_calls", "external_calls", "model_calls"):
+        for name, count in current[group].items():
+            before = baseline[group].get(name, 0)
+            if count > before:
+                regressions.append(f"{group} {name}: {before} -> {count}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", required=True, help="Recording to replay (or to write with --record)")
+    parser.add_argument("--record", action="store_true", help="Run one live cycle and record it")
+    parser.add_argument("--asset", default="BTC", help="Asset of the triggered cycle")
+    parser.add_argument("--runs", type=int, default=3, help="Replayed cycles")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier of the recorded latencies")
+    parser.add_argument("--output", help="Write the summary JSON here (a baseline for later runs)")
+    parser.add_argument("--baseline", help="Summary JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Tolerated relative slowdown")
+    parser.add_argument("--min-delta-seconds", type=float, default=0.05,
+                        help="Slowdowns smaller than this are never regressions")
+    args = parser.parse_args()
+
+    from root_agent.tools.recorder import Cassette
+
+    # Per-call INFO lines would dominate the output and the timings
+    for name in ("root_agent", "google_adk"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    runs = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.record:
+            runs.append(run_cycle(Cassette(args.fixture, mode="record"), args.asset, work_dir))
+        else:
+            cassette = Cassette(args.fixture, mode="replay", latency_scale=args.latency_scale)
+            for _ in range(args.runs):
+                cassette.rewind()
+                runs.append(run_cycle(cassette, args.asset, work_dir))
+                # Counters are per run
+                cassette.calls.clear()
+                cassette.misses.clear()
+    summary = summarize(runs)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    failed = False
+    if summary["replay_misses"]:
+        print(f"FAIL: calls missing from the recording: {summary['replay_misses']}")
+        failed = True
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline, args.max_regression, args.min_delta_seconds)
+        for regression in regressions:
+            print(f"REGRESSION vs {baseline.get('commit') or args.baseline}: {regression}")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
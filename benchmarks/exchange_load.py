@@ -0,0 +1,156 @@
+"""Load test of make_trade and load_portfolio against the simulated exchange.
+
+Usage (from the repository root):
+    python -m benchmarks.exchange_load --order-rate 300 --portfolio-rate 100 --duration 10
+    python -m benchmarks.exchange_load --latency-ms 20 --jitter-ms 10 --error-rate 0.01 --max-p99-ms 100
+
+Selects the simulated backend (EXCHANGE_BACKEND=simulated) with the given
+latency and injected failures, then issues MARKET orders through make_trade
+and portfolio reads through load_portfolio at fixed open-loop rates from a
+thread pool. Latency is measured from each call's scheduled start, so time
+spent queueing behind slow calls counts (no coordinated omission). Reports
+achieved throughput, p50/p95/p99/max latency and error counts per operation;
+exits with status 1 when an operation's p99 exceeds --max-p99-ms.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+PRICES = {"BTC": 67000.0, "ETH": 3500.0, "SOL": 150.0}
+COIN_IDS = {"BTC": "bitcoin", "ETH": "ethereum", "SOL": "solana"}
+
+
+def _percentiles(latencies: list) -> dict:
+    if not latencies:
+        return {}
+    values = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "max_ms": round(float(values.max()), 2),
+    }
+
+
+def run_load(operation, rate: float, duration: float, pool: ThreadPoolExecutor, results: dict):
+    """Schedules `operation(i)` `rate` times per second for `duration` seconds (open loop)."""
+    latencies, errors, lock = [], [0], threading.Lock()
+
+    def call(i: int, scheduled: float):
+        try:
+            ok = operation(i)
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    futures = []
+    for i in range(int(rate * duration)):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(pool.submit(call, i, scheduled))
+    for future in futures:
+        future.result()
+    wall = time.perf_counter() - started
+    results.update({
+        "calls": len(latencies),
+        "errors": errors[0],
+        "target_per_second": rate,
+        "achieved_per_second": round(len(latencies) / wall, 1),
+        **_percentiles(latencies),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--order-rate", type=float, default=300.0, help="make_trade calls per second")
+    parser.add_argument("--portfolio-rate", type=float, default=100.0, help="load_portfolio calls per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--workers", type=int, default=64, help="Concurrent callers")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mean simulated exchange latency")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="Standard deviation of that latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of exchange calls rejected")
+    parser.add_argument("--lost-response-rate", type=float, default=0.0, help="Share of orders whose response is lost")
+    parser.add_argument("--portfolio-staleness", type=float, default=None,
+                        help="Override PORTFOLIO_MAX_STALENESS_SECONDS (0 forces an exchange call per read)")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Fail when an operation's p99 exceeds this")
+    args = parser.parse_args()
+
+    os.environ["EXCHANGE_BACKEND"] = "simulated"
+    os.environ["SIMULATED_EXCHANGE_PRICES"] = json.dumps(PRICES)
+    os.environ["SIMULATED_EXCHANGE_BALANCES"] = json.dumps({"USDT": 1e12, **{asset: 1e9 for asset in PRICES}})
+    os.environ["SIMULATED_EXCHANGE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["SIMULATED_EXCHANGE_LATENCY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["SIMULATED_EXCHANGE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["SIMULATED_EXCHANGE_LOST_RESPONSE_RATE"] = str(args.lost_response_rate)
+
+    from root_agent.sub_agents.trader.tools import portfolio_manager
+    from root_agent.tools.market_data_cache import market_data_cache
+
+    portfolio_manager._binance_client.reset()
+    exchange = portfolio_manager.get_binance_client()
+    if args.portfolio_staleness is not None:
+        portfolio_manager.portfolio_snapshot.max_staleness_seconds = args.portfolio_staleness
+    quiet = portfolio_manager.logger.level
+    portfolio_manager.logger.setLevel("CRITICAL")
+
+    # Valuation prices come from the market-data cache: keep it primed so no request leaves the process
+    stop = threading.Event()
+    def prime():
+        while not stop.is_set():
+            market_data_cache.prime_prices({COIN_IDS[asset]: price for asset, price in PRICES.items()})
+            stop.wait(1.0)
+    threading.Thread(target=prime, daemon=True).start()
+
+    assets = list(PRICES)
+    def order(i: int) -> bool:
+        asset = assets[i % len(assets)]
+        side = "BUY" if (i // len(assets)) % 2 == 0 else "SELL"
+        result = portfolio_manager.make_trade(f"{asset}USDT", side, 0.001, "MARKET", 0.0, 0.0, "GTC")
+        return result is not None
+
+    def portfolio(i: int) -> bool:
+        _, total_value_usd = portfolio_manager.load_portfolio()
+        return total_value_usd > 0
+
+    results = {"make_trade": {}, "load_portfolio": {}}
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        loads = [threading.Thread(target=run_load, args=(order, args.order_rate, args.duration, pool, results["make_trade"]))]
+        if args.portfolio_rate > 0:
+            loads.append(threading.Thread(target=run_load, args=(portfolio, args.portfolio_rate, args.duration,
+                                                                 pool, results["load_portfolio"])))
+        for thread in loads:
+            thread.start()
+        for thread in loads:
+            thread.join()
+    stop.set()
+    portfolio_manager.logger.setLevel(quiet)
+
+    results["exchange_calls"] = dict(exchange.calls)
+    results["injected_errors"] = dict(exchange.injected_errors)
+    results["portfolio_snapshot_refreshes"] = portfolio_manager.portfolio_snapshot.exchange_calls
+    print(json.dumps(results, indent=2))
+
+    failed = False
+    for name in ("make_trade", "load_portfolio"):
+        p99 = results[name].get("p99_ms")
+        if args.max_p99_ms is not None and p99 is not None and p99 > args.max_p99_ms:
+            print(f"FAIL: {name} p99 {p99:.1f} ms exceeds budget {args.max_p99_ms:.1f} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
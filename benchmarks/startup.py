@@ -0,0 +1,75 @@
+"""Startup-time benchmark for the root_agent package.
+
+Usage (from the repository root):
+    python -m benchmarks.startup --runs 5 --max-import-seconds 3.0
+
+Each run starts a fresh interpreter, measures the cold import of
+`root_agent.agent`, checks that no heavy client library was imported eagerly,
+and times the first call of a few tools that need no network access. Exits
+with status 1 when the median import time exceeds the budget or a heavy
+module was imported at startup, so regressions fail CI.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Libraries that must only be imported when the corresponding tool is first used
+LAZY_MODULES = ("binance", "chromadb", "telethon", "pandas", "openai")
+
+_PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+import root_agent.agent
+import_seconds = time.perf_counter() - started
+eager = [name for name in LAZY_MODULES if name in sys.modules]
+
+from root_agent.sub_agents.policy_enforcer.tools.policy_loading import load_policy
+from root_agent.sub_agents.trader.tools.trade import get_trade_history
+
+first_call = {}
+for name, call in (("load_policy", lambda: load_policy("safe")),
+                   ("get_trade_history", lambda: get_trade_history(limit=15))):
+    started = time.perf_counter()
+    call()
+    first_call[name] = time.perf_counter() - started
+
+print(json.dumps({"import_seconds": import_seconds, "eager_modules": eager, "first_call_seconds": first_call}))
+"""
+
+
+def run_once() -> dict:
+    probe = f"LAZY_MODULES = {LAZY_MODULES!r}\n{_PROBE}"
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-seconds", type=float, default=None,
+                        help="Fail when the median cold import time exceeds this budget")
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    import_times = [r["import_seconds"] for r in results]
+    median_import = statistics.median(import_times)
+    print(f"import root_agent.agent: median {median_import:.3f}s, min {min(import_times):.3f}s, max {max(import_times):.3f}s")
+    for tool in results[0]["first_call_seconds"]:
+        tool_times = [r["first_call_seconds"][tool] for r in results]
+        print(f"first {tool}() call: median {statistics.median(tool_times) * 1000:.1f} ms")
+
+    eager = sorted({name for r in results for name in r["eager_modules"]})
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup instead of lazily: {', '.join(eager)}")
+        failed = True
+    if args.max_import_seconds is not None and median_import > args.max_import_seconds:
+        print(f"FAIL: median import time {median_import:.3f}s exceeds budget {args.max_import_seconds:.3f}s")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Size of get_crypto_technical_data's output in the nested, compact and table forms.
+
+Usage (from the repository root):
+    python -m benchmarks.technical_payload
+    python -m benchmarks.technical_payload --fixture benchmarks/fixtures/btc_cycle.jsonl.gz --count-tokens
+
+Builds the tool result for the same CoinGecko /coins/{id} responses in every
+output form and reports its JSON size and token count. The responses come
+from a recorded cycle (--fixture, see benchmarks.cycle) or, by default, from
+synthetic responses shaped like CoinGecko's. Tokens are estimated at four
+characters per token unless --count-tokens asks Gemini's count_tokens
+endpoint (needs credentials). Every token of the tool result is paid again on
+each later model turn of the technical analyst, and was paid once more when
+the analyst pasted it verbatim into its report.
+"""
+import argparse
+import gzip
+import json
+import math
+
+COINS = {"bitcoin": ("btc", 67250.12), "ethereum": ("eth", 3512.47), "solana": ("sol", 151.883)}
+CHARS_PER_TOKEN = 4
+
+
+def synthetic_coin_response(coin_id: str, symbol: str, price: float) -> dict:
+    """A /coins/{id} response with realistic magnitudes (only the fields the tool reads)."""
+    supply = 19_700_000.0 if symbol == "btc" else 120_000_000.0
+    def quoted(usd_value, coin_value):
+        return {"usd": usd_value, symbol: coin_value, "eur": usd_value * 0.92}
+    return {
+        "id": coin_id,
+        "symbol": symbol,
+        "sentiment_votes_up_percentage": 71.43,
+        "sentiment_votes_down_percentage": 28.57,
+        "watchlist_portfolio_users": 1_823_113,
+        "market_cap_rank": 1,
+        "market_data": {
+            "current_price": quoted(price, 1.0),
+            "market_cap": quoted(price * supply, supply),
+            "ath": quoted(price * 1.1213, 1.003),
+            "ath_change_percentage": quoted(-10.81234, -0.30123),
+            "atl": quoted(price * 0.00098, 0.99897),
+            "atl_change_percentage": quoted(101823.4412, 0.10245),
+            "fully_diluted_valuation": quoted(price * 21_000_000, 21_000_000.0),
+            "market_cap_fdv_ratio": 0.94,
+            "total_volume": quoted(price * 412_345.678, 412_345.678),
+            "high_24h": quoted(price * 1.0213, 1.0),
+            "low_24h": quoted(price * 0.9712, 1.0),
+            "price_change_24h": price * 0.01234567,
+            "price_change_percentage_24h": 1.234567,
+            "price_change_percentage_7d": -3.456789,
+            "price_change_percentage_14d": 5.678912,
+            "price_change_percentage_30d": 12.345678,
+            "price_change_percentage_60d": -7.891234,
+            "price_change_percentage_200d": 45.678912,
+            "price_change_percentage_1y": 110.123456,
+            "market_cap_change_24h": price * supply * 0.0123,
+            "market_cap_change_percentage_24h": 1.2345678,
+            "total_supply": supply,
+            "max_supply": 21_000_000.0 if symbol == "btc" else None,
+            "circulating_supply": supply,
+        },
+    }
+
+
+def recorded_coin_responses(path: str) -> dict:
+    """/coins/{id} responses of a recorded cycle, by coin id."""
+    responses = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            entry = json.loads(line)
+            route = entry.get("route") or ""
+            if entry["service"] == "coingecko" and route.startswith("coins/") and route.count("/") == 1:
+                if "response" in entry:
+                    responses[route.split("/", 1)[1]] = entry["response"]
+    return responses
+
+
+def _token_counter(count_tokens: bool):
+    if not count_tokens:
+        return lambda text: math.ceil(len(text) / CHARS_PER_TOKEN)
+    from google import genai
+    client = genai.Client()
+    return lambda text: client.models.count_tokens(model="gemini-2.5-flash", contents=text).total_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", help="Recorded cycle to take the CoinGecko responses from")
+    parser.add_argument("--currency", default="usd")
+    parser.add_argument("--count-tokens", action="store_true", help="Count tokens with Gemini instead of estimating")
+    args = parser.parse_args()
+
+    from root_agent.sub_agents.technical_analyst.tools.get_crypto_technical_data import (
+        _build_technical_data, compact_technical_data,
+    )
+
+    if args.fixture:
+        responses = recorded_coin_responses(args.fixture)
+    else:
+        responses = {coin_id: synthetic_coin_response(coin_id, symbol, price)
+                     for coin_id, (symbol, price) in COINS.items()}
+    count = _token_counter(args.count_tokens)
+
+    nested, compact = {}, {}
+    for coin_id, response in responses.items():
+        symbol = response.get("symbol", coin_id)
+        data = _build_technical_data(response, symbol, args.currency)
+        data.update(volatility_1d=3.41, volatility_1d_valid=True)
+        nested[coin_id] = data
+        compact[coin_id] = compact_technical_data(data, args.currency)
+    columns = list(dict.fromkeys(key for record in compact.values() for key in record))
+    table = {"currency": args.currency, "columns": columns,
+             "rows": {coin_id: [record.get(column) for column in columns] for coin_id, record in compact.items()}}
+
+    def size(payloads: list) -> dict:
+        texts = [json.dumps(payload) for payload in payloads]
+        return {"bytes": sum(len(text) for text in texts), "tokens": sum(count(text) for text in texts)}
+
+    results = {
+        "coins": len(responses),
+        "nested": size(list(nested.values())),
+        "compact": size(list(compact.values())),
+        "table": size([table]),
+    }
+    base = results["nested"]["tokens"]
+    for form in ("compact", "table"):
+        results[form]["token_reduction_pct"] = round(100 * (1 - results[form]["tokens"] / base), 1) if base else 0.0
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of the reverse-seek trade log reader on a synthetic audit log.
+
+Usage (from the repository root):
+    python -m benchmarks.trade_log_tail --size-mb 1024 --limit 15
+
+Generates a log of plain-text and JSON lines in the same format `trade.py`
+writes, then compares `tail_trade_log` with reading the whole file via
+`readlines()` (the previous implementation of `get_trade_history`).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from root_agent.sub_agents.trader.tools.log_tail import tail_trade_log
+
+
+def write_synthetic_log(path: str, size_mb: int):
+    """Writes plain-text HOLD/BOUGHT lines and JSON audit lines until the file reaches `size_mb`."""
+    target = size_mb * 1024 * 1024
+    request = {
+        "id": str(uuid.uuid4()),
+        "action": "buy",
+        "asset": {"symbol": "btc", "coin_id": "bitcoin", "current_price_usd": 67000.0, "currency": "usd"},
+        "position": {"quantity": 0.01, "position_size_percent": 3.2, "entry_price": 67000.0, "order_type": "limit"},
+        "rationale": "Synthetic benchmark entry " + "x" * 200,
+    }
+    audit_line = json.dumps({"timestamp": "2026-01-01T00:00:00Z", "trade_request": request,
+                             "execution": {"status": "executed", "result": {}}}) + "\n"
+    text_line = "2026-01-01T00:00:00Z - HOLD - bitcoin (btc) at 67000.0 usd\n"
+    block = (text_line + audit_line) * 1000
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            f.write(block)
+            written += len(block)
+
+
+def naive_tail(path: str, limit: int) -> list:
+    with open(path, "r") as f:
+        lines = f.readlines()
+    return list(reversed(lines))[:limit]
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "trade_log_benchmark.txt"))
+    parser.add_argument("--skip-naive", action="store_true", help="Do not run the readlines() baseline")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path) or os.path.getsize(args.path) < args.size_mb * 1024 * 1024:
+        print(f"Writing synthetic log of {args.size_mb} MB to {args.path}")
+        write_synthetic_log(args.path, args.size_mb)
+
+    entries, elapsed, peak = measure(tail_trade_log, args.path, args.limit)
+    print(f"tail_trade_log(limit={args.limit}): {elapsed * 1000:.2f} ms, peak {peak / 1024:.0f} KiB, {len(entries)} entries")
+
+    if not args.skip_naive:
+        _, elapsed, peak = measure(naive_tail, args.path, args.limit)
+        print(f"readlines() baseline: {elapsed * 1000:.2f} ms, peak {peak / 1024 / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
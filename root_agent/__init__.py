@@ -1 +1 @@
-from .agent import root_agent
\ No newline at end of file
+from .agent import app, root_agent
\ No newline at end of file
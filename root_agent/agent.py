@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
+from google.adk.apps import App
 from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 from google.genai import types
@@ -10,12 +11,17 @@ import sys  # Potrzebne do przekierowania na stdout
 
 from . import prompt
 from .tools.trade_request_formatter import format_trade_request
+from .tools.trade_pipeline import submit_trade
+from .tools.market_snapshot import get_market_snapshot
+from .tools.llm_usage import LlmUsagePlugin
+from .tools.tracing_plugin import TracingPlugin
 
 from .sub_agents.business_analyst_1.agent import business_analyst_1
 from .sub_agents.business_analyst_2.agent import business_analyst_2
 from .sub_agents.technical_analyst.agent import technical_analyst
 from .sub_agents.policy_enforcer.agent import policy_enforcer
 from .sub_agents.trader.agent import trader
+from .sub_agents.data_acquisition.agent import data_acquisition
 from .sub_agents.trader.tools.trade import get_trade_history, log_policy_rejection
 from .sub_agents.business_analyst_1.sub_agents.google_search_agent.agent import google_search_agent
 from .sub_agents.business_analyst_1.tools.cryptopanic_news_tool import get_recent_news_from_cryptopanic
@@ -63,17 +69,23 @@ root_agent = LlmAgent(
     description='Oversees business and technical cryptocurrencies analysts.',
     static_instruction=types.Content(role="system", parts=[types.Part(text=selected_prompt)]),
     tools=[
+        AgentTool(agent=data_acquisition),
         AgentTool(agent=business_analyst_1),
         AgentTool(agent=business_analyst_2),
         AgentTool(agent=technical_analyst),
         AgentTool(agent=policy_enforcer),
         AgentTool(agent=trader),
         AgentTool(agent=google_search_agent),
+        submit_trade,
         format_trade_request,
         log_policy_rejection,
         get_trade_history,
         get_recent_news_from_cryptopanic,
+        get_market_snapshot,
         load_policy
     ],
     generate_content_config=my_config,
-)
\ No newline at end of file
+)
+
+# Entry point of `adk web` / `adk run`: the plugins apply to every agent of the tree
+app = App(name="root_agent", root_agent=root_agent, plugins=[TracingPlugin(), LlmUsagePlugin()])
@@ -0,0 +1,3 @@
+from .data import PriceHistory, history_from_ohlcv_store, load_decisions_jsonl, load_price_history, synthetic_history
+from .engine import Backtester, BacktestResult, replay_environment
+from .strategies import Decision, decisions_from_journal, sma_crossover
@@ -0,0 +1,86 @@
+"""Offline backtest of the deterministic trading stack.
+
+Usage (from the repository root):
+    python -m root_agent.backtest --synthetic-days 730 --symbols BTC ETH SOL
+    python -m root_agent.backtest --prices prices.npz --decisions decisions.jsonl --policy safe
+    python -m root_agent.backtest --coingecko-days 90 --symbols BTC ETH --journal trade_journal.sqlite
+
+Prices come from a `.npz`/CSV file (--prices), the local OHLCV store
+(--coingecko-days) or a synthetic random walk (--synthetic-days). Decisions
+are replayed from a JSON-lines file (--decisions), from the execution records
+of a trade journal (--journal), or generated by the SMA crossover strategy.
+Every decision runs through submit_trade against a simulated exchange; the
+report lists decisions/sec, policy rejection rates and the equity curve.
+"""
+import argparse
+import json
+import time
+
+from .data import history_from_ohlcv_store, load_decisions_jsonl, load_price_history, synthetic_history
+from .engine import Backtester
+from .strategies import Decision, decisions_from_journal, sma_crossover
+from ..sub_agents.trader.tools.portfolio_manager import ALLOWED_ASSETS
+from ..sub_agents.trader.tools.simulated_exchange import DEFAULT_FEE_RATE
+from ..sub_agents.trader.tools.trade_journal import TradeJournal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--prices", help="Price history: .npz or CSV with a 'timestamp,<SYMBOL>,...' header")
+    source.add_argument("--synthetic-days", type=float, help="Days of synthetic random-walk prices")
+    source.add_argument("--coingecko-days", type=float, help="Days of history from the local OHLCV store")
+    parser.add_argument("--symbols", nargs="*", default=["BTC", "ETH", "SOL"])
+    parser.add_argument("--interval", type=int, default=60, help="Synthetic grid spacing in seconds")
+    parser.add_argument("--resolution", default="1h", help="OHLCV store resolution for --coingecko-days")
+    parser.add_argument("--decisions", help="JSON-lines file of recorded decisions")
+    parser.add_argument("--journal", help="Trade journal (.sqlite) whose recorded decisions are replayed")
+    parser.add_argument("--fast", type=int, default=60, help="Fast SMA length (grid points) of the scripted strategy")
+    parser.add_argument("--slow", type=int, default=240, help="Slow SMA length (grid points) of the scripted strategy")
+    parser.add_argument("--size", type=float, default=10.0, help="Percent of the portfolio spent per BUY")
+    parser.add_argument("--policy", default="aggressive")
+    parser.add_argument("--balance", type=float, default=10000.0, help="Starting USDT balance")
+    parser.add_argument("--fee", type=float, default=DEFAULT_FEE_RATE)
+    parser.add_argument("--equity-every", type=int, default=60, help="Equity curve sampling in grid points")
+    parser.add_argument("--history-every", type=int, default=1, help="Read the trade history every n decisions (0: never)")
+    parser.add_argument("--equity-csv", help="Write the equity curve to this CSV file")
+    parser.add_argument("--verbose", action="store_true", help="Keep per-trade logging during the replay")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.prices:
+        history = load_price_history(args.prices)
+    elif args.synthetic_days:
+        history = synthetic_history(args.symbols, args.synthetic_days, args.interval)
+    else:
+        end = int(time.time())
+        assets = {symbol.upper(): ALLOWED_ASSETS[symbol.upper()] for symbol in args.symbols}
+        history = history_from_ohlcv_store(assets, end - int(args.coingecko_days * 86400), end, args.resolution)
+    loaded = time.perf_counter()
+
+    if args.decisions:
+        decisions = [Decision.from_dict(d) for d in load_decisions_jsonl(args.decisions)]
+    elif args.journal:
+        journal = TradeJournal(args.journal)
+        decisions = decisions_from_journal(journal)
+        journal.close()
+    else:
+        decisions = sma_crossover(history, args.fast, args.slow, args.size)
+    generated = time.perf_counter()
+
+    backtester = Backtester(history, decisions, {"USDT": args.balance}, policy_type=args.policy, fee_rate=args.fee,
+                            equity_every=args.equity_every, history_every=args.history_every, quiet=not args.verbose)
+    result = backtester.run()
+
+    summary = result.summary()
+    summary["load_seconds"] = round(loaded - started, 3)
+    summary["decision_generation_seconds"] = round(generated - loaded, 3)
+    summary["total_seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary, indent=2))
+    if args.equity_csv:
+        result.write_equity_csv(args.equity_csv)
+        print(f"Equity curve ({len(result.equity)} points) written to {args.equity_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from datetime import datetime, UTC
+import json
+import pathlib
+
+import numpy as np
+
+from ..tools.ohlcv_store import RESOLUTIONS, get_ohlcv_store
+
+
+@dataclass
+class PriceHistory:
+    """Prices of several assets on one shared time grid.
+
+    `prices[i, j]` is the USDT price of `symbols[i]` at `times[j]` (epoch
+    seconds, ascending). `market_caps` has the same shape when known.
+    """
+    symbols: list[str]
+    times: np.ndarray
+    prices: np.ndarray
+    market_caps: np.ndarray | None = None
+
+    def __post_init__(self):
+        self.symbols = [symbol.upper() for symbol in self.symbols]
+        self.times = np.asarray(self.times, dtype=np.int64)
+        self.prices = np.atleast_2d(np.asarray(self.prices, dtype=np.float64))
+        if self.prices.shape != (len(self.symbols), len(self.times)):
+            raise ValueError(f"prices must be shaped (assets, times), got {self.prices.shape}")
+
+    @property
+    def interval_seconds(self) -> int:
+        return int(np.median(np.diff(self.times))) if len(self.times) > 1 else 0
+
+    def index_of(self, timestamps) -> np.ndarray:
+        """Index of the last grid time at or before each timestamp (-1 before the first)."""
+        return np.searchsorted(self.times, np.asarray(timestamps, dtype=np.int64), side="right") - 1
+
+    def save(self, path: str | pathlib.Path):
+        """Writes the history as a `.npz` file, the fastest format to load again."""
+        arrays = {"symbols": np.array(self.symbols), "times": self.times, "prices": self.prices}
+        if self.market_caps is not None:
+            arrays["market_caps"] = self.market_caps
+        np.savez(path, **arrays)
+
+
+def _epoch_seconds(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    # Millisecond timestamps (as exported by CoinGecko/Binance) are converted to seconds
+    if len(values) and values.max() > 1e11:
+        values = values / 1000
+    return values.astype(np.int64)
+
+
+def load_price_history(path: str | pathlib.Path) -> PriceHistory:
+    """Loads a price history from `.npz` (see `PriceHistory.save`) or a wide CSV file.
+
+    The CSV has a header `timestamp,<SYMBOL>,<SYMBOL>,...` and one row per time
+    (epoch seconds or milliseconds), e.g. `1700000000,37000.5,2050.1`.
+    """
+    path = pathlib.Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            return PriceHistory(
+                symbols=[str(s) for s in data["symbols"]],
+                times=data["times"],
+                prices=data["prices"],
+                market_caps=data["market_caps"] if "market_caps" in data else None,
+            )
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline().strip().split(",")
+    table = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    order = np.argsort(table[:, 0], kind="stable")
+    return PriceHistory(symbols=header[1:], times=_epoch_seconds(table[order, 0]), prices=table[order, 1:].T)
+
+
+def history_from_ohlcv_store(assets: dict, start: int, end: int, resolution: str = "1h",
+                             currency: str = "usd") -> PriceHistory:
+    """Builds a history from the local OHLCV store, fetching missing ranges from CoinGecko.
+
+    Every asset is forward-filled onto a common grid of the resolution's spacing;
+    the grid starts once every asset has a price.
+
+    Args:
+        assets (dict): {symbol: coingecko_id}.
+        start (int): First time (epoch seconds).
+        end (int): Last time (epoch seconds).
+        resolution (str, optional): "5m", "1h" or "1d". Defaults to "1h".
+    """
+    spacing = RESOLUTIONS[resolution][0]
+    grid = np.arange(int(start) // spacing * spacing, int(end) + 1, spacing, dtype=np.int64)
+    store = get_ohlcv_store()
+    prices = np.full((len(assets), len(grid)), np.nan)
+    market_caps = np.full((len(assets), len(grid)), np.nan)
+    for i, coin_id in enumerate(assets.values()):
+        points = store.window(coin_id, start, end, resolution, currency)
+        index = np.searchsorted(points["t"], grid, side="right") - 1
+        known = index >= 0
+        prices[i, known] = points["price"][index[known]]
+        market_caps[i, known] = points["market_cap"][index[known]]
+    complete = ~np.isnan(prices).any(axis=0)
+    if not complete.any():
+        raise ValueError("No time at which every asset has a price")
+    first = int(complete.argmax())
+    return PriceHistory(list(assets), grid[first:], prices[:, first:], market_caps[:, first:])
+
+
+def synthetic_history(symbols: list[str], days: float, interval_seconds: int = 60, start: int | None = None,
+                      start_prices: dict | None = None, daily_volatility: float = 0.04,
+                      seed: int = 0) -> PriceHistory:
+    """Geometric random-walk prices, for throughput tests without market data.
+
+    Args:
+        symbols (list[str]): Asset symbols.
+        days (float): Length of the history.
+        interval_seconds (int, optional): Grid spacing. Defaults to 60 (minute data).
+        start (int, optional): First time (epoch seconds). Defaults to `days` before now.
+        start_prices (dict, optional): First price by symbol. Defaults to 100.0.
+        daily_volatility (float, optional): Standard deviation of daily log returns. Defaults to 0.04.
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+    steps = int(days * 86400 // interval_seconds)
+    start = int(start if start is not None else datetime.now(UTC).timestamp() - steps * interval_seconds)
+    times = start + np.arange(steps, dtype=np.int64) * interval_seconds
+    rng = np.random.default_rng(seed)
+    step_volatility = daily_volatility * np.sqrt(interval_seconds / 86400)
+    log_returns = rng.normal(0.0, step_volatility, size=(len(symbols), steps))
+    log_returns[:, 0] = 0.0
+    first = np.array([(start_prices or {}).get(symbol.upper(), 100.0) for symbol in symbols], dtype=np.float64)
+    prices = first[:, None] * np.exp(np.cumsum(log_returns, axis=1))
+    return PriceHistory(list(symbols), times, prices)
+
+
+def load_decisions_jsonl(path: str | pathlib.Path) -> list[dict]:
+    """Reads recorded decisions, one JSON object per line (see `Decision.from_dict`)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
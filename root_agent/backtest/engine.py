@@ -0,0 +1,300 @@
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+import logging
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from .data import PriceHistory
+from .strategies import Decision
+from ..sub_agents.technical_analyst.tools.volatility import pin_volatility_table
+from ..sub_agents.trader.tools import portfolio_manager, trade
+from ..sub_agents.trader.tools.simulated_exchange import DEFAULT_FEE_RATE, QUOTE_ASSET, SimulatedExchange
+from ..sub_agents.trader.tools.trade_journal import TradeJournal, set_clock
+from ..tools.market_data_cache import market_data_cache
+from ..tools.trade_pipeline import submit_trade
+
+logger = logging.getLogger("root_agent")
+
+# Market cap assumed when the history has none (the policy's minimum market cap check needs one)
+DEFAULT_MARKET_CAP_USD = 1e12
+
+# Stop distance used when a decision does not set a stop price
+DEFAULT_STOP_LOSS_PERCENT = 5.0
+
+DAY_SECONDS = 86400
+
+
+@dataclass
+class BacktestResult:
+    """Throughput, policy outcomes and equity curve of one backtest run."""
+    decisions: int
+    wall_seconds: float
+    statuses: dict
+    rejections_by_field: dict
+    equity_times: np.ndarray
+    equity: np.ndarray
+    fills: int
+    history_reads: int
+    policy_type: str
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def decisions_per_second(self) -> float:
+        return self.decisions / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.statuses.get("rejected", 0) / self.decisions if self.decisions else 0.0
+
+    @property
+    def return_percent(self) -> float:
+        if len(self.equity) == 0 or self.equity[0] == 0:
+            return 0.0
+        return float(self.equity[-1] / self.equity[0] - 1) * 100
+
+    @property
+    def max_drawdown_percent(self) -> float:
+        if len(self.equity) == 0:
+            return 0.0
+        peaks = np.maximum.accumulate(self.equity)
+        return float(np.max((peaks - self.equity) / peaks)) * 100
+
+    def summary(self) -> dict:
+        return {
+            "policy_type": self.policy_type,
+            "decisions": self.decisions,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "decisions_per_second": round(self.decisions_per_second, 1),
+            "statuses": dict(self.statuses),
+            "rejection_rate": round(self.rejection_rate, 4),
+            "rejections_by_field": dict(self.rejections_by_field),
+            "fills": self.fills,
+            "history_reads": self.history_reads,
+            "initial_equity": round(float(self.equity[0]), 2) if len(self.equity) else None,
+            "final_equity": round(float(self.equity[-1]), 2) if len(self.equity) else None,
+            "return_percent": round(self.return_percent, 2),
+            "max_drawdown_percent": round(self.max_drawdown_percent, 2),
+            **self.extra,
+        }
+
+    def write_equity_csv(self, path: str):
+        """Writes the equity curve as `timestamp,equity_usd` rows."""
+        np.savetxt(path, np.column_stack([self.equity_times, self.equity]), delimiter=",",
+                   header="timestamp,equity_usd", comments="", fmt=["%d", "%.2f"])
+
+
+@contextmanager
+def replay_environment(exchange: SimulatedExchange, policy_type: str, work_dir: str, quiet: bool = True):
+    """Points the trading stack at a simulated exchange, clock and journal for the duration of a replay.
+
+    Swaps in: the exchange as the Binance client, an in-memory trade journal, a
+    trade log file under `work_dir`, the policy type and, with `quiet`, a CRITICAL
+    log level that hides the per-trade INFO/WARNING/ERROR lines (the result
+    counts rejections and errors instead). The journal clock and the volatility
+    table are driven by the caller. Everything is restored (or reset to be
+    re-created lazily) on exit, and the simulated prices are dropped from the
+    shared market-data cache.
+    """
+    previous_log_path = trade.TRADE_LOG_FILE_PATH
+    previous_policy = os.environ.get("TRADING_STRATEGY")
+    previous_level = logger.level
+    journal = TradeJournal(":memory:")
+
+    trade.TRADE_LOG_FILE_PATH = os.path.join(work_dir, "trade_log.txt")
+    trade._trade_journal.set(journal)
+    portfolio_manager._binance_client.set(exchange)
+    portfolio_manager.portfolio_snapshot.invalidate()
+    os.environ["TRADING_STRATEGY"] = policy_type
+    if quiet:
+        logger.setLevel(logging.CRITICAL)
+    try:
+        yield journal
+    finally:
+        logger.setLevel(previous_level)
+        if previous_policy is None:
+            os.environ.pop("TRADING_STRATEGY", None)
+        else:
+            os.environ["TRADING_STRATEGY"] = previous_policy
+        trade.TRADE_LOG_FILE_PATH = previous_log_path
+        trade._trade_journal.reset()
+        portfolio_manager._binance_client.reset()
+        portfolio_manager.portfolio_snapshot.invalidate()
+        market_data_cache.clear()
+        pin_volatility_table(None)
+        set_clock(None)
+        journal.close()
+
+
+class Backtester:
+    """Replays decisions over a price history through the deterministic trading stack.
+
+    Each decision goes through `submit_trade` (format_trade_request ->
+    validate_policy -> process_trade_request / log_policy_rejection, which call
+    make_trade and log_trade) against a SimulatedExchange, followed by a
+    `get_trade_history` read as in a live cycle. Between decisions only the
+    lowest/highest price of the skipped stretch is needed (to fill resting
+    orders), so the cost grows with the number of decisions, not with the
+    length of the history. The equity curve is computed afterwards in one
+    vectorised pass over the history.
+    """
+
+    def __init__(self, history: PriceHistory, decisions: list[Decision], initial_balances: dict | None = None,
+                 policy_type: str = "aggressive", fee_rate: float = DEFAULT_FEE_RATE, equity_every: int = 60,
+                 history_every: int = 1, quiet: bool = True):
+        """
+        Args:
+            history (PriceHistory): Prices to replay.
+            decisions (list[Decision]): Decisions to replay, in any order.
+            initial_balances (dict, optional): Starting balances. Defaults to {"USDT": 10000.0}.
+            policy_type (str, optional): Policy to validate against. Defaults to "aggressive".
+            fee_rate (float, optional): Exchange commission per fill. Defaults to 0.001.
+            equity_every (int, optional): Equity curve sampling, in grid points. Defaults to 60.
+            history_every (int, optional): Read the trade history after every n-th decision (0: never). Defaults to 1.
+            quiet (bool, optional): Silence per-trade INFO logging during the run. Defaults to True.
+        """
+        self.history = history
+        self.decisions = sorted(decisions, key=lambda decision: decision.timestamp)
+        self.initial_balances = dict(initial_balances or {QUOTE_ASSET: 10000.0})
+        self.policy_type = policy_type
+        self.fee_rate = fee_rate
+        self.equity_every = max(int(equity_every), 1)
+        self.history_every = history_every
+        self.quiet = quiet
+        self._row = {symbol: i for i, symbol in enumerate(history.symbols)}
+        self._points_per_day = DAY_SECONDS // (history.interval_seconds or DAY_SECONDS)
+
+    def _coin_id(self, symbol: str) -> str:
+        return portfolio_manager.ALLOWED_ASSETS.get(symbol, symbol.lower())
+
+    def _volatility_table(self, symbol: str, j: int) -> dict:
+        """1-day range volatility of `symbol` at grid index `j`, as a pinned volatility table."""
+        window = self.history.prices[self._row[symbol], max(0, j - self._points_per_day):j + 1]
+        valid = len(window) >= 2
+        value = float((window.max() - window.min()) / window.min() * 100) if valid else 0.0
+        return {symbol: {"1d": {"range": round(value, 4), "valid": valid, "bars": len(window)}}}
+
+    def _quantity(self, decision: Decision, price: float) -> float:
+        if decision.quantity is not None:
+            return float(decision.quantity)
+        portfolio_assets, total_value_usd = portfolio_manager.load_portfolio()
+        if decision.action == "buy":
+            quantity = total_value_usd * decision.size / 100 / price
+        else:
+            quantity = portfolio_assets.get(decision.symbol, {}).get("free", 0.0) * decision.size / 100
+        # Rounded down to the exchange's 8 decimals so that a 100% SELL never exceeds the balance
+        return math.floor(quantity * 1e8) / 1e8
+
+    def run(self) -> BacktestResult:
+        history = self.history
+        symbols = history.symbols
+        prices = history.prices
+        exchange = SimulatedExchange(self.initial_balances, dict(zip(symbols, prices[:, 0].tolist())), self.fee_rate)
+        now = [datetime.fromtimestamp(int(history.times[0]), UTC)]
+
+        statuses, rejections = Counter(), Counter()
+        step_index = []
+        holdings_rows = [self._holdings(exchange)]
+        history_reads = 0
+        previous = 0
+
+        with tempfile.TemporaryDirectory() as work_dir, \
+                replay_environment(exchange, self.policy_type, work_dir, self.quiet):
+            set_clock(lambda: now[0])
+            started = time.perf_counter()
+            for k, decision in enumerate(self.decisions):
+                j = int(history.index_of(decision.timestamp))
+                if j < 0 or decision.symbol not in self._row:
+                    statuses["skipped"] += 1
+                    continue
+                self._advance(exchange, previous, j)
+                previous = j
+                now[0] = datetime.fromtimestamp(int(history.times[j]), UTC)
+
+                i = self._row[decision.symbol]
+                price = float(prices[i, j])
+                volatility = self._volatility_table(decision.symbol, j)
+                pin_volatility_table(volatility)
+                market_cap = float(history.market_caps[i, j]) if history.market_caps is not None else DEFAULT_MARKET_CAP_USD
+                if not np.isfinite(market_cap):
+                    market_cap = DEFAULT_MARKET_CAP_USD
+                entry_price = float(decision.entry_price or price)
+
+                result = submit_trade(
+                    action=decision.action,
+                    coin_id=self._coin_id(decision.symbol),
+                    coin_market_cap=market_cap,
+                    symbol=decision.symbol,
+                    quantity=self._quantity(decision, price),
+                    entry_price=entry_price,
+                    stop_price=float(decision.stop_price or entry_price * (1 - DEFAULT_STOP_LOSS_PERCENT / 100)),
+                    order_type=decision.order_type,
+                    rationale=decision.rationale,
+                    volatility_1d=volatility[decision.symbol]["1d"]["range"],
+                )
+                statuses[result["status"]] += 1
+                if result["status"] == "rejected":
+                    rejections[(result.get("policy") or {}).get("field", "other")] += 1
+                if self.history_every and k % self.history_every == 0:
+                    trade.get_trade_history(limit=15)
+                    history_reads += 1
+
+                step_index.append(j)
+                holdings_rows.append(self._holdings(exchange))
+
+            # Resting orders can still fill after the last decision
+            last = len(history.times) - 1
+            if previous < last:
+                self._advance(exchange, previous, last)
+                step_index.append(last)
+                holdings_rows.append(self._holdings(exchange))
+            wall_seconds = time.perf_counter() - started
+
+        equity_times, equity = self._equity_curve(np.asarray(step_index, dtype=np.int64), np.asarray(holdings_rows))
+        replayed = sum(count for status, count in statuses.items() if status != "skipped")
+        return BacktestResult(
+            decisions=replayed,
+            wall_seconds=wall_seconds,
+            statuses=dict(statuses),
+            rejections_by_field=dict(rejections),
+            equity_times=equity_times,
+            equity=equity,
+            fills=len(exchange.trades),
+            history_reads=history_reads,
+            policy_type=self.policy_type,
+            extra={"history_points": int(prices.size), "assets": symbols,
+                   "history_days": round(float(history.times[-1] - history.times[0]) / DAY_SECONDS, 1)},
+        )
+
+    def _advance(self, exchange: SimulatedExchange, previous: int, j: int):
+        """Moves the exchange and the price cache to grid index `j`, filling orders crossed since `previous`."""
+        history = self.history
+        stretch = history.prices[:, previous + 1:j + 1] if j > previous else history.prices[:, j:j + 1]
+        current = history.prices[:, j].tolist()
+        exchange.set_prices(
+            dict(zip(history.symbols, current)),
+            low=dict(zip(history.symbols, stretch.min(axis=1).tolist())),
+            high=dict(zip(history.symbols, stretch.max(axis=1).tolist())),
+        )
+        market_data_cache.prime_prices({self._coin_id(symbol): price for symbol, price in zip(history.symbols, current)})
+        portfolio_manager.portfolio_snapshot.invalidate()
+
+    def _holdings(self, exchange: SimulatedExchange) -> list[float]:
+        """[quote, asset 1, asset 2, ...] total holdings."""
+        holdings = exchange.holdings()
+        return [holdings.get(QUOTE_ASSET, 0.0)] + [holdings.get(symbol, 0.0) for symbol in self.history.symbols]
+
+    def _equity_curve(self, step_index: np.ndarray, holdings: np.ndarray):
+        """Portfolio value at every `equity_every`-th grid point (and the last one)."""
+        history = self.history
+        samples = np.unique(np.r_[np.arange(0, len(history.times), self.equity_every), len(history.times) - 1])
+        # Holdings row 0 is the initial state; row k applies from the k-th replayed step onwards
+        state = np.searchsorted(step_index, samples, side="right")
+        held = holdings[state]
+        equity = held[:, 0] + np.einsum("sa,as->s", held[:, 1:], history.prices[:, samples])
+        return history.times[samples], equity
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from datetime import datetime
+import json
+
+import numpy as np
+
+from .data import PriceHistory
+
+
+@dataclass(frozen=True)
+class Decision:
+    """One trade decision to replay.
+
+    `size` is a percent of the portfolio value for BUY and a percent of the held
+    quantity for SELL; `quantity` (in coins) overrides it when set. Prices that
+    are not set are taken from the history at `timestamp`.
+    """
+    timestamp: int
+    symbol: str
+    action: str
+    size: float = 10.0
+    quantity: float | None = None
+    order_type: str = "market"
+    entry_price: float | None = None
+    stop_price: float | None = None
+    rationale: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Decision":
+        """Builds a decision from a recorded JSON object.
+
+        Accepts the fields of this class, or a TradeRequest as produced by
+        `format_trade_request` (as found in the trade journal's execution records).
+        """
+        if "asset" in data and "position" in data:
+            position = data["position"]
+            return cls(
+                timestamp=_to_epoch(data["timestamp"]),
+                symbol=data["asset"]["symbol"].upper(),
+                action=data["action"].lower(),
+                quantity=position.get("quantity"),
+                order_type=(position.get("order_type") or "market").lower(),
+                entry_price=position.get("entry_price"),
+                stop_price=position.get("stop_price"),
+                rationale=data.get("rationale", ""),
+            )
+        return cls(
+            timestamp=_to_epoch(data["timestamp"]),
+            symbol=data["symbol"].upper(),
+            action=data["action"].lower(),
+            size=float(data.get("size", 10.0)),
+            quantity=data.get("quantity"),
+            order_type=(data.get("order_type") or "market").lower(),
+            entry_price=data.get("entry_price"),
+            stop_price=data.get("stop_price"),
+            rationale=data.get("rationale", ""),
+        )
+
+
+def _to_epoch(value) -> int:
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    value = float(value)
+    return int(value / 1000 if value > 1e11 else value)
+
+
+def decisions_from_journal(journal, limit: int = 1_000_000) -> list[Decision]:
+    """Recorded decisions of a trade journal (its 'execution' and 'rejection' records), oldest first."""
+    decisions = []
+    for kind in ("execution", "rejection"):
+        for entry in journal.history(limit=limit, kind=kind):
+            trade_request = (entry.get("details") or {}).get("trade_request")
+            if trade_request and trade_request.get("action"):
+                decisions.append(Decision.from_dict({**trade_request, "timestamp": entry["timestamp"]}))
+    return sorted(decisions, key=lambda decision: decision.timestamp)
+
+
+def _sma(prices: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average over the last axis; NaN until `window` values are available."""
+    cumulative = np.cumsum(prices, axis=-1)
+    result = np.full(prices.shape, np.nan)
+    result[..., window - 1] = cumulative[..., window - 1] / window
+    result[..., window:] = (cumulative[..., window:] - cumulative[..., :-window]) / window
+    return result
+
+
+def sma_crossover(history: PriceHistory, fast: int = 60, slow: int = 240, size: float = 10.0,
+                  order_type: str = "market") -> list[Decision]:
+    """Scripted strategy: BUY when the fast SMA crosses above the slow SMA, SELL everything when it crosses below.
+
+    Signals are computed for all assets at once on the whole history, so
+    generating decisions costs a few array passes even for years of minute data.
+
+    Args:
+        history (PriceHistory): Prices to trade.
+        fast (int, optional): Fast SMA length in grid points. Defaults to 60.
+        slow (int, optional): Slow SMA length in grid points. Defaults to 240.
+        size (float, optional): Percent of the portfolio value spent per BUY. Defaults to 10.
+        order_type (str, optional): Order type of every decision. Defaults to "market".
+    """
+    above = _sma(history.prices, fast) > _sma(history.prices, slow)
+    # NaN comparisons are False, so the first crossing is only counted once both SMAs exist
+    valid = np.zeros_like(above)
+    valid[:, slow:] = True
+    crossed = (above[:, 1:] != above[:, :-1]) & valid[:, 1:]
+    asset_index, time_index = np.nonzero(crossed)
+    time_index = time_index + 1
+    order = np.argsort(time_index, kind="stable")
+
+    decisions = []
+    for i, j in zip(asset_index[order].tolist(), time_index[order].tolist()):
+        buy = bool(above[i, j])
+        decisions.append(Decision(
+            timestamp=int(history.times[j]),
+            symbol=history.symbols[i],
+            action="buy" if buy else "sell",
+            size=size if buy else 100.0,
+            order_type=order_type,
+            rationale=f"SMA {fast}/{slow} {'golden' if buy else 'death'} cross",
+        ))
+    return decisions
+
+
+def write_decisions_jsonl(decisions: list[Decision], path: str):
+    """Writes decisions as JSON lines (the format read by `load_decisions_jsonl`)."""
+    with open(path, "w", encoding="utf-8") as f:
+        for decision in decisions:
+            f.write(json.dumps(decision.__dict__) + "\n")
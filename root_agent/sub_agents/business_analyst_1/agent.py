@@ -4,7 +4,7 @@ from google.adk.tools.function_tool import FunctionTool
 from google.genai import types
 
 from . import prompt
-from .tools.rag_tool import search_similar_news
+from .tools.rag_tool import search_similar_news, search_similar_news_batch
 from .tools.cryptopanic_news_tool import get_news_from_cryptopanic
 from .sub_agents.google_search_agent.agent import google_search_agent
 
@@ -16,6 +16,7 @@ business_analyst_1 = LlmAgent(
     tools=[
         get_news_from_cryptopanic,
         search_similar_news,
+        search_similar_news_batch,
         AgentTool(agent=google_search_agent)
     ],
     # sub_agents=[google_search_agent]
@@ -27,7 +27,7 @@ B) Then, use the `google_search` tool from Google ADK library with targeted quer
 
 **STEP 3: Historical Context & Pattern Recognition**
 
-4. For each article, use the `search_similar_news` tool with the article headline and summary to find similar events in the RAG database.
+4. Call the `search_similar_news_batch` tool ONCE with all articles from Step 2 (a list of {"headline": ..., "summary": ...} objects) to find similar events in the RAG database. The result has one section per headline. Use `search_similar_news` only for a single additional article.
 
 If similar events are found, present the tool output as follows:
 **Similar Historical Patterns Found:**
@@ -1,43 +1,35 @@
-import os
-from dotenv import load_dotenv
-import pathlib
-import requests
 import logging
 
+from google.adk.tools.tool_context import ToolContext
+
+from ....tools.cryptopanic_feed import cryptopanic_feed
+from ....tools.tracing import traced
+
 logger = logging.getLogger("root_agent")
 
-# Load environment variables from root directory
-root_dir = pathlib.Path(__file__).parents[3]
-load_dotenv(root_dir / '.env')
-API_KEY = os.getenv('CRYPTO_PANIC_API_KEY')
+# Posts per call: one CryptoPanic page for a currency, the latest 10 for the market scan
+NEWS_LIMIT = 20
+RECENT_NEWS_LIMIT = 10
 
-def get_news_from_cryptopanic(currency: str, filter: str = "hot") -> str:
-    logger.info("Getting news from CryptoPanic for currency: %s, filter: %s", currency, filter)
-    base_endpoint = "https://cryptopanic.com/api/developer/v2/posts/"
+def _consumer(tool_context: ToolContext | None) -> str | None:
+    """Feed consumer key of the calling agent in this cycle, so it is not sent the same post twice."""
+    if tool_context is None:
+        return None
+    return f"{tool_context.invocation_id}:{tool_context.agent_name}"
 
-    params = {
-        "auth_token": API_KEY,
-        "currencies": currency,    # filter by crypto symbols
-        "kind": "news",            # 'news' or 'media'
-        "public": "true",          # only public posts
-        "filter": filter            # optional: 'rising', 'hot', 'bullish', etc.
-    }
+def _has_posts(currency: str, filter: str) -> bool:
+    """Whether the query has any post at all, regardless of what a consumer was already sent.
 
+    Served from the feed's cache, which the call being answered has just filled.
+    """
     try:
-        response = requests.get(base_endpoint, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-    except Exception as e:
-        logger.error("Error fetching news from CryptoPanic: %s", e)
-        return f"Error fetching news: {e}"
-
-    results = data.get("results", [])
-    if not results:
-        logger.info("No news found for %s.", currency)
-        return f"No news found for {currency}."
+        return bool(cryptopanic_feed.posts(currencies=currency, filter=filter or None, limit=1))
+    except Exception:
+        return False
 
+def _format_posts(posts: list) -> str:
     output = []
-    for post in results:
+    for post in posts:
         title = post.get("title", "No title")
         description = post.get("description", "No description")
         published = post.get("published_at", "Unknown time")
@@ -45,37 +37,33 @@ def get_news_from_cryptopanic(currency: str, filter: str = "hot") -> str:
 
     return "\n".join(output)
 
-def get_recent_news_from_cryptopanic() -> str:
-    logger.info("Getting recent news from CryptoPanic")
-
-    base_endpoint = "https://cryptopanic.com/api/developer/v2/posts/"
-
-    params = {
-        "auth_token": API_KEY,
-        "kind": "news",
-        "public": "true",
-    }
+@traced
+def get_news_from_cryptopanic(currency: str, filter: str = "hot", tool_context: ToolContext | None = None) -> str:
+    logger.info("Getting news from CryptoPanic for currency: %s, filter: %s", currency, filter)
 
     try:
-        response = requests.get(base_endpoint, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        posts = cryptopanic_feed.posts(currencies=currency, filter=filter or None, limit=NEWS_LIMIT,
+                                       consumer=_consumer(tool_context))
     except Exception as e:
-        logger.error("Error fetching recent news from CryptoPanic: %s", e)
-        return f"Error fetching recent news: {e}"
+        logger.error("Error fetching news from CryptoPanic: %s", e)
+        return f"Error fetching news: {e}"
 
-    results = data.get("results", [])
+    if not posts:
+        logger.info("No news found for %s.", currency)
+        if tool_context is not None and _has_posts(currency, filter):
+            return f"No news found for {currency} besides the posts already returned in this conversation."
+        return f"No news found for {currency}."
 
-    # Take only the 10 most recent posts
-    results = results[:10]
+    return _format_posts(posts)
 
-    output = []
-    for post in results:
-        title = post.get("title", "No title")
-        description = post.get("description", "No description")
-        published = post.get("published_at", "Unknown time")
-        output.append(f"{title}\n {description}\n {published}\n")
+@traced
+def get_recent_news_from_cryptopanic(tool_context: ToolContext | None = None) -> str:
+    logger.info("Getting recent news from CryptoPanic")
 
-    return "\n".join(output)
+    try:
+        posts = cryptopanic_feed.posts(limit=RECENT_NEWS_LIMIT, consumer=_consumer(tool_context))
+    except Exception as e:
+        logger.error("Error fetching recent news from CryptoPanic: %s", e)
+        return f"Error fetching recent news: {e}"
 
-    
\ No newline at end of file
+    return _format_posts(posts)
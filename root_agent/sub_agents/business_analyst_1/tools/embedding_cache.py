@@ -0,0 +1,95 @@
+from array import array
+import hashlib
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+current_dir = pathlib.Path(__file__).parent
+EMBEDDING_CACHE_DB_PATH = current_dir / "database" / "embedding_cache.sqlite"
+EMBEDDING_CACHE_MAX_ENTRIES = 50000
+
+
+def content_key(model: str, text: str) -> str:
+    """Returns the cache key of a text: a SHA-256 of the model name and the text."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent, content-hash-keyed embedding cache with LRU eviction.
+
+    Embeddings are stored in SQLite as float32 blobs keyed by the hash of
+    (model, text), so the same headline embedded in a later cycle costs no API
+    call. Each read refreshes the entry's `last_used` time, and once the cache
+    exceeds `max_entries` the least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str | pathlib.Path = EMBEDDING_CACHE_DB_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        pathlib.Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+            self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: list[str]) -> dict:
+        """Returns {key: embedding} for the cached keys and marks them as recently used."""
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            found = {}
+            for key, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector.tolist()
+            if found:
+                self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: dict):
+        """Stores {key: embedding} entries, evicting least recently used entries above `max_entries`."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            for key, embedding in items.items():
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    (key, array("f", embedding).tobytes(), now),
+                )
+                self._size += cursor.rowcount
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                logger.info("Evicted %d least recently used embeddings", overflow)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": self._size, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,118 @@
+import csv
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+
+logger = logging.getLogger("root_agent")
+
+current_dir = pathlib.Path(__file__).parent
+METADATA_DB_PATH = current_dir / "database" / "cryptonews_metadata.sqlite"
+
+# Article metadata returned for each RAG hit
+METADATA_FIELDS = ("url", "summary", "cause", "effect", "sentiment", "coins_mentioned")
+
+# Rows inserted per transaction while building the index
+_BUILD_BATCH_SIZE = 5000
+
+
+class NewsMetadataStore:
+    """Id-keyed SQLite index of the RAG article metadata.
+
+    Hydrating the top-k hits of a similarity search is a primary-key lookup per
+    id, so neither the lookup cost nor the memory use depends on the corpus size.
+    The index is (re)built from the articles CSV by streaming it row by row
+    whenever the CSV is newer than the index.
+    """
+
+    def __init__(self, db_path: str | pathlib.Path = METADATA_DB_PATH, csv_path: str | pathlib.Path | None = None):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        pathlib.Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles (id INTEGER PRIMARY KEY, "
+                + ", ".join(f"{field} TEXT" for field in METADATA_FIELDS)
+                + ")"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if csv_path is not None:
+            self.build_from_csv(csv_path)
+
+    def build_from_csv(self, csv_path: str | pathlib.Path, force: bool = False) -> int:
+        """Loads the articles CSV into the index if it changed since the last build.
+
+        Args:
+            csv_path: Path of the CSV with an `id` column and the metadata columns.
+            force (bool, optional): Rebuild even if the CSV is unchanged.
+        Returns:
+            int: Number of rows written (0 when the index was already up to date).
+        """
+        csv_path = str(csv_path)
+        if not os.path.exists(csv_path):
+            logger.warning("News metadata CSV not found: %s", csv_path)
+            return 0
+
+        source_mtime = str(os.path.getmtime(csv_path))
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'source_mtime'").fetchone()
+        if not force and row is not None and row[0] == source_mtime:
+            return 0
+
+        csv.field_size_limit(2**31 - 1)
+        placeholders = ", ".join("?" for _ in range(len(METADATA_FIELDS) + 1))
+        insert_sql = f"INSERT OR REPLACE INTO articles (id, {', '.join(METADATA_FIELDS)}) VALUES ({placeholders})"
+
+        written = 0
+        batch = []
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM articles")
+            with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                for record in csv.DictReader(f):
+                    try:
+                        article_id = int(record["id"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    batch.append((article_id, *(record.get(field) for field in METADATA_FIELDS)))
+                    if len(batch) >= _BUILD_BATCH_SIZE:
+                        self._conn.executemany(insert_sql, batch)
+                        written += len(batch)
+                        batch.clear()
+            if batch:
+                self._conn.executemany(insert_sql, batch)
+                written += len(batch)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source_mtime', ?)", (source_mtime,))
+
+        logger.info("Indexed %d news articles from %s", written, csv_path)
+        return written
+
+    def get_many(self, article_ids) -> dict:
+        """Returns the metadata of the given article ids.
+
+        Args:
+            article_ids: Iterable of ids (ints or numeric strings, as stored in Chroma).
+        Returns:
+            dict: Mapping of int id to a dict of METADATA_FIELDS. Unknown ids are omitted.
+        """
+        ids = []
+        for article_id in article_ids:
+            try:
+                ids.append(int(article_id))
+            except (TypeError, ValueError):
+                continue
+        if not ids:
+            return {}
+
+        query = (
+            f"SELECT id, {', '.join(METADATA_FIELDS)} FROM articles "
+            f"WHERE id IN ({', '.join('?' for _ in ids)})"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, ids).fetchall()
+        return {row[0]: dict(zip(METADATA_FIELDS, row[1:])) for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
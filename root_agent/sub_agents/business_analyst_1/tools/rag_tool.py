@@ -1,15 +1,15 @@
 import os
 import pathlib
-import pandas as pd
-import chromadb
-import chromadb.utils.embedding_functions as embedding_functions
 from dotenv import load_dotenv
 import logging
 
-logger = logging.getLogger("root_agent")
+from .embedding_cache import EmbeddingCache, content_key
+from .news_metadata_store import METADATA_FIELDS, NewsMetadataStore
+from ....tools.lazy import LazyResource
+from ....tools.recorder import recorded
+from ....tools.tracing import traced
 
-# Global cache for CSV data
-_csv_data = None
+logger = logging.getLogger("root_agent")
 
 # Determine directory paths
 ROOT_DIR = pathlib.Path(__file__).parents[3]
@@ -20,24 +20,108 @@ CSV_PATH = current_dir / "database" / "cryptonews.csv"
 
 load_dotenv(ROOT_DIR / '.env')
 
-# Initialize embedding function
-openai_ef = embedding_functions.OpenAIEmbeddingFunction(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    model_name='text-embedding-3-small'
-)
+EMBEDDING_MODEL = 'text-embedding-3-small'
+SIMILAR_NEWS_RESULTS = 5
+
+def _create_embedding_function():
+    import chromadb.utils.embedding_functions as embedding_functions
+    return embedding_functions.OpenAIEmbeddingFunction(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=EMBEDDING_MODEL
+    )
+
+def _create_collection():
+    import chromadb
+    client = chromadb.PersistentClient(path=str(CHROMA_DB_DIR))
+    return client.get_or_create_collection(name="cryptonews_collection")
+
+# Heavy clients and stores are created on first use
+_embedding_function = LazyResource(_create_embedding_function, "OpenAI embedding function")
+_collection = LazyResource(_create_collection, "ChromaDB collection")
+_metadata_store = LazyResource(lambda: NewsMetadataStore(csv_path=CSV_PATH), "news metadata store")
+_embedding_cache = LazyResource(EmbeddingCache, "embedding cache")
 
-# Initialize ChromaDB client
-client = chromadb.PersistentClient(path=str(CHROMA_DB_DIR))
-collection = client.get_or_create_collection(name="cryptonews_collection")
+def get_collection():
+    """Returns the ChromaDB news collection, opening the database on first use."""
+    return _collection.get()
+
+def get_metadata_store() -> NewsMetadataStore:
+    """Returns the shared article metadata index, building it from the CSV on first use."""
+    return _metadata_store.get()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Returns the shared persistent embedding cache."""
+    return _embedding_cache.get()
+
+def embed_texts(texts: list[str]) -> list:
+    """Returns one embedding per text, embedding all cache misses in a single API request."""
+    cache = get_embedding_cache()
+    keys = [content_key(EMBEDDING_MODEL, text) for text in texts]
+    cached = cache.get_many(list(dict.fromkeys(keys)))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+    if missing:
+        logger.info("Embedding %d of %d texts (%d cached)", len(missing), len(texts), len(texts) - len(missing))
+        texts_to_embed = list(missing.values())
+        vectors = recorded(
+            "openai_embeddings", {"model": EMBEDDING_MODEL, "texts": texts_to_embed},
+            lambda: [[float(x) for x in vector] for vector in _embedding_function.get()(texts_to_embed)],
+        )
+        fetched = dict(zip(missing, vectors))
+        cache.put_many(fetched)
+        cached.update(fetched)
 
-# Load CSV data and cache it
-def _load_csv_data():
-    """Load CSV data once and cache it"""
-    global _csv_data
-    if _csv_data is None:
-        _csv_data = pd.read_csv(CSV_PATH)
-    return _csv_data
+    return [cached[key] for key in keys]
 
+def _format_matches(article_headline: str, matches: list[dict]) -> str:
+    """Formats matches as a compact list of matching articles."""
+    output = []
+    for match in matches:
+        output.append(f"**Similar Article Found ({match['similarity']*100:.0f}% match):**")
+        output.append(f"Original Headline: {article_headline}")
+        output.append(f"- URL: {match['url']}")
+        output.append(f"- Summary: {match['summary']}")
+        output.append(f"- Cause: {match['cause']}")
+        output.append(f"- Effect: {match['effect']}")
+        output.append(f"- Sentiment: {match['sentiment']}")
+        output.append("")
+    return "\n".join(output).strip()
+
+def _hydrate_matches(ids: list, distances: list, metadatas: list, similarity_threshold: float) -> list[dict]:
+    """Builds match dicts for the hits above the threshold.
+
+    Metadata stored on the Chroma records is used directly; hits without it are
+    looked up by id in the metadata index, in a single query.
+    """
+    hits = []
+    for index, (article_id, distance) in enumerate(zip(ids, distances)):
+        # Convert distance to similarity (similarity = 1 - distance for cosine)
+        similarity = max(0.0, 1.0 - distance)
+        if similarity >= similarity_threshold:
+            metadata = metadatas[index] if index < len(metadatas) else None
+            hits.append((article_id, similarity, metadata))
+
+    missing_ids = [article_id for article_id, _, metadata in hits if not (metadata and "summary" in metadata)]
+    indexed = get_metadata_store().get_many(missing_ids) if missing_ids else {}
+
+    matches = []
+    for article_id, similarity, metadata in hits:
+        if not (metadata and "summary" in metadata):
+            try:
+                metadata = indexed.get(int(article_id))
+            except (ValueError, TypeError):
+                metadata = None
+        if not metadata:
+            continue
+        match = {field: metadata.get(field) or 'N/A' for field in METADATA_FIELDS}
+        match['similarity'] = similarity
+        matches.append(match)
+    return matches
+
+@traced
 def search_similar_news(article_headline: str, article_summary: str, similarity_threshold: float=0.1) -> str:
     """
     Search for similar news articles summaries in the RAG database.
@@ -53,65 +137,75 @@ def search_similar_news(article_headline: str, article_summary: str, similarity_
     """
     logger.info("Searching for similar news in the RAG db")
     try:
-        # Generate embedding for the article text
-        article_embedding = openai_ef([article_summary])
+        # Generate embedding for the article text (served from the embedding cache when possible)
+        article_embedding = embed_texts([article_summary])
         
         # Query ChromaDB for similar articles
-        results = collection.query(
+        results = get_collection().query(
             query_embeddings=article_embedding,
-            n_results=5
+            n_results=SIMILAR_NEWS_RESULTS,
+            include=["distances", "metadatas"]
         )
 
         if not results['ids'] or len(results['ids'][0]) == 0:
             return ""
         
-        # Load CSV data to get cause, effect, headline, etc.
-        csv_data = _load_csv_data()
-        
-        # Process results and filter by similarity threshold
-        matches = []
+        # Process results, filter by similarity threshold and hydrate metadata by id
         distances = results['distances'][0] if results.get('distances') else []
-        ids = results['ids'][0]
-        
-        for article_id, distance in zip(ids, distances):
-            # Convert distance to similarity (similarity = 1 - distance for cosine)
-            similarity = max(0.0, 1.0 - distance)
-            
-            # Filter by similarity threshold
-            if similarity >= similarity_threshold:
-                # Get full data from CSV using int(article_id)
-                try:
-                    article_row = csv_data[csv_data['id'] == int(article_id)]
-                except (ValueError, TypeError):
-                    continue
-                
-                if not article_row.empty:
-                    row = article_row.iloc[0]
-                    matches.append({
-                        'url': row.get('url', 'N/A'),
-                        'summary': row.get('summary', 'N/A'),
-                        'cause': row.get('cause', 'N/A'),
-                        'effect': row.get('effect', 'N/A'),
-                        'sentiment': row.get('sentiment', 'N/A'),
-                        'similarity': similarity,
-                    })
+        metadatas = results['metadatas'][0] if results.get('metadatas') else []
+        matches = _hydrate_matches(results['ids'][0], distances, metadatas, similarity_threshold)
         
         if not matches:
             return ""
         
-        # Format output: compact list of matching articles
-        output = []
-        for match in matches:
-            output.append(f"**Similar Article Found ({match['similarity']*100:.0f}% match):**")
-            output.append(f"Original Headline: {article_headline}")
-            output.append(f"- URL: {match['url']}")
-            output.append(f"- Summary: {match['summary']}")
-            output.append(f"- Cause: {match['cause']}")
-            output.append(f"- Effect: {match['effect']}")
-            output.append(f"- Sentiment: {match['sentiment']}")
-            output.append("")
-        
-        return "\n".join(output).strip()
+        return _format_matches(article_headline, matches)
         
     except Exception as e:
         return f"Error searching similar news: {str(e)}"
+
+@traced
+def search_similar_news_batch(articles: list[dict], similarity_threshold: float=0.1) -> str:
+    """
+    Search for similar news for many articles at once in the RAG database.
+
+    All summaries are embedded in one request (cached summaries are not re-embedded)
+    and looked up with a single multi-query ChromaDB call.
+
+    Args:
+        articles: List of articles, each a dict with "headline" and "summary" keys
+        similarity_threshold: Minimum similarity score to consider a match (0.0 to 1.0)
+
+    Returns:
+        A formatted string with a section per article: the matching article information
+        (headline, summary, cause, effect, sentiment), or a note that no similar
+        historical patterns were found.
+    """
+    logger.info("Searching for similar news in the RAG db for %d articles", len(articles))
+    articles = [article for article in articles if isinstance(article, dict) and article.get("summary")]
+    if not articles:
+        return ""
+    try:
+        embeddings = embed_texts([article["summary"] for article in articles])
+
+        results = get_collection().query(
+            query_embeddings=embeddings,
+            n_results=SIMILAR_NEWS_RESULTS,
+            include=["distances", "metadatas"]
+        )
+
+        sections = []
+        for index, article in enumerate(articles):
+            headline = article.get("headline", "")
+            ids = results['ids'][index] if results.get('ids') else []
+            distances = results['distances'][index] if results.get('distances') else []
+            metadatas = results['metadatas'][index] if results.get('metadatas') else []
+            matches = _hydrate_matches(ids, distances, metadatas, similarity_threshold) if ids else []
+
+            sections.append(f"### {headline}")
+            sections.append(_format_matches(headline, matches) if matches else "No similar historical patterns found.")
+            sections.append("")
+
+        return "\n".join(sections).strip()
+
+    except Exception as e:
+        return f"Error searching similar news: {str(e)}"
@@ -1,23 +1,57 @@
 from typing import List
-from telethon import TelegramClient
-from telethon.sessions import StringSession
 import logging
 import os
 from dotenv import load_dotenv
 import pathlib
 import asyncio
-import random
+import time
+
+from ....tools.lazy import LazyResource
+from ....tools.recorder import recorded_async
+from ....tools.tracing import traced
+from .rate_limiter import AsyncTokenBucket
+from .telegram_message_store import TelegramMessageStore, TELEGRAM_STORE_DB_PATH
 
 logger = logging.getLogger("root_agent")
 
 # Load environment variables from root directory
 root_dir = pathlib.Path(__file__).parents[3]
 load_dotenv(root_dir / '.env')
-API_ID = int(os.getenv('TELEGRAM_API_ID'))
+API_ID = os.getenv('TELEGRAM_API_ID')
 API_HASH = os.getenv('TELEGRAM_API_HASH')
 SESSION_STRING = os.getenv('TELEGRAM_SESSION_STRING')
 
-client = TelegramClient(StringSession(SESSION_STRING), API_ID, API_HASH) #type: ignore
+# Telegram request budget shared by all channel and comment fetches
+TELEGRAM_REQUESTS_PER_SECOND = 8.0
+TELEGRAM_REQUEST_BURST = 16
+CHANNEL_CONCURRENCY = 5
+COMMENT_CONCURRENCY = 6
+COMMENTS_PER_MESSAGE = 5
+
+_rate_limiter = AsyncTokenBucket(TELEGRAM_REQUESTS_PER_SECOND, TELEGRAM_REQUEST_BURST)
+
+# A channel synced less than this many seconds ago is served from the local store without any request
+TELEGRAM_SYNC_INTERVAL_SECONDS = 30
+# How often the views/forwards/reactions of already stored posts are refreshed
+TELEGRAM_COUNTER_REFRESH_SECONDS = 300
+
+_message_store = LazyResource(lambda: TelegramMessageStore(TELEGRAM_STORE_DB_PATH), "Telegram message store")
+
+def get_message_store():
+    """Returns the shared local Telegram message store."""
+    return _message_store.get()
+
+def _create_telegram_client():
+    # Imported here so that loading the agent does not pull in Telethon
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+    return TelegramClient(StringSession(SESSION_STRING), int(API_ID), API_HASH) #type: ignore
+
+_telegram_client = LazyResource(_create_telegram_client, "Telegram client")
+
+def get_telegram_client():
+    """Returns the shared Telegram client, creating it on first use."""
+    return _telegram_client.get()
 
 def parse_message_reactions(reactions):
     """
@@ -46,39 +80,125 @@ def parse_message_reactions(reactions):
     
     return ", ".join(reaction_strings)
 
-async def get_channel_news(channel_handle, client, limit=5):
+async def _telegram_request(request):
+    """Sends one Telegram API request under the shared rate limiter.
+
+    On a FloodWaitError all requests are paused for the time Telegram asks for,
+    and the request is retried once.
+    """
+    from telethon.errors import FloodWaitError
+
+    for attempt in range(2):
+        await _rate_limiter.acquire()
+        try:
+            return await request()
+        except FloodWaitError as e:
+            if attempt:
+                raise
+            _rate_limiter.pause(e.seconds)
+
+async def _get_comments(client, channel_handle, msg, semaphore):
+    """Fetches the comment texts of a message (at most COMMENTS_PER_MESSAGE)."""
+    if not (msg.replies and msg.replies.replies > 0): # msg.replies.replies is just the number of replies
+        return []
+    try:
+        async with semaphore:
+            comments = await _telegram_request(
+                lambda: client.get_messages(channel_handle, reply_to=msg.id, limit=COMMENTS_PER_MESSAGE)
+            )
+    except Exception as e:
+        logger.info("Failed to fetch comments for %s/%s: %s", channel_handle, msg.id, e)
+        return []
+    return [comment.text for comment in comments if comment.text]
+
+def _replies_count(msg) -> int:
+    return msg.replies.replies if msg.replies else 0
+
+def _counters(msg) -> dict:
+    return {
+        "id": msg.id,
+        "views": msg.views,
+        "forwards": msg.forwards,
+        "reactions": parse_message_reactions(msg.reactions),
+        "replies": _replies_count(msg),
+    }
+
+def _message_record(msg, comments) -> dict:
+    return {
+        **_counters(msg),
+        "date": str(msg.date),
+        "message": msg.message,
+        "comments": comments,
+    }
+
+def _format_news(messages) -> str:
+    news_items = []
+    for msg in messages:
+        news_item = (
+            f"Date: {msg['date']}\n"
+            f"Message: {msg['message']}\n"
+            f"Views: {msg['views']}, Forwards: {msg['forwards']}, Reactions: {msg['reactions']}, Comments: {msg['comments']}\n"
+        )
+        news_items.append(news_item)
+    return "\n---\n".join(news_items)
+
+async def get_channel_news(channel_handle, client, limit=5, comment_semaphore=None, store=None):
+    """Returns the latest `limit` posts of a channel, syncing the local store incrementally.
+
+    Only messages newer than the channel's high-water mark are downloaded (with
+    their comments). The counters of already stored posts are refreshed with a
+    single request at most every TELEGRAM_COUNTER_REFRESH_SECONDS, and a channel
+    synced within TELEGRAM_SYNC_INTERVAL_SECONDS costs no request at all.
+    """
     logger.info("Getting news from Telegram channel: %s", channel_handle)
+    comment_semaphore = comment_semaphore or asyncio.Semaphore(COMMENT_CONCURRENCY)
+    store = store or get_message_store()
+    state = store.channel_state(channel_handle)
+    now = time.time()
     try:
-        news_items = []
-        async for msg in client.iter_messages(channel_handle, limit=limit):
-            id = msg.id
-            date = msg.date
-            message = msg.message
-            views = msg.views
-            forwards = msg.forwards
-            reactions = parse_message_reactions(msg.reactions)
-            comments = []
-            if msg.replies and msg.replies.replies > 0: # msg.replies.replies is just the number of replies
-                async for comment in client.iter_messages(channel_handle, reply_to=msg.id, limit=5):
-                    if comment.text:
-                        comments.append(comment.text) 
-
-            news_item = (
-                f"Date: {date}\n"
-                f"Message: {message}\n"
-                f"Views: {views}, Forwards: {forwards}, Reactions: {reactions}, Comments: {comments}\n"
+        new_ids = set()
+        if now - state["synced_at"] >= TELEGRAM_SYNC_INTERVAL_SECONDS:
+            high_water_mark = state["high_water_mark"]
+            messages = await _telegram_request(
+                lambda: client.get_messages(channel_handle, limit=limit, min_id=high_water_mark)
             )
-            
-            news_items.append(news_item)
 
-        return "\n---\n".join(news_items)
+            # Comment threads are fetched in parallel, bounded by the semaphore
+            all_comments = await asyncio.gather(
+                *(_get_comments(client, channel_handle, msg, comment_semaphore) for msg in messages)
+            )
+            store.upsert_messages(
+                channel_handle, [_message_record(msg, comments) for msg, comments in zip(messages, all_comments)]
+            )
+            new_ids = {msg.id for msg in messages}
+            logger.info("Telegram channel %s: %d new messages since id %d", channel_handle, len(new_ids), high_water_mark)
+
+        stored = store.latest(channel_handle, limit)
+        stale_ids = [msg["id"] for msg in stored if msg["id"] not in new_ids]
+        if stale_ids and now - state["counters_refreshed_at"] >= TELEGRAM_COUNTER_REFRESH_SECONDS:
+            refreshed = await _telegram_request(lambda: client.get_messages(channel_handle, ids=stale_ids))
+            # Deleted messages come back as None
+            store.update_counters(channel_handle, [_counters(msg) for msg in refreshed if msg is not None])
+            stored = store.latest(channel_handle, limit)
+
+        return _format_news(stored)
 
     except Exception as e:
+        stored = store.latest(channel_handle, limit)
+        if stored:
+            logger.warning("Telegram sync of %s failed, serving stored messages: %s", channel_handle, e)
+            return _format_news(stored)
         return f"Failed to fetch news: {str(e)}"
 
+@traced
 async def get_telegram_news(channels: List[str], limit: int = 5):
     """
     Fetch news from specified Telegram crypto channels.
+
+    Channels are fetched concurrently (at most CHANNEL_CONCURRENCY at a time) and
+    every Telegram request goes through a shared token-bucket rate limiter.
+    Posts are kept in a local message store, so repeated calls only download
+    messages newer than the last one seen per channel.
     
     Args:
         channels: List of channel handles to fetch from. If None, uses all available channels.
@@ -87,25 +207,24 @@ async def get_telegram_news(channels: List[str], limit: int = 5):
     Returns:
         Formatted string containing news from specified channels
     """
-    
-    if not client.is_connected():
-        await client.connect()
 
-    logger.info("Fetching news from Telegram channels: %s", channels)
-    
-    all_news = []
-    for channel in channels:
-        # Delay between scraping
-        delay = random.uniform(1.5, 5)
-        logger.info(
-            "Waiting %.2fs before fetching Telegram channel '%s' (limit=%d)",
-            delay,
-            channel,
-            limit,
-        )
-        await asyncio.sleep(delay)
+    logger.info("Fetching news from Telegram channels: %s (limit=%d)", channels, limit)
 
-        news = await get_channel_news(channel, client, limit=limit)
-        all_news.append(f"Telegram channel: {channel}\n{news}")
-    
-    return "\n\n".join(all_news)
+    async def fetch_all():
+        client = get_telegram_client()
+        if not client.is_connected():
+            await client.connect()
+
+        channel_semaphore = asyncio.Semaphore(CHANNEL_CONCURRENCY)
+        comment_semaphore = asyncio.Semaphore(COMMENT_CONCURRENCY)
+
+        async def fetch(channel):
+            async with channel_semaphore:
+                news = await get_channel_news(channel, client, limit=limit, comment_semaphore=comment_semaphore)
+            return f"Telegram channel: {channel}\n{news}"
+
+        all_news = await asyncio.gather(*(fetch(channel) for channel in channels))
+        return "\n\n".join(all_news)
+
+    # telethon returns live Message objects, so whole fetches are recorded
+    return await recorded_async("telegram", {"channels": channels, "limit": limit}, fetch_all, route="channels")
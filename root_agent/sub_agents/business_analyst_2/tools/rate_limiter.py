@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("root_agent")
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for asyncio code.
+
+    Allows short bursts of up to `capacity` requests and a sustained rate of
+    `rate` requests per second. Tokens are reserved synchronously (the balance
+    may go negative and callers sleep until their token is due), so the bucket
+    needs no asyncio lock and can be shared across event loops. `pause()`
+    blocks every caller, e.g. for the duration of a Telegram flood wait.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _reserve(self) -> float:
+        """Takes one token and returns how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._paused_until - now)
+
+    async def acquire(self):
+        """Waits until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Blocks all callers for `seconds` (e.g. after a FloodWaitError)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning("Telegram requests paused for %.1fs", seconds)
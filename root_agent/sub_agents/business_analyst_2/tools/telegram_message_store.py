@@ -0,0 +1,122 @@
+import json
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+current_dir = pathlib.Path(__file__).parent
+TELEGRAM_STORE_DB_PATH = current_dir / "telegram_messages.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    channel TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    date TEXT,
+    message TEXT,
+    views INTEGER,
+    forwards INTEGER,
+    reactions TEXT,
+    replies INTEGER,
+    comments TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (channel, message_id)
+);
+CREATE TABLE IF NOT EXISTS channels (
+    channel TEXT PRIMARY KEY,
+    high_water_mark INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL NOT NULL DEFAULT 0,
+    counters_refreshed_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class TelegramMessageStore:
+    """Local SQLite store of Telegram channel posts keyed by (channel, message id).
+
+    Keeps a high-water mark (the newest stored message id) per channel so a sync
+    only asks Telegram for newer messages, plus the times of the last sync and
+    the last counter refresh.
+    """
+
+    def __init__(self, db_path: str | pathlib.Path = TELEGRAM_STORE_DB_PATH):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _key(channel: str) -> str:
+        return channel.lower().lstrip("@")
+
+    def channel_state(self, channel: str) -> dict:
+        """Returns the high-water mark and the last sync/refresh times of a channel."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water_mark, synced_at, counters_refreshed_at FROM channels WHERE channel = ?",
+                (self._key(channel),),
+            ).fetchone()
+        if row is None:
+            return {"high_water_mark": 0, "synced_at": 0.0, "counters_refreshed_at": 0.0}
+        return dict(row)
+
+    def upsert_messages(self, channel: str, messages: list[dict]):
+        """Stores new messages and advances the channel's high-water mark."""
+        now = time.time()
+        key = self._key(channel)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages "
+                "(channel, message_id, date, message, views, forwards, reactions, replies, comments, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, m["id"], m["date"], m["message"], m["views"], m["forwards"], m["reactions"],
+                     m["replies"], json.dumps(m["comments"], ensure_ascii=False), now)
+                    for m in messages
+                ],
+            )
+            high_water_mark = max([m["id"] for m in messages], default=0)
+            self._conn.execute(
+                # A newly stored channel's counters are as fresh as its messages
+                "INSERT INTO channels (channel, high_water_mark, synced_at, counters_refreshed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(channel) DO UPDATE SET "
+                "high_water_mark = MAX(high_water_mark, excluded.high_water_mark), synced_at = excluded.synced_at",
+                (key, high_water_mark, now, now),
+            )
+
+    def update_counters(self, channel: str, counters: list[dict]):
+        """Updates views/forwards/reactions/replies of stored messages."""
+        now = time.time()
+        key = self._key(channel)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE messages SET views = ?, forwards = ?, reactions = ?, replies = ?, updated_at = ? "
+                "WHERE channel = ? AND message_id = ?",
+                [(c["views"], c["forwards"], c["reactions"], c["replies"], now, key, c["id"]) for c in counters],
+            )
+            self._conn.execute(
+                "UPDATE channels SET counters_refreshed_at = ? WHERE channel = ?", (now, key)
+            )
+
+    def latest(self, channel: str, limit: int) -> list[dict]:
+        """Returns the newest `limit` stored messages of a channel, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM messages WHERE channel = ? ORDER BY message_id DESC LIMIT ?",
+                (self._key(channel), limit),
+            ).fetchall()
+        messages = []
+        for row in rows:
+            message = dict(row)
+            message["id"] = message.pop("message_id")
+            message["comments"] = json.loads(message["comments"] or "[]")
+            messages.append(message)
+        return messages
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
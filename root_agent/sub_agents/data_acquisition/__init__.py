@@ -0,0 +1 @@
+from .agent import data_acquisition
@@ -0,0 +1,82 @@
+from google.adk.agents import ParallelAgent, SequentialAgent
+
+from . import prompt
+from .steps import AcquisitionCollectorAgent, FunctionStepAgent, start_branch_timer, stop_branch_timer
+from ..business_analyst_1.agent import business_analyst_1
+from ..business_analyst_2.agent import business_analyst_2
+from ..technical_analyst.agent import technical_analyst
+from ..trader.tools.portfolio_manager import load_portfolio
+from ..trader.tools.trade import get_trade_history
+
+TRADE_HISTORY_LIMIT = 15
+
+_timers = {"before_agent_callback": start_branch_timer, "after_agent_callback": stop_branch_timer}
+
+
+def _portfolio_context():
+    portfolio_assets, total_value_usd = load_portfolio()
+    return {"portfolio_assets": portfolio_assets, "total_value_usd": total_value_usd}
+
+
+# The analysts are cloned: an agent can only have one parent, and the originals stay
+# available to the root agent as standalone tools (e.g. for re-calling one branch)
+fundamentals_branch = business_analyst_1.clone(update={
+    "output_key": "acquisition_fundamentals",
+    "instruction": prompt.FUNDAMENTALS_BRANCH_INSTRUCTION,
+    **_timers,
+})
+sentiment_branch = business_analyst_2.clone(update={
+    "output_key": "acquisition_sentiment",
+    "instruction": prompt.SENTIMENT_BRANCH_INSTRUCTION,
+    **_timers,
+})
+technicals_branch = technical_analyst.clone(update={
+    "output_key": "acquisition_technicals",
+    "instruction": prompt.TECHNICALS_BRANCH_INSTRUCTION,
+    **_timers,
+})
+portfolio_branch = FunctionStepAgent(
+    name="portfolio",
+    description="Loads the current portfolio from the exchange.",
+    func=_portfolio_context,
+    output_key="acquisition_portfolio",
+    **_timers,
+)
+trade_history_branch = FunctionStepAgent(
+    name="trade_history",
+    description="Loads recent trade decisions and today's counters.",
+    func=lambda: get_trade_history(limit=TRADE_HISTORY_LIMIT),
+    output_key="acquisition_trade_history",
+    **_timers,
+)
+
+parallel_acquisition = ParallelAgent(
+    name="parallel_acquisition",
+    description="Runs all data acquisition branches concurrently.",
+    sub_agents=[fundamentals_branch, sentiment_branch, technicals_branch, portfolio_branch, trade_history_branch],
+    **_timers,
+)
+
+acquisition_collector = AcquisitionCollectorAgent(
+    name="acquisition_collector",
+    description="Merges the outputs and timings of the acquisition branches.",
+    branches=[
+        ("Fundamentals", fundamentals_branch.name, fundamentals_branch.output_key),
+        ("Sentiment", sentiment_branch.name, sentiment_branch.output_key),
+        ("Technicals", technicals_branch.name, technicals_branch.output_key),
+        ("Portfolio", portfolio_branch.name, portfolio_branch.output_key),
+        ("Trade history", trade_history_branch.name, trade_history_branch.output_key),
+    ],
+    total_timer_agent=parallel_acquisition.name,
+)
+
+data_acquisition = SequentialAgent(
+    name="data_acquisition",
+    description=(
+        "Phase 1 data acquisition for one asset. Runs business_analyst_1 (fundamentals), business_analyst_2 "
+        "(sentiment), technical_analyst (technicals), the portfolio and the trade history concurrently, and "
+        "returns all five results with per-branch timings. Request: the asset symbol and CoinGecko id, "
+        "optionally followed by a Fundamentals/Sentiment/Technicals focus."
+    ),
+    sub_agents=[parallel_acquisition, acquisition_collector],
+)
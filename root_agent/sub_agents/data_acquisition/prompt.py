@@ -0,0 +1,17 @@
+FUNDAMENTALS_BRANCH_INSTRUCTION = """
+You are the fundamentals branch of the parallel data acquisition stage.
+The request above names the asset under analysis and, optionally, a focus for each branch.
+Analyze the latest news and RAG context for that asset, following the "Fundamentals" focus if one is given.
+"""
+
+SENTIMENT_BRANCH_INSTRUCTION = """
+You are the sentiment branch of the parallel data acquisition stage.
+The request above names the asset under analysis and, optionally, a focus for each branch.
+Quantify the Telegram community sentiment for that asset, following the "Sentiment" focus if one is given.
+"""
+
+TECHNICALS_BRANCH_INSTRUCTION = """
+You are the technical branch of the parallel data acquisition stage.
+The request above names the asset under analysis and, optionally, a focus for each branch.
+Fetch and analyze the technical data for that asset, following the "Technicals" focus if one is given.
+"""
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+logger = logging.getLogger("root_agent")
+
+# Start times of running branches, keyed by (invocation id, agent name)
+_branch_started: dict[tuple[str, str], float] = {}
+
+
+def timing_state_key(agent_name: str) -> str:
+    return f"acquisition_seconds_{agent_name}"
+
+
+def start_branch_timer(callback_context: CallbackContext):
+    """before_agent_callback recording when an acquisition branch starts."""
+    _branch_started[(callback_context.invocation_id, callback_context.agent_name)] = time.perf_counter()
+    return None
+
+
+def stop_branch_timer(callback_context: CallbackContext):
+    """after_agent_callback storing the branch's wall time in session state."""
+    started = _branch_started.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    if started is not None:
+        elapsed = round(time.perf_counter() - started, 3)
+        callback_context.state[timing_state_key(callback_context.agent_name)] = elapsed
+        logger.info("Data acquisition branch %s finished in %.2fs", callback_context.agent_name, elapsed)
+    return None
+
+
+class FunctionStepAgent(BaseAgent):
+    """Workflow step that calls a plain function tool, without an LLM.
+
+    The function runs in a worker thread so that it does not block sibling
+    branches of a ParallelAgent. Its result (or the error) is stored in session
+    state under `output_key` and emitted as JSON text.
+    """
+
+    func: Callable[[], object]
+    output_key: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        try:
+            result = await asyncio.to_thread(self.func)
+        except Exception as e:
+            logger.error("Data acquisition step %s failed: %s", self.name, e)
+            result = {"error": str(e)}
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=json.dumps(result, default=str))]),
+            actions=EventActions(state_delta={self.output_key: result}),
+        )
+
+
+class AcquisitionCollectorAgent(BaseAgent):
+    """Final step of the acquisition stage: merges the branch outputs into one report.
+
+    Reads every branch output and timing from session state, stores the timings
+    under `acquisition_timings` and emits a single text report, which is what the
+    calling agent receives as the tool result.
+    """
+
+    branches: list[tuple[str, str, str]]  # (title, agent name, output key)
+    total_timer_agent: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        timings = {
+            output_key: state.get(timing_state_key(agent_name))
+            for _, agent_name, output_key in self.branches
+        }
+        timings["total"] = state.get(timing_state_key(self.total_timer_agent))
+
+        sections = []
+        for title, agent_name, output_key in self.branches:
+            output = state.get(output_key)
+            if output is None or output == "":
+                output = "No data returned."
+            elif not isinstance(output, str):
+                output = json.dumps(output, default=str)
+            sections.append(f"## {title} ({agent_name}, {timings[output_key]}s)\n{output}")
+
+        timing_line = ", ".join(f"{key}={seconds}s" for key, seconds in timings.items())
+        report = "\n\n".join(sections) + f"\n\n## Acquisition timings\n{timing_line}"
+        logger.info("Data acquisition timings: %s", timing_line)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+            actions=EventActions(state_delta={"acquisition_timings": timings}),
+        )
@@ -21,6 +21,7 @@ WORKFLOW:
    - Order type restrictions
    - Market conditions (volatility, spread, liquidity)
    - And more based on loaded policy
+   If you receive several TradeRequests at once, validate them together with `validate_policies` (a list of TradeRequests) and return one decision per request.
 
 3. Return a structured decision:
    - **APPROVED**: {"status": "approved", "reason": "...", "trade_request_id": "..."}
@@ -1,12 +1,97 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+import copy
 import json
+import logging
 import os
+import threading
 
+from ....tools.tracing import traced
+
+logger = logging.getLogger("root_agent")
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Immutable, pre-validated view of a policy file used by the validators.
+
+    Sets are frozensets of normalised (upper-case symbols, lower-case order types)
+    values, so each check is a single lookup or comparison. `document` keeps the
+    original JSON as a read-only mapping.
+    """
+    policy_type: str
+    mtime_ns: int
+    max_position_size_percent: float
+    max_trades_per_day: int
+    stop_loss_required: bool
+    stop_loss_min_percent: float
+    take_profit_required: bool
+    whitelist_enabled: bool
+    whitelisted_assets: tuple[str, ...]
+    whitelist: frozenset[str]
+    minimum_market_cap_usd: float | int
+    allowed_order_types: tuple[str, ...]
+    allowed_order_types_set: frozenset[str]
+    restricted_order_types: frozenset[str]
+    volatility_halt_percent: float
+    allow_unknown_volatility: bool
+    minimum_liquidity_usd: float
+    document: MappingProxyType
+
+def policy_path(policy_type: str) -> str:
+    """Returns the path of the policy JSON file in the tools directory."""
+    tools_dir = os.path.dirname(__file__)
+    return os.path.join(tools_dir, f"policy_{policy_type}.json")
+
+def compile_policy(policy: dict, policy_type: str, mtime_ns: int = 0) -> CompiledPolicy:
+    """Turns a policy document into a CompiledPolicy. Raises KeyError on a missing section."""
+    risk = policy["risk_management"]
+    assets = policy["asset_policies"]
+    rules = policy["trading_rules"]
+    whitelisted_assets = tuple(assets["whitelist"]["assets"]) if assets["whitelist"] else ()
+    allowed_order_types = tuple(rules["allowed_order_types"])
+    return CompiledPolicy(
+        policy_type=policy_type,
+        mtime_ns=mtime_ns,
+        max_position_size_percent=float(risk["position_sizing"]["max_position_size_percent"]),
+        max_trades_per_day=int(risk["daily_limits"]["max_trades_per_day"]),
+        stop_loss_required=bool(risk["stop_loss"]["required"]),
+        stop_loss_min_percent=float(risk["stop_loss"].get("min_percent", 0.0)),
+        take_profit_required=bool(risk["take_profit"]["required"]),
+        whitelist_enabled=bool(assets["whitelist"]),
+        whitelisted_assets=whitelisted_assets,
+        whitelist=frozenset(a.upper() for a in whitelisted_assets),
+        minimum_market_cap_usd=assets["minimum_market_cap_usd"],
+        allowed_order_types=allowed_order_types,
+        allowed_order_types_set=frozenset(ot.lower() for ot in allowed_order_types),
+        restricted_order_types=frozenset(ot.lower() for ot in rules.get("restricted_order_types", [])),
+        volatility_halt_percent=float(rules["trading_halted_if_volatility_percent"]),
+        allow_unknown_volatility=bool(rules.get("allow_unknown_volatility", False)),
+        minimum_liquidity_usd=float(rules.get("minimum_liquidity_usd", 0.0)),
+        document=MappingProxyType(copy.deepcopy(policy)),
+    )
+
+_compiled_policies: dict[str, CompiledPolicy] = {}
+_compile_lock = threading.Lock()
+
+def get_compiled_policy(policy_type: str) -> CompiledPolicy:
+    """Returns the compiled policy, re-reading the file only when its mtime changed."""
+    path = policy_path(policy_type)
+    mtime_ns = os.stat(path).st_mtime_ns
+    compiled = _compiled_policies.get(policy_type)
+    if compiled is not None and compiled.mtime_ns == mtime_ns:
+        return compiled
+
+    with _compile_lock:
+        compiled = _compiled_policies.get(policy_type)
+        if compiled is None or compiled.mtime_ns != mtime_ns:
+            with open(path, 'r') as f:
+                compiled = compile_policy(json.load(f), policy_type, mtime_ns)
+            _compiled_policies[policy_type] = compiled
+            logger.info("Compiled policy '%s' from %s", policy_type, path)
+        return compiled
+
+@traced
 def load_policy(policy_type) -> dict:
     """Load a policy JSON file from the tools directory."""
-    tools_dir = os.path.dirname(__file__)
-    policy_path = os.path.join(tools_dir, f"policy_{policy_type}.json")
-    
-    with open(policy_path, 'r') as f:
-        policy_dict = json.load(f)
-    
-    return policy_dict
\ No newline at end of file
+    # Served from the compiled policy cache; callers get their own mutable copy
+    return copy.deepcopy(dict(get_compiled_policy(policy_type).document))
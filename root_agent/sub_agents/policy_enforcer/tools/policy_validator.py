@@ -1,10 +1,38 @@
 from ...trader.tools.portfolio_manager import load_portfolio
-from .policy_loading import load_policy
+from ...trader.tools.trade import get_trade_journal
+from ...technical_analyst.tools.volatility import volatility_lookup
+from .policy_loading import CompiledPolicy, get_compiled_policy
+from ....tools.tracing import traced
 import logging
+import math
 import os
 
 logger = logging.getLogger("root_agent")
 
+def _active_policy() -> CompiledPolicy:
+    policy_type = os.getenv("TRADING_STRATEGY", "aggressive")  # Default to aggressive
+    return get_compiled_policy(policy_type)
+
+def _is_trade(transaction_data: dict) -> bool:
+    action = transaction_data.get("action")
+    return isinstance(action, str) and action.lower() in ("buy", "sell")
+
+def _volatility_1d(transaction_data: dict, coin_symbol: str) -> tuple[float, bool]:
+    """1-day volatility in percent and whether it is known.
+
+    The cached multi-window volatility table is authoritative; the request's own
+    `volatility_1d` is only used when the table has no valid value for the asset,
+    and only if it is a real number (agents may pass "N/A" or null).
+    """
+    value, valid = volatility_lookup(coin_symbol, "1d", "range")
+    if valid:
+        return value, True
+    requested = transaction_data.get("asset", {}).get("volatility_1d")
+    if isinstance(requested, (int, float)) and not isinstance(requested, bool) and math.isfinite(requested) and requested > 0:
+        return float(requested), True
+    return 0.0, False
+
+@traced
 def validate_policy(transaction_data: dict) -> dict:
     """
     Validate the risk of a transaction based on provided risk management data.
@@ -18,6 +46,60 @@ def validate_policy(transaction_data: dict) -> dict:
 
     logger.info("Starting policy validation")
 
+    # The journal's per-day counter is authoritative; never trust a lower count from the request
+    today_trade_count = max(transaction_data.get("today_trade_count", 0) or 0, get_trade_journal().trade_count())
+    return _validate(transaction_data, _active_policy(), today_trade_count)
+
+@traced
+def validate_policies(trade_requests: list[dict]) -> dict:
+    """
+    Validate many TradeRequests against one policy and one portfolio snapshot.
+
+    The policy is compiled once and the portfolio is loaded once for the whole batch.
+    Each request's position size is recomputed against that snapshot, and every
+    approved BUY/SELL counts towards the daily trade limit of the requests after it.
+
+    Parameters:
+    trade_requests (list[dict]): TradeRequest dicts, in the order they would be executed.
+
+    Returns:
+        dict: Per-request results (in input order) plus approved/rejected counts.
+    """
+
+    logger.info("Starting batch policy validation of %d requests", len(trade_requests))
+
+    policy = _active_policy()
+    portfolio_assets, full_portfolio_value_usd = load_portfolio()
+    today_trade_count = get_trade_journal().trade_count()
+
+    results = []
+    for transaction_data in trade_requests:
+        position = transaction_data.get("position") or {}
+        quantity = position.get("quantity") or 0.0
+        entry_price = position.get("entry_price") or 0.0
+        if full_portfolio_value_usd and quantity and entry_price:
+            transaction_data = {
+                **transaction_data,
+                "position": {**position, "position_size_percent": quantity * entry_price / float(full_portfolio_value_usd) * 100},
+            }
+
+        result = _validate(transaction_data, policy, today_trade_count)
+        if result["status"] == "approved" and _is_trade(transaction_data):
+            today_trade_count += 1
+        results.append({"trade_request_id": transaction_data.get("id"), **result})
+
+    approved = sum(1 for r in results if r["status"] == "approved")
+    return {
+        "policy_type": policy.policy_type,
+        "portfolio_value_usd": full_portfolio_value_usd,
+        "approved": approved,
+        "rejected": len(results) - approved,
+        "results": results,
+    }
+
+def _validate(transaction_data: dict, policy: CompiledPolicy, today_trade_count: int) -> dict:
+    """Checks one transaction against a compiled policy and today's trade count."""
+
     # Basic action validation
     action_raw = transaction_data.get("action")
     if not isinstance(action_raw, str) or not action_raw:
@@ -37,14 +119,10 @@ def validate_policy(transaction_data: dict) -> dict:
 
         return {"status": "approved", "reason": "Hold action requires no risk validation."}
     
-    policy_type = os.getenv("TRADING_STRATEGY", "aggressive")  # Default to aggressive
-    policy = load_policy(policy_type=policy_type)
-    portfolio_assets, full_portfolio_value_usd = load_portfolio()
-
     # Unpack necessary data from policy
-    max_position_size_percent = policy["risk_management"]["position_sizing"]["max_position_size_percent"]
-    max_trades_per_day = policy["risk_management"]["daily_limits"]["max_trades_per_day"]
-    whitelisted_assets = policy["asset_policies"]["whitelist"]["assets"]
+    max_position_size_percent = policy.max_position_size_percent
+    max_trades_per_day = policy.max_trades_per_day
+    whitelisted_assets = list(policy.whitelisted_assets)
 
     # Unpack transaction details
     action = action_raw.lower()
@@ -57,7 +135,6 @@ def validate_policy(transaction_data: dict) -> dict:
     stop_loss_price = transaction_data.get("position", {}).get("stop_loss_price", None)
     order_type = transaction_data.get("position", {}).get("order_type", "").lower()
     coin_market_cap = transaction_data.get("asset", {}).get("coin_market_cap", 0.0)
-    today_trade_count = transaction_data.get("today_trade_count", 0)
 
     logger.info("Validating transaction: action=%s, symbol=%s, position_size_percent=%.4f, today_trade_count=%s, order_type=%s, coin_market_cap=%s, current_price=%s",
         action,
@@ -107,7 +184,7 @@ def validate_policy(transaction_data: dict) -> dict:
         }
 
     # Validation 3: Stop loss
-    if policy["risk_management"]["stop_loss"]["required"]:
+    if policy.stop_loss_required:
         if stop_loss_price is None or stop_loss_price == 0:
             logger.warning(
                 "Policy validation failed: stop-loss required but not set. action=%s, symbol=%s",
@@ -122,7 +199,7 @@ def validate_policy(transaction_data: dict) -> dict:
             }
     
     # Validation 4: Take profit
-    if policy["risk_management"]["take_profit"]["required"]:
+    if policy.take_profit_required:
         if target_exit_price is None or target_exit_price == 0:
             logger.warning(
                 "Policy validation failed: take-profit required but not set. action=%s, symbol=%s",
@@ -139,8 +216,8 @@ def validate_policy(transaction_data: dict) -> dict:
     ## Asset policies Validations ##
     
     # Validation 1: Check if asset is whitelisted
-    if policy["asset_policies"]["whitelist"]:
-        if coin_symbol.upper() not in [a.upper() for a in whitelisted_assets]:
+    if policy.whitelist_enabled:
+        if coin_symbol.upper() not in policy.whitelist:
             logger.warning(
                 "Policy validation failed: asset not in whitelist. symbol=%s, whitelist=%s",
                 coin_symbol.upper(),
@@ -155,7 +232,7 @@ def validate_policy(transaction_data: dict) -> dict:
             }
 
     # Validation 2: Minimum market cap
-    min_market_cap_usd = policy["asset_policies"]["minimum_market_cap_usd"]
+    min_market_cap_usd = policy.minimum_market_cap_usd
     if coin_market_cap < min_market_cap_usd:
         logger.warning(
             "Policy validation failed: market cap below minimum. symbol=%s, coin_market_cap=%s, "
@@ -175,8 +252,8 @@ def validate_policy(transaction_data: dict) -> dict:
     ## Trading rules Validations ##
 
     # Validation 1: Check if order type is allowed
-    allowed_order_types = policy["trading_rules"]["allowed_order_types"]
-    if order_type not in [ot.lower() for ot in allowed_order_types]:
+    allowed_order_types = list(policy.allowed_order_types)
+    if order_type not in policy.allowed_order_types_set:
         logger.warning(
             "Policy validation failed: order type not allowed. order_type=%s, allowed_order_types=%s, "
             "action=%s, symbol=%s",
@@ -194,9 +271,24 @@ def validate_policy(transaction_data: dict) -> dict:
         }
 
     # Validation 2: Volatility check
-    volatility_halt_threshold = policy["trading_rules"]["trading_halted_if_volatility_percent"] 
-    volatility_1d_percent = transaction_data.get("asset", {}).get("volatility_1d", 0.0)
-    if volatility_1d_percent > volatility_halt_threshold:
+    volatility_halt_threshold = policy.volatility_halt_percent
+    volatility_1d_percent, volatility_known = _volatility_1d(transaction_data, coin_symbol)
+    if not volatility_known and not policy.allow_unknown_volatility:
+        # The halt is a risk gate: without a volatility figure the trade cannot be shown to pass it
+        logger.warning(
+            "Policy validation failed: no 1-day volatility available. symbol=%s", coin_symbol.upper())
+        return {
+            "status": "rejected",
+            "reason": f"Volatility of {coin_symbol.upper()} could not be determined, so the volatility halt "
+                      f"cannot be checked",
+            "field": "volatility_1d",
+            "actual": None,
+            "limit": volatility_halt_threshold
+        }
+    if not volatility_known:
+        logger.warning("Volatility check skipped (allow_unknown_volatility): no 1-day volatility available for %s",
+                       coin_symbol.upper())
+    elif volatility_1d_percent > volatility_halt_threshold:
         logger.warning(
             "Policy validation failed: volatility too high. volatility_1d_percent=%s, "
             "volatility_halt_threshold=%s, symbol=%s",
@@ -206,7 +298,7 @@ def validate_policy(transaction_data: dict) -> dict:
         )
         return {
             "status": "rejected",
-            "reason": f"Trading halted due to high volatility {volatility_1d_percent:.2%} exceeding threshold {volatility_halt_threshold:.2%}",
+            "reason": f"Trading halted due to high volatility {volatility_1d_percent:.2f}% exceeding threshold {volatility_halt_threshold:.2f}%",
             "field": "volatility_1d",
             "actual": volatility_1d_percent,
             "limit": volatility_halt_threshold
@@ -224,9 +316,12 @@ def validate_policy(transaction_data: dict) -> dict:
             "daily_limits",
             "asset_whitelist",
             "stop_loss_requirement",
-            "volatility_check"
         ]
     }
+    if volatility_known:
+        approval_payload["checked_validations"].append("volatility_check")
+    else:
+        approval_payload["unchecked_validations"] = ["volatility_check"]
     logger.info(
         "Policy validation approved. action=%s, symbol=%s, details=%s",
         action,
@@ -2,12 +2,14 @@ from google.adk.agents import LlmAgent
 from google.genai import types
 
 from .prompt import TECHNICAL_ANALYST_PROMPT
-from .tools.get_crypto_technical_data import get_crypto_technical_data
+from .tools.get_crypto_technical_data import get_crypto_technical_data, get_crypto_technical_data_table
+from .tools.get_technical_indicators import get_technical_indicators
+from .tools.volatility import get_volatility_estimates
 
 technical_analyst = LlmAgent(
     model='gemini-2.5-flash',
     name='technical_analyst',
     description='A crypto business analyst that analyses technical crypto data and prepares reports.',
     static_instruction=types.Content(role="system", parts=[types.Part(text=TECHNICAL_ANALYST_PROMPT)]),
-    tools=[get_crypto_technical_data]
+    tools=[get_crypto_technical_data, get_crypto_technical_data_table, get_technical_indicators, get_volatility_estimates]
 )
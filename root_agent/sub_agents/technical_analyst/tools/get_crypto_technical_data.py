@@ -1,140 +1,321 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 import logging
+import time
+
+from ....tools.market_data_cache import coingecko_get
+from ....tools.numbers import compact_number
+from ....tools.ohlcv_store import get_ohlcv_store
+from ....tools.tracing import submit_in_context, traced
 
 logger = logging.getLogger("root_agent")
 
-def get_crypto_technical_data(coin_id: str, symbol: str,  currency: str = "usd"):
+# Strict wall-clock budget (seconds) for the concurrent CoinGecko calls of one tool invocation
+TECHNICAL_DATA_DEADLINE_SECONDS = 8.0
+
+# Shared pool for the concurrent CoinGecko requests
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="technical-data")
+
+# Fields derived from the /coins/{id} response, reported as missing when that call is late
+COIN_DATA_FIELDS = [
+    "current_price", "sentiment_votes_up_percentage", "sentiment_votes_down_percentage",
+    "watchlist_portfolio_users", "market_cap", "market_cap_rank", "ath", "atl",
+    "fully_diluted_valuation", "market_cap_fdv_ratio", "total_volume", "high_24h", "low_24h",
+    "price_change_24h", "price_change_percentage_24h", "price_change_percentage_7d",
+    "price_change_percentage_14d", "price_change_percentage_30d", "price_change_percentage_60d",
+    "price_change_percentage_200d", "price_change_percentage_1y", "market_cap_change_24h",
+    "market_cap_change_percentage_24h", "total_supply", "max_supply", "circulating_supply",
+]
+
+def _submit_fetches(coin_id: str, currency: str, deadline: float) -> tuple:
+    """Starts the /coins/{id} and 1-day market chart requests of one coin."""
+    return (submit_in_context(_executor, coingecko_get, f"coins/{coin_id}", None, deadline),
+            submit_in_context(_executor, _fetch_market_chart_1d, coin_id, currency, deadline))
+
+def _collect_technical_data(coin_id: str, symbol: str, currency: str, futures: tuple) -> dict:
+    """Builds one coin's technical data from its (finished or late) fetches."""
+    errors = {}
+    coin_data = _future_result(futures[0], "coin_data", errors)
+    prices_data = _future_result(futures[1], "market_chart", errors)
+
+    if coin_data is None and prices_data is None:
+        return {"error": "; ".join(f"{side}: {message}" for side, message in errors.items())}
+
+    try:
+        # CoinGecko keys the coin-denominated values by the lower-case symbol
+        technical_data = _build_technical_data(coin_data or {}, symbol.lower(), currency)
+        technical_data["volatility_1d"] = _range_volatility(prices_data or [])
+        technical_data["volatility_1d_valid"] = prices_data is not None and _has_price_range(prices_data)
+    except Exception as e:
+        logger.warning("Unexpected CoinGecko data for %s: %r", coin_id, e)
+        return {"error": f"unexpected CoinGecko data: {type(e).__name__}: {e}"}
+
+    missing_fields = []
+    if coin_data is None:
+        missing_fields.extend(COIN_DATA_FIELDS)
+    if prices_data is None:
+        missing_fields.append("volatility_1d")
+    if missing_fields:
+        technical_data["missing_fields"] = missing_fields
+        technical_data["errors"] = errors
+        logger.warning("Returning partial technical data for %s, missing: %s", coin_id, list(errors))
+    return technical_data
+
+@traced
+def get_crypto_technical_data(coin_id: str, symbol: str,  currency: str = "usd", compact: bool = True):
     """Fetches technical data for a given cryptocurrency from the CoinGecko API.
+
+    The coin details and the 1-day market chart are requested concurrently under a
+    shared deadline. If one side does not answer in time, the other side's data is
+    still returned and the affected fields are listed under `missing_fields`.
+
     Args:
         id (str): The CoinGecko ID of the cryptocurrency (e.g., 'bitcoin').
         symbol (str): The symbol of the cryptocurrency (e.g., 'btc').
         currency (str, optional): The fiat currency to compare against (e.g., 'usd').
+        compact (bool, optional): Flat keys suffixed with their denomination (e.g.
+            'ath_usd', 'ath_coin'), unavailable values dropped and numbers rounded
+            (see `compact_technical_data`). False returns the nested form with "N/A"
+            placeholders. Defaults to True.
     Returns:
         Dict[str, Any]: A dictionary containing various technical data points.
     """
 
-    coingecko_endpoint = f"https://api.coingecko.com/api/v3/"
-    detailed_data_for_coin = f"{coingecko_endpoint}/coins/{coin_id}"
+    logger.info("Getting technical data for coin: %s", coin_id)
+    started = time.monotonic()
+    deadline = TECHNICAL_DATA_DEADLINE_SECONDS
 
-    technical_data = {}
-    
-    # Get the filtered technical data from the endpoint
+    futures = _submit_fetches(coin_id, currency, deadline)
+    wait(futures, timeout=deadline)
+    technical_data = _collect_technical_data(coin_id, symbol, currency, futures)
+
+    logger.info("Technical data for %s fetched in %.2fs", coin_id, time.monotonic() - started)
+    if compact and "error" not in technical_data:
+        return compact_technical_data(technical_data, currency)
+    return technical_data
+
+@traced
+def get_crypto_technical_data_table(coin_ids: list[str], currency: str = "usd") -> dict:
+    """Fetches the technical data of several cryptocurrencies at once, as one compact table.
+
+    All coins are requested concurrently under the single deadline of
+    `get_crypto_technical_data`. The result is columnar: the field names are listed
+    once in `columns` and every coin has one row of values in that order (null where
+    a coin has no value), which is much shorter than one dict per coin.
+
+    Args:
+        coin_ids (list[str]): CoinGecko IDs (e.g., ['bitcoin', 'ethereum']).
+        currency (str, optional): The fiat currency to compare against. Defaults to "usd".
+    Returns:
+        dict: {"currency", "columns", "rows": {coin_id: [...]}}, plus "errors" for coins
+        that could not be fetched and "missing_fields" for coins with partial data.
+    """
+    logger.info("Getting technical data table for coins: %s", coin_ids)
+    started = time.monotonic()
+    deadline = TECHNICAL_DATA_DEADLINE_SECONDS
+
+    futures = {coin_id: _submit_fetches(coin_id, currency, deadline) for coin_id in dict.fromkeys(coin_ids)}
+    wait([future for pair in futures.values() for future in pair], timeout=deadline)
+
+    records, errors, missing = {}, {}, {}
+    for coin_id, pair in futures.items():
+        # The symbol (for the coin-denominated fields) comes from the coin's own response
+        coin_done = pair[0].done() and not pair[0].cancelled() and pair[0].exception() is None
+        coin_data = (pair[0].result() if coin_done else None) or {}
+        symbol = (coin_data.get("symbol") if isinstance(coin_data, dict) else None) or coin_id
+        technical_data = _collect_technical_data(coin_id, symbol, currency, pair)
+        if "error" in technical_data:
+            errors[coin_id] = technical_data["error"]
+            continue
+        record = compact_technical_data(technical_data, currency)
+        if "missing_fields" in record:
+            missing[coin_id] = record.pop("missing_fields")
+            errors[coin_id] = record.pop("errors")
+        records[coin_id] = record
+
+    columns = list(dict.fromkeys(key for record in records.values() for key in record))
+    table = {
+        "currency": currency,
+        "columns": columns,
+        "rows": {coin_id: [record.get(column) for column in columns] for coin_id, record in records.items()},
+    }
+    if missing:
+        table["missing_fields"] = missing
+    if errors:
+        table["errors"] = errors
+    logger.info("Technical data table for %d coins fetched in %.2fs", len(futures), time.monotonic() - started)
+    return table
+
+def _future_result(future, side: str, errors: dict):
+    """Returns a finished future's result, recording late or failed calls in `errors`."""
+    if not future.done():
+        future.cancel()
+        errors[side] = "deadline exceeded"
+        return None
     try:
-        logger.info("Getting technical data for coin: %s", coin_id)
-        coin_data = requests.get(detailed_data_for_coin).json()
-        current_price = coin_data.get("market_data", {}).get("current_price", {}).get(f"{currency}", "N/A")
-        
-        # Sentiment
-        sentiment_votes_up_percentage = coin_data.get("sentiment_votes_up_percentage", "N/A")
-        sentiment_votes_down_percentage = coin_data.get("sentiment_votes_down_percentage", "N/A")
-        watchlist_portfolio_users = coin_data.get("watchlist_portfolio_users", "N/A")
-        
-        # Market cap
-        market_data = coin_data.get("market_data", {}) or {}
-        market_cap = market_data.get("market_cap", {}).get(currency, "N/A")
-        market_cap_rank = coin_data.get("market_cap_rank", "N/A")
-
-        # Price changes 
-        ath = {"ath_coin": market_data.get("ath", {}).get(symbol, "N/A"), 
-               "ath_currency": market_data.get("ath", {}).get(currency, "N/A"),
-               "ath_change_percentage_coin": market_data.get("ath_change_percentage", {}).get(symbol, "N/A"),
-               "ath_change_percentage_currency": market_data.get("ath_change_percentage", {}).get(currency, "N/A")}
-
-        atl = {"atl_coin": market_data.get("atl", {}).get(symbol, "N/A"),
-               "atl_currency": market_data.get("atl", {}).get(currency, "N/A"),
-               "atl_change_percentage_coin": market_data.get("atl_change_percentage", {}).get(symbol, "N/A"),
-               "atl_change_percentage_currency": market_data.get("atl_change_percentage", {}).get(currency, "N/A")}
-
-        fully_diluted_valuation = {"fully_diluted_valuation_coin": market_data.get("fully_diluted_valuation", {}).get(symbol, "N/A"),
-                                   "fully_diluted_valuation_currency": market_data.get("fully_diluted_valuation", {}).get(currency, "N/A")}
-        market_cap_fdv_ratio = market_data.get("market_cap_fdv_ratio", "N/A")
-        
-        total_volume = market_data.get("total_volume", {}).get(currency, "N/A")
-
-        # Price changes
-        high_24h = {"high_24h_coin": market_data.get("high_24h", {}).get(symbol, "N/A"),
-                    "high_24h_currency": market_data.get("high_24h", {}).get(currency, "N/A")}
-        low_24h = {"low_24h_coin": market_data.get("low_24h", {}).get(symbol, "N/A"),
-                   "low_24h_currency": market_data.get("low_24h", {}).get(currency, "N/A")}
-        price_change_24h = market_data.get("price_change_24h", "N/A"),
-        price_change_percentage_24h = market_data.get("price_change_percentage_24h", "N/A")
-        price_change_percentage_7d = market_data.get("price_change_percentage_7d", "N/A")
-        price_change_percentage_14d = market_data.get("price_change_percentage_14d", "N/A")
-        price_change_percentage_30d = market_data.get("price_change_percentage_30d", "N/A")
-        price_change_percentage_60d = market_data.get("price_change_percentage_60d", "N/A")
-        price_change_percentage_200d = market_data.get("price_change_percentage_200d", "N/A")
-        price_change_percentage_1y = market_data.get("price_change_percentage_1y", "N/A")
-        market_cap_change_24h = market_data.get("market_cap_change_24h", "N/A")
-        market_cap_change_percentage_24h = market_data.get("market_cap_change_percentage_24h", "N/A")
-        volatility_1d = calculate_volatility_1d(coin_id, currency)
-
-        # Supply
-        total_supply = market_data.get("total_supply", "N/A")
-        max_supply = market_data.get("max_supply", "N/A")
-        circulating_supply = market_data.get("circulating_supply", "N/A")
-
-        technical_data = {
-            "current_price": {currency: current_price},
-            "sentiment_votes_up_percentage": sentiment_votes_up_percentage,
-            "sentiment_votes_down_percentage": sentiment_votes_down_percentage,
-            "watchlist_portfolio_users": watchlist_portfolio_users,
-            "market_cap": {currency: market_cap},
-            "market_cap_rank": market_cap_rank,
-            "ath": ath,
-            "atl": atl,
-            "fully_diluted_valuation": fully_diluted_valuation,
-            "market_cap_fdv_ratio": market_cap_fdv_ratio,
-            "total_volume": {currency: total_volume},
-            "high_24h": high_24h,
-            "low_24h": low_24h,
-            "price_change_24h": price_change_24h,
-            "price_change_percentage_24h": price_change_percentage_24h,
-            "price_change_percentage_7d": price_change_percentage_7d,
-            "price_change_percentage_14d": price_change_percentage_14d,
-            "price_change_percentage_30d": price_change_percentage_30d,
-            "price_change_percentage_60d": price_change_percentage_60d,
-            "price_change_percentage_200d": price_change_percentage_200d,
-            "price_change_percentage_1y": price_change_percentage_1y,
-            "market_cap_change_24h": market_cap_change_24h,
-            "market_cap_change_percentage_24h": market_cap_change_percentage_24h,
-            "total_supply": total_supply,
-            "max_supply": max_supply,
-            "circulating_supply": circulating_supply,
-            "volatility_1d": volatility_1d,
-        }
+        return future.result()
     except Exception as e:
-        technical_data = {"error": str(e)}
+        errors[side] = str(e)
+        return None
+
+def _build_technical_data(coin_data: dict, symbol: str, currency: str) -> dict:
+    """Extracts the technical data points from a CoinGecko /coins/{id} response."""
+    # Null nested objects (e.g. "market_data": null for delisted coins) are treated as empty
+    market_data = coin_data.get("market_data") or {}
+
+    def quoted(field, key):
+        return (market_data.get(field) or {}).get(key, "N/A")
+
+    current_price = quoted("current_price", currency)
+    
+    # Sentiment
+    sentiment_votes_up_percentage = coin_data.get("sentiment_votes_up_percentage", "N/A")
+    sentiment_votes_down_percentage = coin_data.get("sentiment_votes_down_percentage", "N/A")
+    watchlist_portfolio_users = coin_data.get("watchlist_portfolio_users", "N/A")
+    
+    # Market cap
+    market_cap = quoted("market_cap", currency)
+    market_cap_rank = coin_data.get("market_cap_rank", "N/A")
+
+    # Price changes 
+    ath = {"ath_coin": quoted("ath", symbol), 
+           "ath_currency": quoted("ath", currency),
+           "ath_change_percentage_coin": quoted("ath_change_percentage", symbol),
+           "ath_change_percentage_currency": quoted("ath_change_percentage", currency)}
+
+    atl = {"atl_coin": quoted("atl", symbol),
+           "atl_currency": quoted("atl", currency),
+           "atl_change_percentage_coin": quoted("atl_change_percentage", symbol),
+           "atl_change_percentage_currency": quoted("atl_change_percentage", currency)}
+
+    fully_diluted_valuation = {"fully_diluted_valuation_coin": quoted("fully_diluted_valuation", symbol),
+                               "fully_diluted_valuation_currency": quoted("fully_diluted_valuation", currency)}
+    market_cap_fdv_ratio = market_data.get("market_cap_fdv_ratio", "N/A")
+    
+    total_volume = quoted("total_volume", currency)
+
+    # Price changes
+    high_24h = {"high_24h_coin": quoted("high_24h", symbol),
+                "high_24h_currency": quoted("high_24h", currency)}
+    low_24h = {"low_24h_coin": quoted("low_24h", symbol),
+               "low_24h_currency": quoted("low_24h", currency)}
+    price_change_24h = market_data.get("price_change_24h", "N/A")
+    price_change_percentage_24h = market_data.get("price_change_percentage_24h", "N/A")
+    price_change_percentage_7d = market_data.get("price_change_percentage_7d", "N/A")
+    price_change_percentage_14d = market_data.get("price_change_percentage_14d", "N/A")
+    price_change_percentage_30d = market_data.get("price_change_percentage_30d", "N/A")
+    price_change_percentage_60d = market_data.get("price_change_percentage_60d", "N/A")
+    price_change_percentage_200d = market_data.get("price_change_percentage_200d", "N/A")
+    price_change_percentage_1y = market_data.get("price_change_percentage_1y", "N/A")
+    market_cap_change_24h = market_data.get("market_cap_change_24h", "N/A")
+    market_cap_change_percentage_24h = market_data.get("market_cap_change_percentage_24h", "N/A")
+
+    # Supply
+    total_supply = market_data.get("total_supply", "N/A")
+    max_supply = market_data.get("max_supply", "N/A")
+    circulating_supply = market_data.get("circulating_supply", "N/A")
+
+    technical_data = {
+        "current_price": {currency: current_price},
+        "sentiment_votes_up_percentage": sentiment_votes_up_percentage,
+        "sentiment_votes_down_percentage": sentiment_votes_down_percentage,
+        "watchlist_portfolio_users": watchlist_portfolio_users,
+        "market_cap": {currency: market_cap},
+        "market_cap_rank": market_cap_rank,
+        "ath": ath,
+        "atl": atl,
+        "fully_diluted_valuation": fully_diluted_valuation,
+        "market_cap_fdv_ratio": market_cap_fdv_ratio,
+        "total_volume": {currency: total_volume},
+        "high_24h": high_24h,
+        "low_24h": low_24h,
+        "price_change_24h": price_change_24h,
+        "price_change_percentage_24h": price_change_percentage_24h,
+        "price_change_percentage_7d": price_change_percentage_7d,
+        "price_change_percentage_14d": price_change_percentage_14d,
+        "price_change_percentage_30d": price_change_percentage_30d,
+        "price_change_percentage_60d": price_change_percentage_60d,
+        "price_change_percentage_200d": price_change_percentage_200d,
+        "price_change_percentage_1y": price_change_percentage_1y,
+        "market_cap_change_24h": market_cap_change_24h,
+        "market_cap_change_percentage_24h": market_cap_change_percentage_24h,
+        "total_supply": total_supply,
+        "max_supply": max_supply,
+        "circulating_supply": circulating_supply,
+    }
 
     return technical_data
 
+def _compact_key(key: str) -> str:
+    return key.replace("percentage", "pct")
+
+def compact_technical_data(technical_data: dict, currency: str = "usd") -> dict:
+    """Flattens `get_crypto_technical_data`'s nested result into the compact schema.
+
+    Every field is kept under a flat key: values quoted in the fiat currency get its
+    suffix ('current_price_usd', 'ath_usd') and values quoted in the coin itself a
+    '_coin' suffix ('ath_coin'), 'percentage' is shortened to 'pct', "N/A" and null
+    values are dropped and numbers are rounded (see `compact_number`).
+    `missing_fields` and `errors` are kept as they are.
+    """
+    compact = {}
+    for key, value in technical_data.items():
+        if key in ("missing_fields", "errors"):
+            compact[key] = value
+        elif isinstance(value, dict):
+            for inner_key, inner_value in value.items():
+                if inner_key == currency:
+                    flat_key = f"{key}_{currency}"
+                elif inner_key.endswith("_currency"):
+                    flat_key = f"{inner_key[:-len('_currency')]}_{currency}"
+                else:
+                    flat_key = inner_key
+                compact[_compact_key(flat_key)] = inner_value
+        else:
+            compact[_compact_key(key)] = value
+    return {key: compact_number(key, value) for key, value in compact.items()
+            if value is not None and value != "N/A"}
+
 def calculate_volatility_1d(coin_id: str, currency: str = "usd") -> float:
     """Calculates 1-day Range Volatility using price data from CoinGecko.
     Args:
         coin_id (str): The CoinGecko ID of the cryptocurrency.
         currency (str, optional): The fiat currency to compare against. Defaults to "usd".
     Returns:
-        float: The 1-day volatility percentage.
+        float: The 1-day volatility percentage, 0.0 when it cannot be computed.
     """
     try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart?vs_currency={currency}&days=1"
-        response = requests.get(url).json()
-        
-        prices_data = response.get("prices", [])
-        if len(prices_data) < 2:
-            return "N/A" #type: ignore
-        
-        # Extract price values
-        price_values = [p[1] for p in prices_data]
-        
-        # High and low prices
-        high_price = max(price_values)
-        low_price = min(price_values)
-        
-        # ((High - Low) / Low) * 100
-        volatility_range = ((high_price - low_price) / low_price) * 100
-        
-        return round(volatility_range, 2)
-        
+        prices_data = _fetch_market_chart_1d(coin_id, currency)
+        return _range_volatility(prices_data)
     except Exception as e:
         logger.info(f"Error calculating volatility: {e}")
-        return "N/A" #type: ignore
\ No newline at end of file
+        return 0.0
+
+def _fetch_market_chart_1d(coin_id: str, currency: str, timeout: float = TECHNICAL_DATA_DEADLINE_SECONDS) -> list:
+    """Returns the [timestamp, price] pairs of the last 24h (5-minute points).
+
+    Served from the local OHLCV store, which only requests the minutes added
+    since the previous call from CoinGecko (each request within `timeout` seconds).
+    """
+    store = get_ohlcv_store()
+    return store.as_market_chart(store.recent(coin_id, 86400, "5m", currency, timeout=timeout))
+
+def _has_price_range(prices_data: list) -> bool:
+    """Whether a range volatility can be computed: at least 2 points, all with a positive price."""
+    return len(prices_data) >= 2 and all(p[1] > 0 for p in prices_data)
+
+def _range_volatility(prices_data: list) -> float:
+    """Computes ((High - Low) / Low) * 100 over a list of [timestamp, price] pairs (0.0 when `_has_price_range` is False)."""
+    if not _has_price_range(prices_data):
+        return 0.0
+
+    # Extract price values
+    price_values = [p[1] for p in prices_data]
+
+    # High and low prices
+    high_price = max(price_values)
+    low_price = min(price_values)
+
+    # ((High - Low) / Low) * 100
+    volatility_range = ((high_price - low_price) / low_price) * 100
+
+    return round(volatility_range, 2)
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+import logging
+import math
+import threading
+
+from .get_crypto_technical_data import TECHNICAL_DATA_DEADLINE_SECONDS
+from .indicators import IndicatorEngine, align_candles, to_candles
+from ....tools.ohlcv_store import get_ohlcv_store
+from ....tools.tracing import submit_in_context, traced
+
+logger = logging.getLogger("root_agent")
+
+# Candle size per requested history (CoinGecko returns 5-minute points for 1 day, hourly up to 90 days)
+CANDLE_SECONDS_BY_MAX_DAYS = ((1, 3600), (90, 4 * 3600))
+DAILY_CANDLE_SECONDS = 86400
+
+# Incremental engines, keyed by (coin ids, currency, candle seconds); least recently used first
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+# Engines kept at most (one per distinct coin set and candle size asked for)
+INDICATOR_ENGINES_LIMIT = 32
+
+# Pool for the concurrent price history reads
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="indicators")
+
+def _candle_seconds(days: int) -> int:
+    for max_days, seconds in CANDLE_SECONDS_BY_MAX_DAYS:
+        if days <= max_days:
+            return seconds
+    return DAILY_CANDLE_SECONDS
+
+def _fetch_prices(coin_id: str, currency: str, days: int) -> list:
+    """[timestamp_ms, price] pairs of the last `days`, from the local OHLCV store (gap-only fetching)."""
+    store = get_ohlcv_store()
+    return store.as_market_chart(store.recent(coin_id, int(days * 86400), currency=currency))
+
+def _rounded(value):
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return float(f"{value:.6g}")
+
+@traced
+def get_technical_indicators(coin_ids: list[str], days: int = 30, currency: str = "usd") -> dict:
+    """Computes technical indicators for one or more coins from CoinGecko market charts.
+
+    Prices are resampled into candles (1h for 1 day of history, 4h up to 90 days,
+    daily beyond) and all coins are computed together: SMA 20, EMA 12/26, RSI 14,
+    MACD (12/26/9), Bollinger bands (20, 2σ), ATR 14 and pivot-based support and
+    resistance. Repeated calls only feed candles closed since the previous call
+    into the indicator state.
+
+    Args:
+        coin_ids (list[str]): CoinGecko IDs (e.g., ['bitcoin', 'ethereum']).
+        days (int, optional): History to compute from. Defaults to 30.
+        currency (str, optional): The fiat currency. Defaults to "usd".
+    Returns:
+        dict: {"candle_interval", "candles", "as_of", "indicators": {coin_id: {...}}}, plus
+        "errors" for coins whose data could not be fetched. Values still warming up are null.
+    """
+
+    logger.info("Computing technical indicators for %s (days=%s)", coin_ids, days)
+    candle_seconds = _candle_seconds(days)
+
+    futures = {coin_id: submit_in_context(_executor, _fetch_prices, coin_id, currency, days)
+               for coin_id in coin_ids}
+    candles_by_coin, errors = {}, {}
+    for coin_id, future in futures.items():
+        try:
+            candles = to_candles(future.result(timeout=TECHNICAL_DATA_DEADLINE_SECONDS), candle_seconds)
+        except Exception as e:
+            errors[coin_id] = str(e)
+            continue
+        if candles:
+            candles_by_coin[coin_id] = candles
+        else:
+            errors[coin_id] = "no price data"
+
+    if not candles_by_coin:
+        return {"error": "; ".join(f"{coin_id}: {message}" for coin_id, message in errors.items())}
+
+    times, _, high, low, close = align_candles(candles_by_coin)
+    if len(times) == 0:
+        return {"error": "No common candles for the requested coins"}
+
+    key = (tuple(candles_by_coin), currency, candle_seconds)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None or engine.last_time is None or engine.last_time not in set(times.tolist()):
+            engine = IndicatorEngine(list(candles_by_coin))
+            engine.seed(times, high, low, close)
+            _engines[key] = engine
+        else:
+            new = times > engine.last_time
+            for i in map(int, new.nonzero()[0]):
+                engine.update(times[i], high[:, i], low[:, i], close[:, i])
+        _engines.move_to_end(key)
+        if len(_engines) > INDICATOR_ENGINES_LIMIT:
+            _engines.popitem(last=False)
+        snapshot = engine.snapshot()
+
+    result = {
+        "candle_interval": f"{candle_seconds // 3600}h" if candle_seconds < DAILY_CANDLE_SECONDS else "1d",
+        "candles": len(times),
+        "as_of": datetime.fromtimestamp(int(times[-1]) + candle_seconds, UTC).isoformat().replace("+00:00", "Z"),
+        "indicators": {coin_id: {name: _rounded(value) for name, value in values.items()}
+                       for coin_id, values in snapshot.items()},
+    }
+    if errors:
+        result["errors"] = errors
+    return result
@@ -0,0 +1,261 @@
+"""Vectorised technical indicators.
+
+Every function takes arrays shaped (n_coins, n_candles) (1-D arrays work too)
+and computes along the last axis, so one call covers all coins. Values that
+are not yet defined (warm-up period) are NaN.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SMA_WINDOW = 20
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_STDS = 2.0
+ATR_PERIOD = 14
+PIVOT_SPAN = 3  # candles on each side of a pivot high/low
+LEVELS = 3  # support/resistance levels reported per side
+LEVEL_MERGE_PERCENT = 0.5  # pivots closer than this (% of the last close) count as one level
+
+
+def to_candles(prices: list, candle_seconds: int) -> dict:
+    """Resamples CoinGecko [timestamp_ms, price] pairs into complete OHLC candles.
+
+    Candles are keyed by bucket start (epoch seconds); the last bucket is still
+    forming and is dropped.
+    """
+    if not prices:
+        return {}
+    data = np.asarray(prices, dtype=float)
+    buckets = (data[:, 0] // 1000 // candle_seconds).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)]
+    values = data[:, 1]
+    candles = {
+        int(buckets[s]) * candle_seconds: (values[s], values[s:e].max(), values[s:e].min(), values[e - 1])
+        for s, e in zip(starts, ends)
+    }
+    candles.pop(int(buckets[-1]) * candle_seconds, None)
+    return candles
+
+
+def align_candles(candles_by_coin: dict) -> tuple:
+    """Aligns per-coin candles on the buckets every coin has.
+
+    Returns:
+        tuple: (times (T,), open, high, low, close) with price arrays shaped (n_coins, T)
+        in the order of `candles_by_coin`.
+    """
+    common = None
+    for candles in candles_by_coin.values():
+        common = set(candles) if common is None else common & set(candles)
+    times = np.array(sorted(common or ()), dtype=np.int64)
+    ohlc = np.array(
+        [[candles[t] for t in times] for candles in candles_by_coin.values()], dtype=float
+    ).reshape(len(candles_by_coin), len(times), 4)
+    return times, ohlc[..., 0], ohlc[..., 1], ohlc[..., 2], ohlc[..., 3]
+
+
+def sma(x, window: int = SMA_WINDOW) -> np.ndarray:
+    """Simple moving average."""
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(x, window, axis=-1).mean(axis=-1)
+    return out
+
+
+def _recursive_average(x, alpha: float, period: int) -> np.ndarray:
+    """Exponential smoothing seeded with the SMA of the first `period` defined values."""
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    defined = ~np.isnan(x).reshape(-1, x.shape[-1]).any(axis=0)
+    start = int(np.argmax(defined)) if defined.any() else x.shape[-1]
+    if x.shape[-1] - start < period:
+        return out
+    seed = start + period - 1
+    out[..., seed] = x[..., start:seed + 1].mean(axis=-1)
+    for t in range(seed + 1, x.shape[-1]):
+        out[..., t] = alpha * x[..., t] + (1 - alpha) * out[..., t - 1]
+    return out
+
+
+def ema(x, span: int) -> np.ndarray:
+    """Exponential moving average with alpha = 2 / (span + 1)."""
+    return _recursive_average(x, 2.0 / (span + 1), span)
+
+
+def wilder(x, period: int) -> np.ndarray:
+    """Wilder's smoothing (alpha = 1 / period), used by RSI and ATR."""
+    return _recursive_average(x, 1.0 / period, period)
+
+
+def _rsi_averages(close, period: int) -> tuple:
+    delta = np.diff(np.asarray(close, dtype=float), axis=-1)
+    pad = np.full(delta.shape[:-1] + (1,), np.nan)
+    avg_gain = np.concatenate([pad, wilder(np.clip(delta, 0, None), period)], axis=-1)
+    avg_loss = np.concatenate([pad, wilder(np.clip(-delta, 0, None), period)], axis=-1)
+    return avg_gain, avg_loss
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), rsi)
+
+
+def rsi(close, period: int = RSI_PERIOD) -> np.ndarray:
+    """Relative Strength Index (Wilder)."""
+    return _rsi_from_averages(*_rsi_averages(close, period))
+
+
+def macd(close, fast: int = EMA_FAST, slow: int = EMA_SLOW, signal: int = MACD_SIGNAL) -> tuple:
+    """Returns (macd line, signal line, histogram)."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, window: int = BOLLINGER_WINDOW, stds: float = BOLLINGER_STDS) -> tuple:
+    """Returns (middle, upper, lower) Bollinger bands."""
+    close = np.asarray(close, dtype=float)
+    middle = sma(close, window)
+    deviation = np.full(close.shape, np.nan)
+    if close.shape[-1] >= window:
+        deviation[..., window - 1:] = sliding_window_view(close, window, axis=-1).std(axis=-1)
+    return middle, middle + stds * deviation, middle - stds * deviation
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    previous_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    return np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+
+def atr(high, low, close, period: int = ATR_PERIOD) -> np.ndarray:
+    """Average True Range (Wilder)."""
+    return wilder(true_range(high, low, close), period)
+
+
+def _distinct_levels(candidates, last: float, levels: int) -> list:
+    """Keeps the nearest `levels` candidates that are not within LEVEL_MERGE_PERCENT of a kept one."""
+    kept = []
+    for level in sorted(candidates, key=lambda level: abs(level - last)):
+        if all(abs(level - other) > last * LEVEL_MERGE_PERCENT / 100 for other in kept):
+            kept.append(float(level))
+            if len(kept) == levels:
+                break
+    return kept
+
+
+def pivot_levels(high, low, close, span: int = PIVOT_SPAN, levels: int = LEVELS) -> list:
+    """Support/resistance from pivot lows/highs, nearest to the last close first.
+
+    A pivot high (low) is a candle whose high (low) is the extreme of the
+    `span` candles on either side; pivots closer together than
+    LEVEL_MERGE_PERCENT are reported as one level.
+
+    Returns:
+        list: One {"support": [...], "resistance": [...]} dict per coin.
+    """
+    high, low, close = (np.atleast_2d(np.asarray(a, dtype=float)) for a in (high, low, close))
+    result = [{"support": [], "resistance": []} for _ in range(high.shape[0])]
+    width = 2 * span + 1
+    if high.shape[-1] < width:
+        return result
+    centre = slice(span, high.shape[-1] - span)
+    pivot_high = high[:, centre] == sliding_window_view(high, width, axis=-1).max(axis=-1)
+    pivot_low = low[:, centre] == sliding_window_view(low, width, axis=-1).min(axis=-1)
+    for i, last in enumerate(close[:, -1]):
+        highs = np.unique(high[i, centre][pivot_high[i]])
+        lows = np.unique(low[i, centre][pivot_low[i]])
+        candidates = np.concatenate([highs, lows])
+        result[i]["resistance"] = _distinct_levels(candidates[candidates > last], last, levels)
+        result[i]["support"] = _distinct_levels(candidates[candidates < last], last, levels)
+    return result
+
+
+class IndicatorEngine:
+    """Incremental indicators for a fixed set of coins on aligned candles.
+
+    `seed()` computes everything from history in one vectorised pass and keeps
+    the recursive states (EMAs, Wilder averages) plus a bounded window of recent
+    candles. `update()` then advances all coins by one candle in O(window),
+    instead of recomputing the whole series. While an indicator is still warming
+    up, the engine re-seeds from its window.
+    """
+
+    def __init__(self, coins: list, history: int = 250):
+        self.coins = list(coins)
+        self.history = history
+        self.last_time = None
+
+    def seed(self, times, high, low, close):
+        high, low, close = (np.atleast_2d(np.asarray(a, dtype=float))[:, -self.history:] for a in (high, low, close))
+        self.high, self.low, self.close = high, low, close
+        self.last_time = int(times[-1]) if len(times) else None
+        self.ema_fast = ema(close, EMA_FAST)[:, -1]
+        self.ema_slow = ema(close, EMA_SLOW)[:, -1]
+        self.macd_signal = ema(ema(close, EMA_FAST) - ema(close, EMA_SLOW), MACD_SIGNAL)[:, -1]
+        avg_gain, avg_loss = _rsi_averages(close, RSI_PERIOD)
+        self.avg_gain, self.avg_loss = avg_gain[:, -1], avg_loss[:, -1]
+        self.atr = atr(high, low, close, ATR_PERIOD)[:, -1]
+
+    def update(self, time: int, high, low, close):
+        """Appends one candle (arrays shaped (n_coins,)) and advances every indicator."""
+        high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+        previous_close = self.close[:, -1]
+        self.high = np.concatenate([self.high, high[:, None]], axis=1)[:, -self.history:]
+        self.low = np.concatenate([self.low, low[:, None]], axis=1)[:, -self.history:]
+        self.close = np.concatenate([self.close, close[:, None]], axis=1)[:, -self.history:]
+
+        states = (self.ema_fast, self.ema_slow, self.macd_signal, self.avg_gain, self.avg_loss, self.atr)
+        if any(np.isnan(state).any() for state in states):
+            self.seed(np.array([time]), self.high, self.low, self.close)
+            return
+
+        self.last_time = int(time)
+        fast, slow = 2.0 / (EMA_FAST + 1), 2.0 / (EMA_SLOW + 1)
+        self.ema_fast = fast * close + (1 - fast) * self.ema_fast
+        self.ema_slow = slow * close + (1 - slow) * self.ema_slow
+        signal = 2.0 / (MACD_SIGNAL + 1)
+        self.macd_signal = signal * (self.ema_fast - self.ema_slow) + (1 - signal) * self.macd_signal
+        delta = close - previous_close
+        self.avg_gain = (np.clip(delta, 0, None) + (RSI_PERIOD - 1) * self.avg_gain) / RSI_PERIOD
+        self.avg_loss = (np.clip(-delta, 0, None) + (RSI_PERIOD - 1) * self.avg_loss) / RSI_PERIOD
+        tr = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+        self.atr = (tr + (ATR_PERIOD - 1) * self.atr) / ATR_PERIOD
+
+    def snapshot(self) -> dict:
+        """Latest indicator values per coin (NaN where still warming up)."""
+        close = self.close
+        last = close[:, -1]
+        middle, upper, lower = (band[:, -1] for band in bollinger(close[:, -BOLLINGER_WINDOW:]))
+        macd_line = self.ema_fast - self.ema_slow
+        levels = pivot_levels(self.high, self.low, close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns = {
+                "close": last,
+                f"sma_{SMA_WINDOW}": sma(close[:, -SMA_WINDOW:], SMA_WINDOW)[:, -1],
+                f"ema_{EMA_FAST}": self.ema_fast,
+                f"ema_{EMA_SLOW}": self.ema_slow,
+                f"rsi_{RSI_PERIOD}": _rsi_from_averages(self.avg_gain, self.avg_loss),
+                "macd": macd_line,
+                "macd_signal": self.macd_signal,
+                "macd_hist": macd_line - self.macd_signal,
+                "bb_upper": upper,
+                "bb_middle": middle,
+                "bb_lower": lower,
+                "bb_width_pct": (upper - lower) / middle * 100,
+                f"atr_{ATR_PERIOD}": self.atr,
+                "atr_pct": self.atr / last * 100,
+            }
+        return {
+            coin: {
+                **{name: values[i] for name, values in columns.items()},
+                **levels[i],
+            }
+            for i, coin in enumerate(self.coins)
+        }
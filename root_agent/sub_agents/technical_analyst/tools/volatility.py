@@ -0,0 +1,259 @@
+"""Multi-window volatility estimators.
+
+For every whitelisted asset and window (1h, 4h, 1d, 7d) the table holds:
+- close_to_close: standard deviation of bar-to-bar log returns, scaled to the window;
+- parkinson: high/low (Parkinson) estimator, scaled to the window;
+- garman_klass: open/high/low/close (Garman-Klass) estimator, scaled to the window;
+- range: (high - low) / low over the window.
+All values are percentages of price over the window (not annualised) and are
+always numbers: when there is too little data the value is 0.0 and `valid`
+is False. The estimators are computed on (assets, bars) arrays, so all assets
+of a window are handled in one vectorised pass.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import math
+import os
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from ....tools.ohlcv_store import get_ohlcv_store
+from ....tools.tracing import submit_in_context, traced
+
+logger = logging.getLogger("root_agent")
+
+ESTIMATORS = ("close_to_close", "parkinson", "garman_klass", "range")
+
+# window -> (window seconds, bar seconds, OHLCV store resolution)
+WINDOWS = {
+    "1h": (3600, 900, "5m"),
+    "4h": (4 * 3600, 900, "5m"),
+    "1d": (86400, 3600, "5m"),
+    "7d": (7 * 86400, 4 * 3600, "1h"),
+}
+
+# Share of a window's bars that must contain data for its estimates to be valid
+MIN_BAR_COVERAGE = 0.5
+MIN_BARS = 3
+
+# How long a computed table is served before it is recomputed
+VOLATILITY_TABLE_TTL_SECONDS = 60
+# How much longer an expired table may be served while a background refresh runs
+VOLATILITY_TABLE_MAX_STALE_SECONDS = 600
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="volatility")
+
+
+def _bars(t: np.ndarray, price: np.ndarray, start: int, bar_seconds: int, n_bars: int) -> np.ndarray:
+    """Open/high/low/close of fixed bars from `start`; shape (4, n_bars), NaN for empty bars."""
+    ohlc = np.full((4, n_bars), np.nan)
+    inside = (t >= start) & (t < start + bar_seconds * n_bars)
+    t, price = t[inside], price[inside]
+    if len(t) == 0:
+        return ohlc
+    index = ((t - start) // bar_seconds).astype(np.int64)
+    buckets, first = np.unique(index, return_index=True)
+    last = len(index) - 1 - np.unique(index[::-1], return_index=True)[1]
+    ohlc[0, buckets] = price[first]
+    ohlc[3, buckets] = price[last]
+    high = np.full(n_bars, -np.inf)
+    low = np.full(n_bars, np.inf)
+    np.maximum.at(high, index, price)
+    np.minimum.at(low, index, price)
+    ohlc[1, buckets] = high[buckets]
+    ohlc[2, buckets] = low[buckets]
+    return ohlc
+
+
+def estimate(open_, high, low, close) -> dict:
+    """Volatility estimators for bars shaped (assets, bars), in percent over all bars.
+
+    Returns:
+        dict: {estimator: array (assets,), "bars": bars with data, "valid": bool array}.
+    """
+    n_bars = open_.shape[-1]
+    present = ~np.isnan(close)
+    bars = present.sum(axis=-1)
+    # Assets without enough bars produce empty-slice warnings; they are marked invalid below
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        log_hl = np.log(high / low)
+        log_co = np.log(close / open_)
+        closes = np.where(present, np.log(close), np.nan)
+        returns = np.diff(closes, axis=-1)
+        return_count = (~np.isnan(returns)).sum(axis=-1)
+        close_to_close = np.nanstd(returns, axis=-1, ddof=1) * np.sqrt(n_bars)
+        parkinson = np.sqrt(np.nanmean(log_hl ** 2, axis=-1) / (4 * math.log(2)) * n_bars)
+        garman_klass = np.sqrt(np.clip(
+            np.nanmean(0.5 * log_hl ** 2 - (2 * math.log(2) - 1) * log_co ** 2, axis=-1), 0, None
+        ) * n_bars)
+        window_range = (np.nanmax(high, axis=-1) - np.nanmin(low, axis=-1)) / np.nanmin(low, axis=-1)
+
+    # A non-positive price (bad data) leaves the log-based estimators and the range undefined
+    positive = np.all(~present | ((open_ > 0) & (high > 0) & (low > 0) & (close > 0)), axis=-1)
+    valid = (bars >= max(MIN_BARS, MIN_BAR_COVERAGE * n_bars)) & (return_count >= 2) & positive
+    result = {"bars": bars, "valid": valid}
+    for name, values in (("close_to_close", close_to_close), ("parkinson", parkinson),
+                         ("garman_klass", garman_klass), ("range", window_range)):
+        values = np.where(valid & np.isfinite(values), values * 100, 0.0)
+        result[name] = np.round(values, 4)
+    return result
+
+
+def _points(coin_id: str, window_seconds: int, resolution: str, currency: str):
+    points = get_ohlcv_store().recent(coin_id, window_seconds, resolution, currency)
+    return np.asarray(points["t"]), np.asarray(points["price"])
+
+
+def compute_volatility_table(assets: dict, currency: str = "usd", now: int | None = None) -> dict:
+    """Computes every estimator for every window and asset.
+
+    Args:
+        assets (dict): {symbol: coingecko_id}, e.g. {"BTC": "bitcoin"}.
+        currency (str, optional): Quote currency. Defaults to "usd".
+        now (int, optional): Window end (epoch seconds). Defaults to the current time.
+    Returns:
+        dict: {symbol: {window: {estimator: float, "valid": bool, "bars": int}}}.
+    """
+    now = int(now or time.time())
+    symbols = list(assets)
+    table = {symbol: {} for symbol in symbols}
+
+    # One fetch per (asset, resolution): the 1h/4h/1d windows share the 5-minute series
+    resolutions = {}
+    for window_seconds, _, resolution in WINDOWS.values():
+        resolutions[resolution] = max(resolutions.get(resolution, 0), window_seconds)
+    futures = {
+        (symbol, resolution): submit_in_context(_executor, _points, assets[symbol], seconds, resolution, currency)
+        for symbol in symbols for resolution, seconds in resolutions.items()
+    }
+    series = {}
+    for key, future in futures.items():
+        try:
+            series[key] = future.result()
+        except Exception as e:
+            logger.warning("Volatility data for %s (%s) unavailable: %s", key[0], key[1], e)
+            series[key] = (np.empty(0, dtype=np.int64), np.empty(0))
+
+    for window, (window_seconds, bar_seconds, resolution) in WINDOWS.items():
+        n_bars = window_seconds // bar_seconds
+        start = now - window_seconds
+        ohlc = np.stack([_bars(*series[(symbol, resolution)], start, bar_seconds, n_bars) for symbol in symbols], axis=1) \
+            if symbols else np.empty((4, 0, n_bars))
+        estimates = estimate(*ohlc)
+        for i, symbol in enumerate(symbols):
+            table[symbol][window] = {
+                **{name: float(estimates[name][i]) for name in ESTIMATORS},
+                "valid": bool(estimates["valid"][i]),
+                "bars": int(estimates["bars"][i]),
+            }
+    return table
+
+
+def _whitelisted_assets() -> dict:
+    from ...policy_enforcer.tools.policy_loading import get_compiled_policy
+    from ...trader.tools.portfolio_manager import ALLOWED_ASSETS
+
+    policy = get_compiled_policy(os.getenv("TRADING_STRATEGY", "aggressive"))
+    return {symbol: ALLOWED_ASSETS[symbol] for symbol in sorted(policy.whitelist) if symbol in ALLOWED_ASSETS}
+
+
+_table = {"computed_at": 0.0, "assets": None, "values": {}, "pinned": None, "refreshing": False, "generation": 0}
+_table_lock = threading.Lock()  # guards _table; never held while computing
+_compute_lock = threading.Lock()  # single-flight for synchronous (cold) computations
+
+def pin_volatility_table(values: dict | None):
+    """Serves `values` instead of computing the table (e.g. historical estimates in a backtest).
+
+    Args:
+        values (dict | None): A table shaped like `compute_volatility_table`'s result. None unpins it.
+    """
+    with _table_lock:
+        _table["pinned"] = values
+
+def reset_volatility_table():
+    """Drops the cached (not the pinned) table, so the next lookup recomputes it."""
+    with _table_lock:
+        _table.update(computed_at=0.0, assets=None, values={}, refreshing=False, generation=_table["generation"] + 1)
+
+def _store_table(assets: dict, values: dict, generation: int, started: float):
+    with _table_lock:
+        if _table["generation"] != generation:
+            return
+        _table.update(values=values, assets=assets, computed_at=time.monotonic(), refreshing=False)
+    logger.info("Volatility table for %s computed in %.2fs", ", ".join(assets), time.perf_counter() - started)
+
+def _refresh_in_background(assets: dict, generation: int):
+    def run():
+        started = time.perf_counter()
+        try:
+            values = compute_volatility_table(assets)
+        except Exception as e:
+            logger.warning("Background volatility table refresh failed: %s", e)
+            with _table_lock:
+                _table["refreshing"] = False
+            return
+        _store_table(assets, values, generation, started)
+
+    threading.Thread(target=run, name="volatility-refresh", daemon=True).start()
+
+def get_volatility_table(max_age_seconds: float = VOLATILITY_TABLE_TTL_SECONDS,
+                         max_stale_seconds: float = VOLATILITY_TABLE_MAX_STALE_SECONDS) -> dict:
+    """Volatility table of the active policy's whitelist, recomputed at most every `max_age_seconds`.
+
+    An expired table is still served for up to `max_stale_seconds` more while it is
+    recomputed in the background, so policy validation does not wait for CoinGecko.
+    Only a missing (or too old) table is computed synchronously.
+    """
+    pinned = _table["pinned"]
+    if pinned is not None:
+        return pinned
+    assets = _whitelisted_assets()
+    with _table_lock:
+        if _table["assets"] == assets:
+            age = time.monotonic() - _table["computed_at"]
+            if age <= max_age_seconds:
+                return _table["values"]
+            if age <= max_age_seconds + max_stale_seconds:
+                if not _table["refreshing"]:
+                    _table["refreshing"] = True
+                    _refresh_in_background(assets, _table["generation"])
+                return _table["values"]
+
+    with _compute_lock:
+        with _table_lock:
+            # Another caller may have computed it while this one waited
+            if _table["assets"] == assets and time.monotonic() - _table["computed_at"] <= max_age_seconds:
+                return _table["values"]
+            generation = _table["generation"]
+        started = time.perf_counter()
+        values = compute_volatility_table(assets)
+        _store_table(assets, values, generation, started)
+        return values
+
+
+def volatility_lookup(symbol: str, window: str = "1d", estimator: str = "range") -> tuple[float, bool]:
+    """Returns (value in percent, valid) for a whitelisted symbol; (0.0, False) when unknown."""
+    try:
+        entry = get_volatility_table().get(symbol.upper(), {}).get(window)
+    except Exception as e:
+        logger.warning("Volatility lookup for %s failed: %s", symbol, e)
+        return 0.0, False
+    if not entry:
+        return 0.0, False
+    return entry[estimator], entry["valid"]
+
+
+@traced
+def get_volatility_estimates() -> dict:
+    """Gets multi-window volatility estimates for every asset on the active policy's whitelist.
+
+    Returns:
+        dict: {symbol: {window ("1h", "4h", "1d", "7d"): {"close_to_close", "parkinson", "garman_klass",
+        "range" (percent over the window), "valid", "bars"}}}. Invalid entries are 0.0 with valid=False.
+    """
+    logger.info("Getting volatility estimates")
+    return get_volatility_table()
@@ -0,0 +1,118 @@
+"""Exchange client backends of the trader.
+
+The backend is chosen with the EXCHANGE_BACKEND environment variable (or .env):
+- "binance" (default): python-binance's Client on the Binance testnet, using
+  BINANCE_API_KEY / BINANCE_API_SECRET;
+- "simulated": an in-process SimulatedExchange, configured with
+  SIMULATED_EXCHANGE_BALANCES   JSON starting balances (default {"USDT": 10000})
+  SIMULATED_EXCHANGE_PRICES     JSON fixed prices by asset; without it, prices come from CoinGecko
+  SIMULATED_EXCHANGE_FEE_RATE   commission per fill (default 0.001)
+  SIMULATED_EXCHANGE_LATENCY_MS, SIMULATED_EXCHANGE_LATENCY_JITTER_MS   per-call latency
+  SIMULATED_EXCHANGE_ERROR_RATE, SIMULATED_EXCHANGE_LOST_RESPONSE_RATE  injected failures
+Other backends can be added with `register_exchange_backend`. While a recorder
+cassette is active (see root_agent.tools.recorder) the client is wrapped in a
+RecordedExchange, so its calls are recorded or replayed.
+"""
+import json
+import logging
+import os
+
+from .simulated_exchange import DEFAULT_FEE_RATE, QUOTE_ASSET, SimulatedExchange
+from ....tools.lazy import LazyResource
+from ....tools.recorder import active_cassette, recorded
+
+logger = logging.getLogger("root_agent")
+
+DEFAULT_EXCHANGE_BACKEND = "binance"
+
+
+def _create_binance_client():
+    # Imported here: python-binance is heavy and Client() pings the exchange
+    from binance.client import Client
+    return Client(os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_API_SECRET"), testnet=True)
+
+
+def _coingecko_price(base: str):
+    """Current USD price of an allowed asset from the shared CoinGecko cache, or None."""
+    from .portfolio_manager import ALLOWED_ASSETS, get_batch_prices
+
+    coin_id = ALLOWED_ASSETS.get(base)
+    if coin_id is None or base == QUOTE_ASSET:
+        return None
+    return get_batch_prices([coin_id]).get(coin_id, {}).get("usd")
+
+
+def _env_json(name: str, default):
+    value = os.getenv(name)
+    return json.loads(value) if value else default
+
+
+def _create_simulated_exchange(**overrides) -> SimulatedExchange:
+    prices = _env_json("SIMULATED_EXCHANGE_PRICES", None)
+    settings = {
+        "balances": _env_json("SIMULATED_EXCHANGE_BALANCES", {QUOTE_ASSET: 10000.0}),
+        "prices": prices,
+        "fee_rate": float(os.getenv("SIMULATED_EXCHANGE_FEE_RATE", DEFAULT_FEE_RATE)),
+        "latency_seconds": float(os.getenv("SIMULATED_EXCHANGE_LATENCY_MS", "0")) / 1000,
+        "latency_jitter_seconds": float(os.getenv("SIMULATED_EXCHANGE_LATENCY_JITTER_MS", "0")) / 1000,
+        "error_rate": float(os.getenv("SIMULATED_EXCHANGE_ERROR_RATE", "0")),
+        "lost_response_rate": float(os.getenv("SIMULATED_EXCHANGE_LOST_RESPONSE_RATE", "0")),
+        "price_source": None if prices else _coingecko_price,
+    }
+    settings.update(overrides)
+    return SimulatedExchange(**settings)
+
+
+class RecordedExchange:
+    """Exchange client whose calls go through the active recorder cassette.
+
+    The wrapped client is only created when a call actually reaches the
+    exchange, so replaying a recording needs neither credentials nor network.
+    """
+
+    def __init__(self, factory):
+        self._client = LazyResource(factory, "recorded exchange client")
+
+    def _call(self, method: str, **params):
+        return recorded("binance", {"method": method, "params": params},
+                        lambda: getattr(self._client.get(), method)(**params), route=method)
+
+    def get_account(self):
+        return self._call("get_account")
+
+    def create_order(self, **params):
+        return self._call("create_order", **params)
+
+
+EXCHANGE_BACKENDS = {
+    "binance": _create_binance_client,
+    "simulated": _create_simulated_exchange,
+}
+
+
+def register_exchange_backend(name: str, factory):
+    """Makes `factory()` selectable with EXCHANGE_BACKEND=<name>.
+
+    The factory returns an object with the Binance client methods the trader
+    uses: `get_account()` and `create_order(**params)`.
+    """
+    EXCHANGE_BACKENDS[name.lower()] = factory
+
+
+def create_exchange_client(backend: str | None = None, **overrides):
+    """Creates the client of `backend` (default: EXCHANGE_BACKEND, else "binance").
+
+    Args:
+        backend (str, optional): Backend name. Defaults to the EXCHANGE_BACKEND setting.
+        **overrides: Keyword arguments passed to the backend factory (e.g. `latency_seconds`
+            for the simulated exchange).
+    """
+    backend = (backend or os.getenv("EXCHANGE_BACKEND") or DEFAULT_EXCHANGE_BACKEND).lower()
+    try:
+        factory = EXCHANGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown exchange backend '{backend}'. Available: {sorted(EXCHANGE_BACKENDS)}") from None
+    logger.info("Using the '%s' exchange backend", backend)
+    if active_cassette() is not None:
+        return RecordedExchange(lambda: factory(**overrides))
+    return factory(**overrides)
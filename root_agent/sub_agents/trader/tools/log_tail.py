@@ -0,0 +1,71 @@
+from typing import Iterator
+import json
+import os
+
+# Bytes read per backwards seek
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reversed(path: str, block_size: int = TAIL_BLOCK_SIZE) -> Iterator[str]:
+    """Yields the lines of a text file from last to first without reading the whole file.
+
+    The file is read backwards from EOF in fixed-size blocks, so the cost of
+    consuming the last N lines is proportional to their size, not to the file size.
+    Blank lines are skipped.
+
+    Args:
+        path (str): Path of the file.
+        block_size (int, optional): Number of bytes read per seek. Defaults to 64 KiB.
+    Yields:
+        str: Decoded lines, newest first, without the trailing newline.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            # The first piece may be the end of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8", errors="replace").rstrip("\r")
+        if remainder.strip():
+            yield remainder.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def parse_trade_log_line(line: str):
+    """Returns a JSON trade-log line as a dict, or the plain-text line unchanged."""
+    if line.startswith("{"):
+        try:
+            return json.loads(line)
+        except ValueError:
+            pass
+    return line
+
+
+def tail_trade_log(path: str, limit: int, block_size: int = TAIL_BLOCK_SIZE) -> list:
+    """Returns the last `limit` entries of the trade log, newest first.
+
+    Handles both the plain-text lines (HOLD/BOUGHT/SOLD) and the JSON audit lines
+    (executions and policy rejections) written by `trade.py`.
+
+    Args:
+        path (str): Path of the trade log.
+        limit (int): Maximum number of entries to return.
+        block_size (int, optional): Number of bytes read per seek.
+    Returns:
+        list: dict entries for JSON lines and str entries for plain-text lines.
+    """
+    entries = []
+    if limit <= 0 or not os.path.exists(path):
+        return entries
+    for line in iter_lines_reversed(path, block_size):
+        entries.append(parse_trade_log_line(line))
+        if len(entries) >= limit:
+            break
+    return entries
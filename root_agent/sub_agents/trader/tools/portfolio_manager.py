@@ -1,10 +1,14 @@
-from binance.client import Client
 from dotenv import load_dotenv
 import logging
 import os
-import requests
 import pathlib
 
+from ....tools.lazy import LazyResource
+from ....tools.market_data_cache import get_cached_prices
+from .exchange_backend import create_exchange_client
+from .portfolio_snapshot import PortfolioSnapshot
+from ....tools.tracing import traced
+
 # 1. Setup
 ALLOWED_ASSETS = {
     'USDT': 'usd', 
@@ -23,13 +27,19 @@ ALLOWED_ASSETS = {
 root_dir = pathlib.Path(__file__).parents[3]
 load_dotenv(root_dir / '.env')
 
-BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
-BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
-
-client = Client(BINANCE_API_KEY, BINANCE_API_SECRET, testnet=True)
+# How long (seconds) balances and valuations may be served from memory before refetching
+PORTFOLIO_MAX_STALENESS_SECONDS = float(os.getenv("PORTFOLIO_MAX_STALENESS_SECONDS", "60"))
 
 logger = logging.getLogger("root_agent")
 
+# Binance testnet client, or the backend selected with EXCHANGE_BACKEND (see exchange_backend.py)
+_binance_client = LazyResource(create_exchange_client, "exchange client")
+
+def get_binance_client():
+    """Returns the shared exchange client (Binance unless EXCHANGE_BACKEND says otherwise), connecting on first use."""
+    return _binance_client.get()
+
+@traced
 def get_batch_prices(coin_ids_list, currency="usd"):
     """Fetches current prices for a list of CoinGecko IDs in the specified currency.
     Args:
@@ -40,48 +50,35 @@ def get_batch_prices(coin_ids_list, currency="usd"):
         dict: A dictionary mapping coin IDs to their prices.
     """
     
-    ids_string = ",".join(coin_ids_list)
-    
-    endpoint = f"https://api.coingecko.com/api/v3/simple/price"
-    params = {
-        'ids': ids_string,
-        'vs_currencies': currency
-    }
-    
     try:
-        response = requests.get(endpoint, params=params, timeout=10)
-        if response.status_code == 200:
-            return response.json() 
-        else:
-            print(f"Error fetching prices: {response.status_code}")
-            return {}
+        return get_cached_prices(coin_ids_list, currency, timeout=10)
     except Exception as e:
         print(f"Exception: {e}")
         return {}
 
-def load_portfolio():
-    """
-    Loads and evaluates the user's portfolio from Binance.
-    
-    Returns:
-        dict: A dictionary with asset details and their USD values.
-        float: Total portfolio value in USD.
-    """
-
-    logger.info("Loading portfolio")
+def _fetch_balances() -> dict:
+    """Fetches the free/locked balances of the allowed assets from Binance."""
+    account_info = get_binance_client().get_account()
+    balances = {}
+    for balance in account_info.get("balances", []):
+        asset = balance.get("asset", "")
+        if asset in ALLOWED_ASSETS:
+            balances[asset] = {
+                "free": float(balance.get("free", 0.0)),
+                "locked": float(balance.get("locked", 0.0)),
+            }
+    return balances
 
-    account_info = client.get_account()
-    balances = account_info.get("balances", [])
-    
+def _value_balances(balances: dict):
+    """Values balances in USD using CoinGecko prices."""
     portfolio_assets = {}
     ids_to_fetch = []
     full_portfolio_value_usd = 0.0
     
     # Step A: Filter assets and prepare the list of IDs to fetch
-    for balance in balances:
-        asset = balance.get("asset", "")
-        free = float(balance.get("free", 0.0))
-        locked = float(balance.get("locked", 0.0))
+    for asset, balance in balances.items():
+        free = balance["free"]
+        locked = balance["locked"]
         total = free + locked
         
         if asset in ALLOWED_ASSETS:
@@ -123,6 +120,27 @@ def load_portfolio():
 
     return portfolio_assets, full_portfolio_value_usd
 
+# Latest balances and valuation, shared by every load_portfolio caller in a cycle
+portfolio_snapshot = PortfolioSnapshot(_fetch_balances, _value_balances, PORTFOLIO_MAX_STALENESS_SECONDS)
+
+@traced
+def load_portfolio():
+    """
+    Loads and evaluates the user's portfolio from Binance.
+
+    Served from the in-memory portfolio snapshot while it is younger than
+    PORTFOLIO_MAX_STALENESS_SECONDS; executed trades are applied to it directly.
+    
+    Returns:
+        dict: A dictionary with asset details and their USD values.
+        float: Total portfolio value in USD.
+    """
+
+    logger.info("Loading portfolio")
+
+    return portfolio_snapshot.valuation()
+
+@traced
 def make_trade(symbol: str, side: str, quantity: float, order_type: str, 
                price: float, stop_price: float, time_in_force: str):
     """
@@ -160,9 +178,12 @@ def make_trade(symbol: str, side: str, quantity: float, order_type: str,
     # Execute the order
     try:
         logger.info("Placing order: %s", params)
-        order = client.create_order(**params)
+        order = get_binance_client().create_order(**params)
         logger.info("Order placed: %s", order)
+        portfolio_snapshot.apply_fill(order)
         return order
     except Exception as e:
         logger.error("Error placing order: %s", e)
+        # The order may still have reached the exchange, so refetch balances on the next read
+        portfolio_snapshot.invalidate()
         return None
\ No newline at end of file
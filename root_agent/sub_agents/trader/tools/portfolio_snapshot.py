@@ -0,0 +1,116 @@
+import copy
+import logging
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+QUOTE_ASSET = "USDT"
+
+
+class PortfolioSnapshot:
+    """In-memory snapshot of exchange balances and their valuation.
+
+    Reads are served from memory while the snapshot is younger than
+    `max_staleness_seconds`; only then is the exchange account fetched again
+    (once, even with concurrent readers). Completely filled orders are applied to
+    the balances directly, so an executed trade does not force another round trip.
+    When a fill cannot be applied (or the order is only partially filled), the
+    snapshot is invalidated instead.
+    """
+
+    def __init__(self, fetch_balances, value_balances, max_staleness_seconds: float = 60.0):
+        """
+        Args:
+            fetch_balances: Callable returning {asset: {"free": float, "locked": float}} from the exchange.
+            value_balances: Callable turning those balances into (portfolio_assets, total_value_usd).
+            max_staleness_seconds (float, optional): How long a snapshot may be served. Defaults to 60.
+        """
+        self._fetch_balances = fetch_balances
+        self._value_balances = value_balances
+        self.max_staleness_seconds = max_staleness_seconds
+        self._lock = threading.RLock()
+        self._balances = None
+        self._fetched_at = 0.0
+        self._valuation = None
+        self._valued_at = 0.0
+        self.exchange_calls = 0
+
+    def _is_fresh(self, timestamp: float, max_staleness: float) -> bool:
+        return time.monotonic() - timestamp <= max_staleness
+
+    def balances(self, max_staleness_seconds: float | None = None) -> dict:
+        """Returns a copy of the balances, refreshing them from the exchange when too old."""
+        max_staleness = self.max_staleness_seconds if max_staleness_seconds is None else max_staleness_seconds
+        with self._lock:
+            if self._balances is None or not self._is_fresh(self._fetched_at, max_staleness):
+                self._balances = self._fetch_balances()
+                self._fetched_at = time.monotonic()
+                self._valuation = None
+                self.exchange_calls += 1
+                logger.info("Portfolio snapshot refreshed from the exchange")
+            return copy.deepcopy(self._balances)
+
+    def valuation(self, max_staleness_seconds: float | None = None):
+        """Returns (portfolio_assets, total_value_usd) for the current balances."""
+        max_staleness = self.max_staleness_seconds if max_staleness_seconds is None else max_staleness_seconds
+        with self._lock:
+            balances = self.balances(max_staleness)
+            if self._valuation is None or not self._is_fresh(self._valued_at, max_staleness):
+                self._valuation = self._value_balances(balances)
+                self._valued_at = time.monotonic()
+            portfolio_assets, total_value_usd = self._valuation
+            return copy.deepcopy(portfolio_assets), total_value_usd
+
+    def invalidate(self):
+        """Forces the next read to fetch balances from the exchange."""
+        with self._lock:
+            self._balances = None
+            self._valuation = None
+
+    def apply_fill(self, order: dict) -> bool:
+        """Patches the balances with an exchange order response.
+
+        Uses `executedQty` and `cummulativeQuoteQty` of a FILLED '<BASE>USDT' order,
+        and subtracts fill commissions. Falls back to invalidating the snapshot when
+        the order is not completely filled or cannot be interpreted.
+
+        Returns:
+            bool: True if the snapshot was patched, False if it was invalidated.
+        """
+        try:
+            symbol = order["symbol"]
+            side = order["side"].upper()
+            executed = float(order.get("executedQty", 0.0))
+            quote = float(order.get("cummulativeQuoteQty", 0.0))
+            if not symbol.endswith(QUOTE_ASSET) or side not in ("BUY", "SELL"):
+                raise ValueError(f"Unsupported order {symbol} {side}")
+            base = symbol[: -len(QUOTE_ASSET)]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.info("Invalidating portfolio snapshot, fill not applicable: %s", e)
+            self.invalidate()
+            return False
+
+        with self._lock:
+            if self._balances is None:
+                return False
+            if order.get("status") != "FILLED" or executed == 0.0:
+                # Not (completely) filled, e.g. a resting or partially filled LIMIT order: the remainder
+                # locks funds on the exchange that a local patch cannot account for, refetch on next read
+                logger.info("Invalidating portfolio snapshot, order %s is %s", symbol, order.get("status"))
+                self._balances = None
+                self._valuation = None
+                return False
+
+            sign = 1.0 if side == "BUY" else -1.0
+            for asset, delta in ((base, sign * executed), (QUOTE_ASSET, -sign * quote)):
+                entry = self._balances.setdefault(asset, {"free": 0.0, "locked": 0.0})
+                entry["free"] = entry["free"] + delta
+            for fill in order.get("fills", []) or []:
+                commission_asset = fill.get("commissionAsset")
+                if commission_asset in self._balances:
+                    self._balances[commission_asset]["free"] -= float(fill.get("commission", 0.0))
+
+            self._valuation = None
+            logger.info("Portfolio snapshot patched with %s fill of %s %s", side, executed, base)
+            return True
@@ -0,0 +1,321 @@
+from collections import Counter
+import itertools
+import logging
+import math
+import random
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+QUOTE_ASSET = "USDT"
+
+# Binance taker fee; the commission is charged in the asset received
+DEFAULT_FEE_RATE = 0.001
+
+# Binance order types that rest on the book until their trigger price is crossed
+RESTING_ORDER_TYPES = ("LIMIT", "STOP_LOSS", "TAKE_PROFIT")
+
+
+class SimulatedExchangeError(Exception):
+    """Order rejection, shaped like python-binance's BinanceAPIException (`code`, `message`)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.code = code
+        self.message = message
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.8f}"
+
+
+class SimulatedExchange:
+    """In-process stand-in for the Binance spot client used by portfolio_manager.
+
+    Implements the subset of `binance.client.Client` the trader uses
+    (`get_account`, `create_order`) plus `get_order`, `get_open_orders` and
+    `cancel_order`, with responses in Binance's format. Prices are set by the
+    caller with `set_prices`:
+    - MARKET orders fill immediately at the current price;
+    - LIMIT orders fill immediately when marketable, otherwise they rest and
+      lock their funds until the price crosses the limit;
+    - STOP_LOSS / TAKE_PROFIT orders rest until the price crosses `stopPrice`
+      and then fill at that price; Binance rejects them when they would
+      trigger immediately, and so does this exchange.
+    Symbols are '<BASE>USDT' pairs; commissions are charged in the received asset.
+
+    Every client call can be given a simulated network round trip (Gaussian
+    latency, slept outside the exchange lock so concurrent callers overlap)
+    and injected failures: `error_rate` rejects the call before it reaches the
+    exchange, `lost_response_rate` executes an order but loses the response,
+    as Binance's -1007 "execution status unknown" timeout does.
+    """
+
+    def __init__(self, balances: dict | None = None, prices: dict | None = None, fee_rate: float = DEFAULT_FEE_RATE,
+                 latency_seconds: float = 0.0, latency_jitter_seconds: float = 0.0, error_rate: float = 0.0,
+                 lost_response_rate: float = 0.0, price_source=None, seed: int | None = None):
+        """
+        Args:
+            balances (dict, optional): Initial free balances, e.g. {"USDT": 10000.0, "BTC": 0.1}.
+            prices (dict, optional): Initial prices in USDT by base asset, e.g. {"BTC": 67000.0}.
+            fee_rate (float, optional): Commission per fill. Defaults to 0.001.
+            latency_seconds (float, optional): Mean simulated latency of each call. Defaults to 0.
+            latency_jitter_seconds (float, optional): Standard deviation of that latency. Defaults to 0.
+            error_rate (float, optional): Share of calls rejected with error -1001. Defaults to 0.
+            lost_response_rate (float, optional): Share of executed orders whose response is lost. Defaults to 0.
+            price_source (callable, optional): price_source(base) -> price or None, called before each
+                order to refresh that asset's market price (e.g. from CoinGecko). Defaults to None.
+            seed (int, optional): Seed of the latency/failure generator. Defaults to None.
+        """
+        self.fee_rate = fee_rate
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.error_rate = error_rate
+        self.lost_response_rate = lost_response_rate
+        self.price_source = price_source
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.calls = Counter()  # API calls by method, including the failed ones
+        self.injected_errors = Counter()  # injected failures by kind
+        self._lock = threading.RLock()
+        self._balances = {asset: {"free": float(amount), "locked": 0.0} for asset, amount in (balances or {}).items()}
+        self._balances.setdefault(QUOTE_ASSET, {"free": 0.0, "locked": 0.0})
+        self._prices = dict(prices or {})
+        self._orders = {}  # orderId -> order dict
+        self._open = {}  # orderId -> (asset, amount) locked for a resting order
+        self._order_ids = itertools.count(1)
+        self.trades = []  # every fill: {"orderId", "symbol", "side", "qty", "price", "commission", "commissionAsset"}
+
+    # Market data
+
+    def set_prices(self, prices: dict, low: dict | None = None, high: dict | None = None) -> list[dict]:
+        """Moves the market and fills the resting orders whose trigger was crossed.
+
+        Args:
+            prices (dict): Current price in USDT by base asset.
+            low (dict, optional): Lowest price since the previous update, by base asset. Defaults to `prices`.
+            high (dict, optional): Highest price since the previous update, by base asset. Defaults to `prices`.
+        Returns:
+            list[dict]: The orders filled by this update.
+        """
+        with self._lock:
+            self._prices.update(prices)
+            filled = []
+            for order_id in list(self._open):
+                order = self._orders[order_id]
+                base = order["symbol"][: -len(QUOTE_ASSET)]
+                if base not in prices:
+                    continue
+                fill_price = self._trigger_price(order, (low or prices).get(base, prices[base]),
+                                                 (high or prices).get(base, prices[base]))
+                if fill_price is not None:
+                    self._release(order_id)
+                    self._fill(order, fill_price)
+                    if order["status"] == "FILLED":
+                        filled.append(dict(order))
+            return filled
+
+    def price(self, base: str) -> float:
+        with self._lock:
+            return self._prices[base]
+
+    def holdings(self) -> dict:
+        """Total (free + locked) amount per asset."""
+        with self._lock:
+            return {asset: balance["free"] + balance["locked"] for asset, balance in self._balances.items()}
+
+    # Client API
+
+    def get_account(self, **params) -> dict:
+        """Balances in the shape of Binance's GET /api/v3/account."""
+        self._round_trip("get_account")
+        with self._lock:
+            return {
+                "accountType": "SPOT",
+                "canTrade": True,
+                "updateTime": int(time.time() * 1000),
+                "balances": [
+                    {"asset": asset, "free": _fmt(balance["free"]), "locked": _fmt(balance["locked"])}
+                    for asset, balance in self._balances.items()
+                ],
+            }
+
+    def create_order(self, symbol: str, side: str, type: str, quantity: float, price=None, stopPrice=None,
+                     timeInForce: str | None = None, **params) -> dict:
+        """Places an order (Binance POST /api/v3/order semantics). Raises SimulatedExchangeError on rejection."""
+        side, order_type = side.upper(), type.upper()
+        quantity = float(quantity)
+        if not symbol.endswith(QUOTE_ASSET) or side not in ("BUY", "SELL"):
+            raise SimulatedExchangeError(-1121, "Invalid symbol.")
+        if order_type not in ("MARKET",) + RESTING_ORDER_TYPES:
+            raise SimulatedExchangeError(-1116, "Invalid orderType.")
+        if quantity <= 0:
+            raise SimulatedExchangeError(-1013, "Filter failure: LOT_SIZE")
+        base = symbol[: -len(QUOTE_ASSET)]
+        self._round_trip("create_order")
+        if self.price_source is not None:
+            market_price = self.price_source(base)
+            if market_price:
+                self.set_prices({base: float(market_price)})
+
+        with self._lock:
+            if base not in self._prices:
+                raise SimulatedExchangeError(-1121, "Invalid symbol.")
+            market_price = self._prices[base]
+            limit_price = float(price) if price not in (None, "", 0, "0") else None
+            stop_price = float(stopPrice) if stopPrice not in (None, "", 0, "0") else None
+            if order_type == "LIMIT" and limit_price is None:
+                raise SimulatedExchangeError(-1102, "Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+            if order_type in ("STOP_LOSS", "TAKE_PROFIT") and stop_price is None:
+                raise SimulatedExchangeError(-1102, "Mandatory parameter 'stopPrice' was not sent, was empty/null, or malformed.")
+
+            order = {
+                "symbol": symbol,
+                "orderId": next(self._order_ids),
+                "clientOrderId": params.get("newClientOrderId") or f"sim-{len(self._orders) + 1}",
+                "transactTime": int(time.time() * 1000),
+                "price": _fmt(limit_price or 0.0),
+                "stopPrice": _fmt(stop_price or 0.0),
+                "origQty": _fmt(quantity),
+                "executedQty": _fmt(0.0),
+                "cummulativeQuoteQty": _fmt(0.0),
+                "status": "NEW",
+                "timeInForce": timeInForce or "GTC",
+                "type": order_type,
+                "side": side,
+                "fills": [],
+            }
+
+            immediate = None
+            if order_type == "MARKET":
+                immediate = market_price
+            elif order_type == "LIMIT":
+                if (side == "BUY" and market_price <= limit_price) or (side == "SELL" and market_price >= limit_price):
+                    immediate = market_price
+            elif self._trigger_price(order, market_price, market_price) is not None:
+                raise SimulatedExchangeError(-2010, "Stop price would trigger immediately.")
+
+            # Funds are checked (and locked for resting orders) in the asset being spent
+            spend_asset, spend_amount = (QUOTE_ASSET, quantity * (immediate or limit_price or stop_price)) \
+                if side == "BUY" else (base, quantity)
+            balance = self._balances.setdefault(spend_asset, {"free": 0.0, "locked": 0.0})
+            if balance["free"] + 1e-12 < spend_amount:
+                raise SimulatedExchangeError(-2010, "Account has insufficient balance for requested action.")
+
+            self._orders[order["orderId"]] = order
+            if immediate is not None:
+                self._fill(order, immediate)
+            else:
+                spend_amount = round(spend_amount, 8)
+                balance["free"] = round(balance["free"] - spend_amount, 8)
+                balance["locked"] = round(balance["locked"] + spend_amount, 8)
+                self._open[order["orderId"]] = (spend_asset, spend_amount)
+            response = dict(order)
+
+        if self.lost_response_rate and self._draw("lost_response", self.lost_response_rate):
+            raise SimulatedExchangeError(-1007, "Timeout waiting for response from backend server. "
+                                                "Send status unknown; execution status unknown.")
+        return response
+
+    def get_order(self, symbol: str, orderId: int, **params) -> dict:
+        self._round_trip("get_order")
+        with self._lock:
+            order = self._orders.get(int(orderId))
+            if order is None or order["symbol"] != symbol:
+                raise SimulatedExchangeError(-2013, "Order does not exist.")
+            return dict(order)
+
+    def get_open_orders(self, symbol: str | None = None, **params) -> list[dict]:
+        self._round_trip("get_open_orders")
+        with self._lock:
+            return [dict(self._orders[order_id]) for order_id in self._open
+                    if symbol is None or self._orders[order_id]["symbol"] == symbol]
+
+    def cancel_order(self, symbol: str, orderId: int, **params) -> dict:
+        self._round_trip("cancel_order")
+        with self._lock:
+            order = self._orders.get(int(orderId))
+            if order is None or order["symbol"] != symbol or order["orderId"] not in self._open:
+                raise SimulatedExchangeError(-2011, "Unknown order sent.")
+            self._release(order["orderId"])
+            order["status"] = "CANCELED"
+            return dict(order)
+
+    # Simulated network
+
+    def _draw(self, failure: str, rate: float) -> bool:
+        """True (and counted) when an injected failure of `rate` happens."""
+        with self._random_lock:
+            if self._random.random() >= rate:
+                return False
+            self.injected_errors[failure] += 1
+            return True
+
+    def _round_trip(self, method: str):
+        """Sleeps for one simulated request latency and raises the injected call failures."""
+        with self._random_lock:
+            self.calls[method] += 1
+            delay = self._random.gauss(self.latency_seconds, self.latency_jitter_seconds) \
+                if self.latency_seconds or self.latency_jitter_seconds else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and self._draw("error", self.error_rate):
+            raise SimulatedExchangeError(-1001, "Internal error; unable to process your request. Please try again.")
+
+    # Helpers (caller holds self._lock)
+
+    @staticmethod
+    def _trigger_price(order: dict, low: float, high: float):
+        """Price a resting order fills at when the market traded between `low` and `high`, else None."""
+        side, order_type = order["side"], order["type"]
+        if order_type == "LIMIT":
+            limit = float(order["price"])
+            if (side == "BUY" and low <= limit) or (side == "SELL" and high >= limit):
+                return limit
+            return None
+        stop = float(order["stopPrice"])
+        falling = (side == "SELL") == (order_type == "STOP_LOSS")
+        if (falling and low <= stop) or (not falling and high >= stop):
+            return stop
+        return None
+
+    def _release(self, order_id: int):
+        asset, amount = self._open.pop(order_id)
+        balance = self._balances[asset]
+        balance["locked"] = round(balance["locked"] - amount, 8)
+        balance["free"] = round(balance["free"] + amount, 8)
+
+    def _fill(self, order: dict, fill_price: float):
+        base = order["symbol"][: -len(QUOTE_ASSET)]
+        quantity = float(order["origQty"])
+        quote = quantity * fill_price
+        if order["side"] == "BUY":
+            received_asset, received, spent_asset, spent = base, quantity, QUOTE_ASSET, quote
+        else:
+            received_asset, received, spent_asset, spent = QUOTE_ASSET, quote, base, quantity
+        # Balances are kept at Binance's 8 decimals: the exchange rounds amounts in its own favour
+        spent = math.ceil(round(spent * 1e8, 4)) / 1e8
+        commission = math.ceil(round(received * self.fee_rate * 1e8, 4)) / 1e8
+        received = math.floor(round(received * 1e8, 4)) / 1e8
+        spent_balance = self._balances.setdefault(spent_asset, {"free": 0.0, "locked": 0.0})
+        if spent_balance["free"] + 1e-12 < spent:
+            # A resting order whose funds were moved elsewhere in the meantime
+            order["status"] = "EXPIRED"
+            return
+        spent_balance["free"] = round(spent_balance["free"] - spent, 8)
+        received_balance = self._balances.setdefault(received_asset, {"free": 0.0, "locked": 0.0})
+        received_balance["free"] = round(received_balance["free"] + received - commission, 8)
+
+        fill = {"price": _fmt(fill_price), "qty": _fmt(quantity), "commission": _fmt(commission),
+                "commissionAsset": received_asset}
+        order.update({
+            "status": "FILLED",
+            "executedQty": _fmt(quantity),
+            "cummulativeQuoteQty": _fmt(quote),
+            "fills": [fill],
+        })
+        self.trades.append({"orderId": order["orderId"], "symbol": order["symbol"], "side": order["side"],
+                            "qty": quantity, "price": fill_price, "commission": commission,
+                            "commissionAsset": received_asset})
+        logger.debug("Simulated fill: %s %s %s at %s", order["side"], quantity, base, fill_price)
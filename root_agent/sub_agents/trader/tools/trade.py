@@ -1,16 +1,26 @@
-from datetime import datetime, UTC
 import json
 import logging
 import os
-import requests
 
 from .portfolio_manager import make_trade
+from .log_tail import iter_lines_reversed, parse_trade_log_line
+from .trade_journal import TradeJournal, TRADE_JOURNAL_DB_PATH, parse_log_line, utc_day, utc_timestamp
+from ....tools.lazy import LazyResource
+from ....tools.market_data_cache import get_cached_prices
+from ....tools.tracing import traced
 
 logger = logging.getLogger("root_agent")
 
-COINGECKO_ENDPOINT = "https://api.coingecko.com/api/v3"
 TRADE_LOG_FILE_PATH = os.path.join(os.path.dirname(__file__), "trade_log.txt")
 
+_trade_journal = LazyResource(
+    lambda: TradeJournal(TRADE_JOURNAL_DB_PATH, legacy_log_path=TRADE_LOG_FILE_PATH), "trade journal"
+)
+
+def get_trade_journal() -> TradeJournal:
+    """Returns the shared trade journal, creating it (and importing `trade_log.txt`) on first use."""
+    return _trade_journal.get()
+
 def get_current_price(coin_id: str, currency: str = "usd"):
     """Fetches the current price of a cryptocurrency from the CoinGecko API.
     Args:
@@ -19,15 +29,13 @@ def get_current_price(coin_id: str, currency: str = "usd"):
     Returns:
         float: The current price of the cryptocurrency.
     """
-    current_price_endpoint = f"{COINGECKO_ENDPOINT}/simple/price?ids={coin_id}&vs_currencies={currency}"
     try:
-        response = requests.get(current_price_endpoint, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = get_cached_prices([coin_id], currency, timeout=5)
         return data.get(coin_id, {}).get(currency, None)
     except:
         return None
 
+@traced
 def log_trade(action: str, coin_id: str, symbol: str, current_price: float, currency: str = "usd"):
     """Logs the trade action to a local file with a timestamp.
     Args:
@@ -50,21 +58,34 @@ def log_trade(action: str, coin_id: str, symbol: str, current_price: float, curr
         fetched_price = current_price
         price_str = str(current_price)
 
+    timestamp = utc_timestamp()
     if action_l == "hold":
         log_entry = (
-            f"{datetime.now(UTC).isoformat().replace('+00:00', 'Z')} - {action.upper()} - "
+            f"{timestamp} - {action.upper()} - "
             f"{coin_id} ({symbol}) at {price_str} {currency}\n"
         )
     else:  # Buy or sell is already logged in process_trade_request, so we dont want to duplicate the count in the log, we just want to log the action without counting it as a new trade in the history
         action_taken = "BOUGHT" if action_l == "buy" else "SOLD"
         log_entry = (
-            f"{datetime.now(UTC).isoformat().replace('+00:00', 'Z')} - {action_taken} - "
+            f"{timestamp} - {action_taken} - "
             f"{coin_id} ({symbol}) at {price_str} {currency}\n"
         )
     
     with open(TRADE_LOG_FILE_PATH, "a", encoding="utf-8") as log_file:
         log_file.write(log_entry)
 
+    # Executed BUY/SELL entries increment today's trade counter, HOLD entries the hold counter
+    get_trade_journal().record(
+        "hold" if action_l == "hold" else "trade",
+        action=action_l,
+        coin_id=coin_id,
+        symbol=symbol,
+        price=fetched_price,
+        currency=currency,
+        details={"message": log_entry.strip()},
+        timestamp=timestamp,
+    )
+
     logger.info(
         "Trade saved to memory: action=%s, coin_id=%s, symbol=%s, price=%s %s, fetched_price=%s",
         action_l.upper(),
@@ -77,6 +98,7 @@ def log_trade(action: str, coin_id: str, symbol: str, current_price: float, curr
     return {"status": "saved to memory", "message": f"Trade action '{action}' for {symbol} saved to memory at price {price_str} {currency}."}
 
 
+@traced
 def log_policy_rejection(trade_request: dict, rejection_reason: str, violations: list[dict], policy_response: dict):
     """Saves a policy rejection to the trade log file and logs it to the console.
     
@@ -109,14 +131,11 @@ def log_policy_rejection(trade_request: dict, rejection_reason: str, violations:
     
     # Create rejection log entry
     reason_text = rejection_reason or "Policy violation"
-    log_entry = (
-        f"{datetime.now(UTC).isoformat().replace('+00:00', 'Z')} - REJECTED - "
-        f"{coin_id} ({symbol}) at {current_price} {currency} - Reason: {reason_text}\n"
-    )
+    timestamp = utc_timestamp()
     
     # Also log the full JSON entry for audit trail
     rejection_entry = {
-        "timestamp": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "timestamp": timestamp,
         "trade_request": trade_request,
         "policy_status": "REJECTED",
         "rejection_reason": reason_text,
@@ -126,6 +145,17 @@ def log_policy_rejection(trade_request: dict, rejection_reason: str, violations:
     with open(TRADE_LOG_FILE_PATH, "a", encoding="utf-8") as log_file:
         log_file.write(json.dumps(rejection_entry, default=str) + "\n")
 
+    get_trade_journal().record(
+        "rejection",
+        action=action,
+        coin_id=coin_id,
+        symbol=symbol,
+        price=current_price,
+        currency=currency,
+        details={key: value for key, value in rejection_entry.items() if key != "timestamp"},
+        timestamp=timestamp,
+    )
+
     logger.warning(
         "Policy rejection logged: symbol=%s, coin_id=%s, reason=%s, violations=%s",
         symbol,
@@ -136,6 +166,7 @@ def log_policy_rejection(trade_request: dict, rejection_reason: str, violations:
     return {"status": "saved to memory", "message": f"Policy rejection saved to memory for {symbol}"}
 
 
+@traced
 def process_trade_request(trade_request: dict) -> dict:
     """Process a structured TradeRequest (dict).
 
@@ -213,14 +244,25 @@ def process_trade_request(trade_request: dict) -> dict:
 
     # Append audit log with the full request and execution result
     try:
+        timestamp = utc_timestamp()
         with open(TRADE_LOG_FILE_PATH, "a", encoding="utf-8") as f:
             entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "trade_request": trade_request,
                 "execution": execution,
             }
             f.write(json.dumps(entry, default=str) + "\n")
             logger.info("Audit log entry written: %s", entry)
+        get_trade_journal().record(
+            "execution",
+            action=action,
+            coin_id=coin_id,
+            symbol=symbol,
+            price=current_price,
+            currency=currency,
+            details={"trade_request": trade_request, "execution": execution},
+            timestamp=timestamp,
+        )
     except Exception:
         logger.exception(
             "Failed to write audit log entry for trade_request=%s, execution=%s",
@@ -231,50 +273,69 @@ def process_trade_request(trade_request: dict) -> dict:
     return {"trade_request": trade_request, "execution": execution}
 
 
-def get_trade_history(limit: int = 20) -> dict:
-    """Gets the trade history from the trade log file.
+@traced
+def get_trade_history(limit: int = 20, coin_id: str = "", action: str = "", day: str = "") -> dict:
+    """Gets the trade history from the trade journal.
     Args:
-        limit (int, optional): The number of trades to return. Defaults to 20.
+        limit (int, optional): The number of entries to return. Defaults to 20.
+        coin_id (str, optional): Only return entries for this CoinGecko ID (e.g., 'bitcoin').
+        action (str, optional): Only return 'buy', 'sell' or 'hold' entries.
+        day (str, optional): Only return entries of this day (YYYY-MM-DD, UTC).
     Returns:
-        dict: A dictionary containing the trade history and today's trade count.
+        dict: A dictionary containing the trade history (newest first) and today's trade count.
     """
-    
-    today_trade_count = 0
-    today_str = datetime.now(UTC).strftime('%Y-%m-%d')
 
     logger.info("Getting trade history")
     try:
-        with open(TRADE_LOG_FILE_PATH, "r") as f:
-            lines = f.readlines()
-        
-        reversed_lines = [line for line in reversed(lines)]
-        
-        trade_history = []
-        for line in reversed_lines[:limit]:
-            try:
-                entry = json.loads(line)
-                entry_date = entry["timestamp"]
-                if entry_date == today_str:
-                    # Check if it's a HOLD action
-                    entry_str = str(entry).lower()
-                    if "hold" in entry_str: 
-                        pass
-                    else:
-                        today_trade_count += 1
-                trade_history.append(entry)
-            except:
-                date = line[:10]
-                if date == today_str:
-                    if "hold" in line: 
-                        pass
-                    else:
-                        today_trade_count += 1
-                trade_history.append(line)
-
+        journal = get_trade_journal()
+        trade_history = journal.history(limit=limit, day=day or None, coin_id=coin_id or None, action=action or None)
+        today_counts = journal.daily_counts()
     except Exception:
-        logger.exception("Failed to get trade history (limit=%s)", limit)
-        return {
-            "error": "Failed to get trade history",
-        }
-    
-    return {"trade_history": trade_history, "today_trade_count": today_trade_count}
\ No newline at end of file
+        logger.exception("Trade journal unavailable, reading the tail of %s instead", TRADE_LOG_FILE_PATH)
+        try:
+            return _get_trade_history_from_log(limit, coin_id=coin_id, action=action, day=day)
+        except Exception:
+            logger.exception("Failed to get trade history (limit=%s)", limit)
+            return {
+                "error": "Failed to get trade history",
+            }
+
+    return {
+        "trade_history": trade_history,
+        "today_trade_count": today_counts["trades"],
+        "today_rejection_count": today_counts["rejections"],
+    }
+
+
+def _get_trade_history_from_log(limit: int, coin_id: str = "", action: str = "", day: str = "") -> dict:
+    """Builds the get_trade_history result from the tail of `trade_log.txt`.
+
+    Reads the log backwards from EOF and stops once `limit` matching entries are
+    collected and the scan has moved past today's entries, so the cost does not
+    depend on the size of the log.
+    """
+    today_str = utc_day()
+    today_trade_count = 0
+    trade_history = []
+    if not os.path.exists(TRADE_LOG_FILE_PATH):
+        return {"trade_history": trade_history, "today_trade_count": today_trade_count}
+
+    for line in iter_lines_reversed(TRADE_LOG_FILE_PATH):
+        parsed = parse_log_line(line)
+        if parsed is None:
+            continue
+        entry_kind, entry_timestamp, entry_action, entry_coin_id = parsed[:4]
+        entry_day = utc_day(entry_timestamp)
+
+        if entry_day == today_str and entry_kind == "trade":
+            today_trade_count += 1
+
+        if len(trade_history) < limit:
+            if (not coin_id or (entry_coin_id or "").lower() == coin_id.lower()) \
+                    and (not action or (entry_action or "").lower() == action.lower()) \
+                    and (not day or entry_day == day):
+                trade_history.append(parse_trade_log_line(line))
+        elif entry_day < today_str:
+            break
+
+    return {"trade_history": trade_history, "today_trade_count": today_trade_count}
@@ -0,0 +1,294 @@
+from datetime import datetime, UTC
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger("root_agent")
+
+TRADE_JOURNAL_DB_PATH = os.path.join(os.path.dirname(__file__), "trade_journal.sqlite")
+
+# Entry kinds stored in the journal and the daily counter each one increments
+ENTRY_KINDS = {
+    "trade": "trades",          # executed BUY/SELL (log_trade)
+    "hold": "holds",            # HOLD decision (log_trade)
+    "rejection": "rejections",  # policy rejection (log_policy_rejection)
+    "execution": None,          # audit record of process_trade_request
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    action TEXT,
+    coin_id TEXT,
+    symbol TEXT,
+    price REAL,
+    currency TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_day ON entries (day, id);
+CREATE INDEX IF NOT EXISTS idx_entries_coin ON entries (coin_id, id);
+CREATE INDEX IF NOT EXISTS idx_entries_action ON entries (action, id);
+CREATE TABLE IF NOT EXISTS daily_counters (
+    day TEXT PRIMARY KEY,
+    trades INTEGER NOT NULL DEFAULT 0,
+    holds INTEGER NOT NULL DEFAULT 0,
+    rejections INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# "<timestamp> - <ACTION> - <coin_id> (<symbol>) at <price> <currency>[ - Reason: <reason>]"
+_TEXT_LINE_RE = re.compile(
+    r"^(?P<timestamp>\S+) - (?P<label>[A-Z]+) - (?P<coin_id>\S+) \((?P<symbol>[^)]*)\) at "
+    r"(?P<price>\S+) (?P<currency>\S+)(?: - Reason: (?P<reason>.*))?$"
+)
+_TEXT_LABELS = {"BOUGHT": ("trade", "buy"), "SOLD": ("trade", "sell"), "HOLD": ("hold", "hold"), "REJECTED": ("rejection", None)}
+
+
+def _wall_clock() -> datetime:
+    return datetime.now(UTC)
+
+# Source of "now" for journal timestamps and day boundaries (the backtester replays simulated time)
+_clock = _wall_clock
+
+
+def set_clock(now=None):
+    """Replaces the source of the current time.
+
+    Args:
+        now (callable, optional): Returns an aware UTC datetime. None restores the wall clock.
+    """
+    global _clock
+    _clock = now or _wall_clock
+
+
+def utc_now() -> datetime:
+    """Returns the current UTC time of the journal clock."""
+    return _clock()
+
+
+def utc_timestamp() -> str:
+    """Returns the current UTC time as an ISO string with a 'Z' suffix."""
+    return _clock().isoformat().replace("+00:00", "Z")
+
+
+def utc_day(timestamp: str | None = None) -> str:
+    """Returns the YYYY-MM-DD day of an ISO timestamp (or of now), in UTC."""
+    if not timestamp:
+        return _clock().strftime("%Y-%m-%d")
+    return timestamp[:10]
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TradeJournal:
+    """Indexed SQLite journal of trades, holds, policy rejections and executions.
+
+    Entries are indexed by day, coin and action, and per-day counters are updated
+    in the same transaction as each insert, so today's trade count is a single
+    primary-key lookup and filtered history queries use an index however large
+    the journal grows. On first use, the legacy `trade_log.txt` is imported once.
+    """
+
+    def __init__(self, db_path: str = TRADE_JOURNAL_DB_PATH, legacy_log_path: str | None = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        if legacy_log_path:
+            self._import_legacy_log(legacy_log_path)
+
+    def _insert(self, kind: str, timestamp: str, action, coin_id, symbol, price, currency, details):
+        # Caller must hold self._lock and an open transaction
+        day = utc_day(timestamp)
+        cursor = self._conn.execute(
+            "INSERT INTO entries (timestamp, day, kind, action, coin_id, symbol, price, currency, details) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                timestamp,
+                day,
+                kind,
+                action.lower() if isinstance(action, str) else None,
+                coin_id.lower() if isinstance(coin_id, str) else None,
+                symbol.lower() if isinstance(symbol, str) else None,
+                _to_float(price),
+                currency,
+                json.dumps(details, default=str) if details is not None else None,
+            ),
+        )
+        counter = ENTRY_KINDS.get(kind)
+        if counter:
+            self._conn.execute(
+                f"INSERT INTO daily_counters (day, {counter}) VALUES (?, 1) "
+                f"ON CONFLICT(day) DO UPDATE SET {counter} = {counter} + 1",
+                (day,),
+            )
+        return cursor.lastrowid
+
+    def record(self, kind: str, action: str | None = None, coin_id: str | None = None, symbol: str | None = None,
+               price: float | None = None, currency: str | None = None, details: dict | None = None,
+               timestamp: str | None = None) -> int:
+        """Appends an entry and updates the daily counters.
+
+        Args:
+            kind (str): One of 'trade', 'hold', 'rejection' or 'execution'.
+            action (str, optional): 'buy', 'sell' or 'hold'.
+            coin_id (str, optional): CoinGecko ID of the asset.
+            symbol (str, optional): Symbol of the asset.
+            price (float, optional): Price at the time of the entry.
+            currency (str, optional): Currency the price is denominated in.
+            details (dict, optional): Extra JSON-serialisable data for the audit trail.
+            timestamp (str, optional): ISO timestamp in UTC. Defaults to now.
+        Returns:
+            int: The journal id of the new entry.
+        """
+        if kind not in ENTRY_KINDS:
+            raise ValueError(f"Unsupported journal entry kind: {kind}")
+        with self._lock, self._conn:
+            return self._insert(kind, timestamp or utc_timestamp(), action, coin_id, symbol, price, currency, details)
+
+    def daily_counts(self, day: str | None = None) -> dict:
+        """Returns the trade/hold/rejection counters of a day (default: today, UTC)."""
+        day = day or utc_day()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT trades, holds, rejections FROM daily_counters WHERE day = ?", (day,)
+            ).fetchone()
+        if row is None:
+            return {"day": day, "trades": 0, "holds": 0, "rejections": 0}
+        return {"day": day, "trades": row["trades"], "holds": row["holds"], "rejections": row["rejections"]}
+
+    def trade_count(self, day: str | None = None) -> int:
+        """Returns the number of executed BUY/SELL trades on a day (default: today, UTC)."""
+        return self.daily_counts(day)["trades"]
+
+    def history(self, limit: int = 20, day: str | None = None, coin_id: str | None = None,
+                action: str | None = None, kind: str | None = None) -> list[dict]:
+        """Returns the most recent entries first, optionally filtered.
+
+        Args:
+            limit (int, optional): Maximum number of entries. Defaults to 20.
+            day (str, optional): Only entries of this YYYY-MM-DD day (UTC).
+            coin_id (str, optional): Only entries for this CoinGecko ID.
+            action (str, optional): Only 'buy', 'sell' or 'hold' entries.
+            kind (str, optional): Only entries of this kind.
+        Returns:
+            list[dict]: Journal entries, newest first.
+        """
+        clauses, params = [], []
+        for column, value in (("day", day), ("coin_id", coin_id), ("action", action), ("kind", kind)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value.lower() if column != "day" else value)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(max(int(limit), 0))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM entries {where}ORDER BY id DESC LIMIT ?", params
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> dict:
+        entry = {
+            "timestamp": row["timestamp"],
+            "kind": row["kind"],
+            "action": row["action"],
+            "coin_id": row["coin_id"],
+            "symbol": row["symbol"],
+            "price": row["price"],
+            "currency": row["currency"],
+        }
+        if row["details"]:
+            entry["details"] = json.loads(row["details"])
+        return entry
+
+    def _import_legacy_log(self, log_path: str):
+        """Imports the plain-text/JSON lines of the legacy trade log once."""
+        with self._lock:
+            imported = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_log_imported'").fetchone()
+        if imported or not os.path.exists(log_path):
+            return
+
+        count = 0
+        with self._lock, self._conn:
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parsed = parse_log_line(line)
+                    if parsed is not None:
+                        self._insert(*parsed)
+                        count += 1
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_log_imported', ?)", (utc_timestamp(),))
+        logger.info("Imported %d legacy entries from %s into the trade journal", count, log_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def parse_log_line(line: str):
+    """Parses one line of `trade_log.txt` into journal insert arguments.
+
+    Returns:
+        tuple | None: (kind, timestamp, action, coin_id, symbol, price, currency, details),
+        or None for blank or unrecognised lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith("{"):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        request = entry.get("trade_request") or {}
+        asset = request.get("asset") or {}
+        timestamp = str(entry.get("timestamp", ""))
+        kind = "rejection" if entry.get("policy_status") == "REJECTED" else "execution"
+        return (
+            kind,
+            timestamp,
+            request.get("action"),
+            asset.get("coin_id"),
+            asset.get("symbol"),
+            asset.get("current_price_usd"),
+            asset.get("currency"),
+            {key: value for key, value in entry.items() if key != "timestamp"},
+        )
+
+    match = _TEXT_LINE_RE.match(line)
+    if not match or match.group("label") not in _TEXT_LABELS:
+        return None
+    kind, action = _TEXT_LABELS[match.group("label")]
+    details = {"message": line}
+    if match.group("reason"):
+        details["rejection_reason"] = match.group("reason")
+    return (
+        kind,
+        match.group("timestamp"),
+        action,
+        match.group("coin_id"),
+        match.group("symbol"),
+        match.group("price"),
+        match.group("currency"),
+        details,
+    )
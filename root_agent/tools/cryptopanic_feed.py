@@ -0,0 +1,298 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import os
+import pathlib
+import threading
+import time
+
+from dotenv import load_dotenv
+import requests
+
+from .recorder import recorded
+from .single_flight import Flight
+
+logger = logging.getLogger("root_agent")
+
+root_dir = pathlib.Path(__file__).parents[1]
+load_dotenv(root_dir / '.env')
+
+CRYPTOPANIC_POSTS_ENDPOINT = "https://cryptopanic.com/api/developer/v2/posts/"
+# How long (seconds) the first page of a query is served from memory before it is fetched again
+FEED_TTL_SECONDS = 60
+# Posts not returned by any request for this long are dropped from the rolling window
+FEED_WINDOW_SECONDS = 48 * 3600
+FEED_MAX_POSTS = 1000
+# Deepest page fetched for one query (CryptoPanic returns 20 posts per page)
+FEED_MAX_PAGES = 5
+# Consumers (agent invocations) whose returned posts are remembered for deduplication
+FEED_MAX_CONSUMERS = 256
+
+
+def post_id(post: dict) -> str:
+    """Stable identifier of a CryptoPanic post."""
+    return str(post.get("id") or post.get("slug") or post.get("title"))
+
+
+def post_currencies(post: dict) -> tuple[str, ...]:
+    """Upper-case codes of the currencies a post is tagged with ('instruments' in v2, 'currencies' in v1)."""
+    tagged = post.get("instruments") or post.get("currencies") or []
+    return tuple(item["code"].upper() for item in tagged if isinstance(item, dict) and item.get("code"))
+
+
+@dataclass
+class _Query:
+    """Post ids of one query (currencies, filter, kind) in CryptoPanic's order, as far as fetched."""
+    params: dict
+    ids: list = field(default_factory=list)
+    key: tuple = ()  # (currencies, filter, kind)
+    next_page: int | None = 1  # None while CryptoPanic reports no further page
+    fetched_at: float | None = None  # monotonic time of the last first-page fetch
+
+
+class CryptoPanicFeed:
+    """Shared, cached client of the CryptoPanic posts feed.
+
+    Every CryptoPanic caller goes through this object: the root agent's market
+    scan, business_analyst_1 and the watcher's news source. Posts are stored once,
+    keyed by post id, in a rolling window (posts returned by a request within the
+    last FEED_WINDOW_SECONDS, at most FEED_MAX_POSTS). Each query keeps the ids of
+    its posts in CryptoPanic's order (newest first, or the filter's ranking); its
+    first page is refreshed after the TTL, which restarts its pagination, and
+    further pages are fetched only when a caller asks for more posts than are
+    cached. Posts repeated between pages, refreshes and queries are deduplicated
+    by id.
+
+    A per-currency query is served from the posts of the global query with the
+    same filter when those already contain enough posts tagged with the currency.
+    Callers passing a `consumer` key only get posts not yet returned to that
+    consumer.
+
+    Requests are made without holding the lock; concurrent callers needing the
+    same page of a query share one request (single flight).
+    """
+
+    def __init__(self, ttl_seconds: float = FEED_TTL_SECONDS, window_seconds: float = FEED_WINDOW_SECONDS,
+                 max_posts: int = FEED_MAX_POSTS, endpoint: str = CRYPTOPANIC_POSTS_ENDPOINT):
+        self.ttl_seconds = ttl_seconds
+        self.window_seconds = window_seconds
+        self.max_posts = max_posts
+        self.endpoint = endpoint
+        self._posts = {}  # post id -> (post, time it was last returned by a request)
+        self._queries = {}  # (currencies, filter, kind) -> _Query
+        self._consumers = OrderedDict()  # consumer -> ids already returned to it
+        self._inflight = {}  # (query key, page) -> Flight
+        self._lock = threading.RLock()
+        self._counters = {
+            "hits": 0,
+            "global_view_hits": 0,
+            "refreshes": 0,
+            "http_requests": 0,
+            "duplicates": 0,
+            "errors": 0,
+        }
+
+    # Internal helpers (callers hold self._lock)
+
+    def _query(self, currencies: str | None, filter: str | None, kind: str) -> _Query:
+        key = (currencies, filter, kind)
+        query = self._queries.get(key)
+        if query is None:
+            # Same parameters as the tools sent before, so existing recordings still match
+            params = {"kind": kind, "public": "true"}
+            if currencies:
+                params["currencies"] = currencies
+            if filter:
+                params["filter"] = filter
+            query = self._queries[key] = _Query(params=params, key=key)
+        return query
+
+    def _store(self, results: list) -> list:
+        """Adds a page of posts to the window and returns their ids (without repeats)."""
+        now = time.time()
+        ids = []
+        for post in results:
+            pid = post_id(post)
+            if pid in self._posts or pid in ids:
+                self._counters["duplicates"] += 1
+            self._posts[pid] = (post, now)
+            if pid not in ids:
+                ids.append(pid)
+        return ids
+
+    def _merge_page(self, query: _Query, page: int, data: dict):
+        page_ids = self._store(data.get("results") or [])
+        has_next = bool(data.get("next")) and bool(page_ids)
+        if page == 1:
+            known = set(query.ids)
+            if known and known.isdisjoint(page_ids):
+                # More than a page of new posts since the last refresh: the cached deeper pages no longer follow on
+                query.ids = page_ids
+            else:
+                # New posts first, then the cached ones (which they pushed towards later pages)
+                query.ids = page_ids + [pid for pid in query.ids if pid not in set(page_ids)]
+            # Every refresh restarts pagination, also for a query whose deeper pages had run out before
+            query.next_page = 2 if has_next else None
+            query.fetched_at = time.monotonic()
+            self._counters["refreshes"] += 1
+        elif query.next_page == page:
+            query.ids += [pid for pid in page_ids if pid not in set(query.ids)]
+            query.next_page = page + 1 if has_next else None
+        # Otherwise a refresh restarted pagination while this page was in flight; its posts stay in the window only
+
+    def _evict(self):
+        cutoff = time.time() - self.window_seconds
+        expired = {pid for pid, (_, returned_at) in self._posts.items() if returned_at < cutoff}
+        if len(self._posts) - len(expired) > self.max_posts:
+            recent_first = sorted((item for item in self._posts.items() if item[0] not in expired),
+                                  key=lambda item: item[1][1], reverse=True)
+            expired.update(pid for pid, _ in recent_first[self.max_posts:])
+        if not expired:
+            return
+        for pid in expired:
+            del self._posts[pid]
+        for query in self._queries.values():
+            query.ids = [pid for pid in query.ids if pid not in expired]
+
+    def _available(self, query: _Query, seen: set, currencies: frozenset | None = None) -> list:
+        """Posts of `query` not in `seen` (and tagged with one of `currencies`), in the query's order."""
+        posts = [self._posts[pid][0] for pid in query.ids if pid not in seen and pid in self._posts]
+        if currencies:
+            posts = [post for post in posts if currencies.intersection(post_currencies(post))]
+        return posts
+
+    def _is_fresh(self, query: _Query | None, max_age: float) -> bool:
+        return query is not None and query.fetched_at is not None and time.monotonic() - query.fetched_at < max_age
+
+    # Requests (callers must not hold self._lock)
+
+    def _request(self, params: dict, page: int) -> dict:
+        request_params = {"auth_token": os.getenv("CRYPTO_PANIC_API_KEY"), **params}
+        if page > 1:
+            request_params["page"] = page
+
+        def fetch():
+            response = requests.get(self.endpoint, params=request_params, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        # The auth token is not part of the recorded key
+        key = {k: v for k, v in request_params.items() if k != "auth_token"}
+        return recorded("cryptopanic", key, fetch, route="posts")
+
+    def _fetch_page(self, query: _Query, page: int):
+        """Fetches and merges one page of `query`, sharing the request with concurrent callers."""
+        with self._lock:
+            flight = self._inflight.get((query.key, page))
+            leader = flight is None
+            if leader:
+                flight = self._inflight[(query.key, page)] = Flight()
+                self._counters["http_requests"] += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            data = self._request(query.params, page) or {}
+            with self._lock:
+                self._merge_page(query, page, data)
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+                self._inflight.pop((query.key, page), None)
+            flight.resolve(error=e)
+            raise
+
+        with self._lock:
+            self._inflight.pop((query.key, page), None)
+        flight.resolve()
+
+    # Public API
+
+    def posts(self, currencies: str | None = None, filter: str | None = None, kind: str = "news",
+              limit: int = 20, consumer: str | None = None, max_age_seconds: float | None = None) -> list[dict]:
+        """Returns the latest posts of a CryptoPanic query, served from the shared window when possible.
+
+        Args:
+            currencies (str, optional): Comma-separated currency codes (e.g. 'BTC,ETH'); None for all posts.
+            filter (str, optional): CryptoPanic filter ('hot', 'rising', 'bullish', ...).
+            kind (str, optional): 'news' or 'media'. Defaults to 'news'.
+            limit (int, optional): Maximum number of posts. Defaults to 20.
+            consumer (str, optional): Caller key; posts already returned to it are skipped.
+            max_age_seconds (float, optional): Maximum age of the cached first page.
+                Defaults to the feed's TTL; 0 always refetches it.
+        Returns:
+            list[dict]: Posts as returned by CryptoPanic, in its order, without duplicates.
+        Raises:
+            Exception: Propagates the HTTP error when nothing is cached for the query.
+        """
+        codes = frozenset(code.strip().upper() for code in (currencies or "").split(",") if code.strip())
+        currencies = ",".join(sorted(codes)) or None
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+
+        with self._lock:
+            seen = set(self._consumers.get(consumer, ())) if consumer is not None else set()
+            result = None
+
+            global_query = self._queries.get((None, filter, kind))
+            if currencies and self._is_fresh(global_query, max_age):
+                tagged = self._available(global_query, seen, codes)
+                if len(tagged) >= limit:
+                    self._counters["global_view_hits"] += 1
+                    result = tagged[:limit]
+
+            if result is None:
+                query = self._query(currencies, filter, kind)
+                fresh = self._is_fresh(query, max_age)
+                if fresh:
+                    self._counters["hits"] += 1
+
+        if result is None:
+            if not fresh:
+                try:
+                    self._fetch_page(query, 1)
+                except Exception as e:
+                    if query.fetched_at is None:
+                        raise
+                    logger.warning("CryptoPanic refresh failed, serving cached posts: %s", e)
+            # Lazy pagination: go deeper only while the caller needs more posts than are cached
+            while True:
+                with self._lock:
+                    page = query.next_page
+                    if not page or page > FEED_MAX_PAGES or len(self._available(query, seen)) >= limit:
+                        break
+                try:
+                    self._fetch_page(query, page)
+                except Exception as e:
+                    logger.warning("CryptoPanic page %d failed: %s", page, e)
+                    break
+            with self._lock:
+                self._evict()
+                result = self._available(query, seen)[:limit]
+
+        if consumer is not None:
+            with self._lock:
+                self._consumers.setdefault(consumer, set()).update(post_id(post) for post in result)
+                self._consumers.move_to_end(consumer)
+                while len(self._consumers) > FEED_MAX_CONSUMERS:
+                    self._consumers.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        """Returns a copy of the counters plus the number of cached posts and queries."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["posts"] = len(self._posts)
+            stats["queries"] = len(self._queries)
+        return stats
+
+    def clear(self):
+        """Drops all cached posts, queries and consumers, and resets the counters (in-flight requests still finish)."""
+        with self._lock:
+            self._posts.clear()
+            self._queries.clear()
+            self._consumers.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+# Shared instance used by every CryptoPanic caller in the package
+cryptopanic_feed = CryptoPanicFeed()
@@ -0,0 +1,48 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+
+class LazyResource:
+    """Thread-safe holder that creates a heavy client or resource on first use.
+
+    Nothing is imported, connected or opened until `get()` is first called, so
+    importing the agent package stays cheap and does not fail when one external
+    service is down. Concurrent first calls create the resource only once.
+    """
+
+    def __init__(self, factory, name: str):
+        self._factory = factory
+        self.name = name
+        self._value = None
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns the resource, creating it on the first call."""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    started = time.perf_counter()
+                    self._value = self._factory()
+                    self._initialized = True
+                    logger.info("Initialised %s in %.3fs", self.name, time.perf_counter() - started)
+        return self._value
+
+    def set(self, value):
+        """Replaces the resource (e.g. with a local stand-in)."""
+        with self._lock:
+            self._value = value
+            self._initialized = True
+
+    def reset(self):
+        """Drops the resource so that the next `get()` creates it again."""
+        with self._lock:
+            self._value = None
+            self._initialized = False
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
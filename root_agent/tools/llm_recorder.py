@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+from .recorder import Cassette, active_cassette
+
+
+class LlmRecorderPlugin(BasePlugin):
+    """Records Gemini responses into the active cassette, or serves them from it.
+
+    Runner plugins also apply inside AgentTools and workflow agents, so one
+    plugin covers every LlmAgent of the tree. Responses are keyed by agent
+    name and served in call order per agent, since the requests themselves
+    contain timestamps and timings that differ between runs. Without an
+    active cassette the plugin does nothing.
+    """
+
+    def __init__(self, name: str = "llm_recorder"):
+        super().__init__(name=name)
+        self._started = {}
+
+    @staticmethod
+    def _key(callback_context: CallbackContext) -> dict:
+        return {"agent": callback_context.agent_name}
+
+    def _elapsed(self, callback_context: CallbackContext) -> float:
+        started = self._started.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        return time.perf_counter() - started if started is not None else 0.0
+
+    async def before_model_callback(self, *, callback_context: CallbackContext,
+                                    llm_request: LlmRequest) -> LlmResponse | None:
+        cassette = active_cassette()
+        if cassette is None:
+            return None
+        if cassette.mode == "record":
+            self._started[(callback_context.invocation_id, callback_context.agent_name)] = time.perf_counter()
+            return None
+
+        # Returning a response skips the model call
+        entry = cassette.lookup("gemini", self._key(callback_context), route=callback_context.agent_name)
+        delay = cassette.delay(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return LlmResponse.model_validate(cassette.result(entry))
+
+    async def after_model_callback(self, *, callback_context: CallbackContext,
+                                   llm_response: LlmResponse) -> LlmResponse | None:
+        cassette: Cassette | None = active_cassette()
+        if cassette is not None and cassette.mode == "record":
+            cassette.add("gemini", self._key(callback_context), callback_context.agent_name,
+                         self._elapsed(callback_context), llm_response.model_dump(mode="json", exclude_none=True))
+        return None
+
+    async def on_model_error_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest,
+                                      error: Exception) -> LlmResponse | None:
+        cassette = active_cassette()
+        if cassette is not None and cassette.mode == "record":
+            cassette.add("gemini", self._key(callback_context), callback_context.agent_name,
+                         self._elapsed(callback_context), error=error)
+        return None
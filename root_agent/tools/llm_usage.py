@@ -0,0 +1,244 @@
+"""Per-agent LLM token, latency and cost accounting of agent cycles.
+
+LlmUsagePlugin (registered on the root_agent App) measures every model call
+of every LlmAgent, including those inside AgentTools and the data-acquisition
+branches (which keep the names of the agents they were cloned from):
+prompt, cached, output and thinking tokens from the response's usage
+metadata, time to first token (the first streamed chunk; equal to the total
+latency without streaming) and total latency. Failed model calls are counted
+as model errors. Calls are attributed to the
+agent, the cycle (the invocation id of the outermost run) and the asset (the
+watcher trigger's asset in session state, when there is one).
+
+When a cycle ends its breakdown (per agent and in total, with an estimated
+cost) is kept in `recent_cycles` and, when TRACING_EXPORT_DIR is set,
+appended to llm_usage.jsonl there.
+
+Budgets are read from LLM_AGENT_BUDGETS, a JSON object mapping an agent name
+(or "*" for every agent, or "cycle" for the whole cycle) to limits per cycle
+on any of BUDGET_METRICS, e.g.
+    {"root_agent": {"total_tokens": 200000, "latency_seconds": 120}, "*": {"output_tokens": 8000}}
+The first time a limit is exceeded in a cycle a warning is logged, an alert is
+added to the cycle breakdown and `on_alert(alert)` is called.
+"""
+from collections import deque
+import contextvars
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+import time
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+logger = logging.getLogger("root_agent")
+
+USAGE_FILE_NAME = "llm_usage.jsonl"
+RECENT_CYCLES = 100
+BUDGET_METRICS = ("prompt_tokens", "cached_tokens", "output_tokens", "thoughts_tokens", "total_tokens",
+                  "model_calls", "latency_seconds", "cost_usd")
+# USD per million tokens (list prices; thinking tokens are billed as output)
+MODEL_PRICES_PER_MILLION = {
+    "gemini-2.5-flash": {"input": 0.30, "cached_input": 0.075, "output": 2.50},
+}
+
+
+@dataclass
+class ModelCall:
+    """Usage of one model call."""
+    agent: str
+    model: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    thoughts_tokens: int = 0
+    ttft_seconds: float = 0.0
+    latency_seconds: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens + self.thoughts_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        prices = MODEL_PRICES_PER_MILLION.get(self.model)
+        if prices is None:
+            return 0.0
+        uncached = max(self.prompt_tokens - self.cached_tokens, 0)
+        return (uncached * prices["input"] + self.cached_tokens * prices["cached_input"]
+                + (self.output_tokens + self.thoughts_tokens) * prices["output"]) / 1e6
+
+
+@dataclass
+class CycleUsage:
+    """Model calls of one agent cycle."""
+    cycle_id: str
+    asset: str | None
+    started_at: float = field(default_factory=time.time)
+    calls: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    alerts: list = field(default_factory=list)
+
+    def totals(self, agent: str | None = None) -> dict:
+        """Summed usage of one agent's calls (or of all calls)."""
+        calls = [call for call in self.calls if agent is None or call.agent == agent]
+        totals = {name: sum(getattr(call, name) for call in calls)
+                  for name in ("prompt_tokens", "cached_tokens", "output_tokens", "thoughts_tokens", "total_tokens")}
+        totals["model_calls"] = len(calls)
+        totals["model_errors"] = sum(1 for error in self.errors if agent is None or error["agent"] == agent)
+        totals["latency_seconds"] = round(sum(call.latency_seconds for call in calls), 3)
+        totals["max_ttft_seconds"] = round(max((call.ttft_seconds for call in calls), default=0.0), 3)
+        totals["cost_usd"] = round(sum(call.cost_usd for call in calls), 6)
+        return totals
+
+    def breakdown(self) -> dict:
+        """Per-agent and total usage, JSON-serialisable."""
+        agents = sorted({call.agent for call in self.calls} | {error["agent"] for error in self.errors})
+        return {
+            "cycle_id": self.cycle_id,
+            "asset": self.asset,
+            "started_at": self.started_at,
+            "agents": {agent: self.totals(agent) for agent in agents},
+            "total": self.totals(),
+            "errors": list(self.errors),
+            "alerts": list(self.alerts),
+        }
+
+
+def load_agent_budgets() -> dict:
+    """Per-cycle budgets from LLM_AGENT_BUDGETS (empty when unset)."""
+    value = os.getenv("LLM_AGENT_BUDGETS")
+    if not value:
+        return {}
+    budgets = json.loads(value)
+    for scope, limits in budgets.items():
+        unknown = set(limits) - set(BUDGET_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown budget metrics for '{scope}': {sorted(unknown)}. Available: {BUDGET_METRICS}")
+    return budgets
+
+
+_current_cycle: contextvars.ContextVar[CycleUsage | None] = contextvars.ContextVar("current_llm_cycle", default=None)
+
+
+class LlmUsagePlugin(BasePlugin):
+    """Collects the per-agent LLM usage of every cycle and checks it against budgets."""
+
+    def __init__(self, budgets: dict | None = None, on_alert=None, name: str = "llm_usage"):
+        """
+        Args:
+            budgets (dict, optional): Limits as described in the module docstring.
+                Defaults to LLM_AGENT_BUDGETS.
+            on_alert (callable, optional): Called with each alert dict.
+        """
+        super().__init__(name=name)
+        self.budgets = load_agent_budgets() if budgets is None else budgets
+        self.on_alert = on_alert
+        self.recent_cycles = deque(maxlen=RECENT_CYCLES)
+        self._roots = {}
+        self._pending = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # AgentTools start nested runs, which belong to the cycle of their caller
+        if _current_cycle.get() is None:
+            trigger = invocation_context.session.state.get("trigger") or {}
+            cycle = CycleUsage(cycle_id=invocation_context.invocation_id, asset=trigger.get("asset"))
+            _current_cycle.set(cycle)
+            self._roots[invocation_context.invocation_id] = cycle
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        cycle = self._roots.pop(invocation_context.invocation_id, None)
+        if cycle is not None:
+            _current_cycle.set(None)
+            self._finish(cycle)
+        return None
+
+    async def before_model_callback(self, *, callback_context: CallbackContext,
+                                    llm_request: LlmRequest) -> LlmResponse | None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._pending[key] = (llm_request.model or "", time.perf_counter(), None)
+        return None
+
+    async def on_event_callback(self, *, invocation_context: InvocationContext, event: Event) -> Event | None:
+        # Model responses reach every runner's plugins, also when a recorded response was replayed
+        key = (event.invocation_id, event.author)
+        pending = self._pending.get(key)
+        if pending is None or event.content is None or event.content.role != "model":
+            return None
+        model, started, first_token = pending
+        now = time.perf_counter()
+        if first_token is None:
+            first_token = now
+        if event.partial:
+            self._pending[key] = (model, started, first_token)
+            return None
+        del self._pending[key]
+
+        usage = event.usage_metadata
+        call = ModelCall(
+            agent=event.author,
+            model=model,
+            prompt_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            cached_tokens=(usage.cached_content_token_count or 0) if usage else 0,
+            output_tokens=(usage.candidates_token_count or 0) if usage else 0,
+            thoughts_tokens=(usage.thoughts_token_count or 0) if usage else 0,
+            ttft_seconds=round(first_token - started, 3),
+            latency_seconds=round(now - started, 3),
+        )
+        cycle = _current_cycle.get()
+        if cycle is not None:
+            cycle.calls.append(call)
+            self._check_budgets(cycle, call.agent)
+        return None
+
+    async def on_model_error_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest,
+                                      error: Exception) -> LlmResponse | None:
+        # The call produces no model event, so its pending entry is dropped here
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        pending = self._pending.pop(key, None)
+        cycle = _current_cycle.get()
+        if cycle is not None:
+            model, started = (pending[0], pending[1]) if pending else (llm_request.model or "", None)
+            cycle.errors.append({
+                "agent": callback_context.agent_name,
+                "model": model,
+                "error": f"{type(error).__name__}: {error}",
+                "latency_seconds": round(time.perf_counter() - started, 3) if started is not None else None,
+            })
+        return None
+
+    def _check_budgets(self, cycle: CycleUsage, agent: str):
+        scopes = [(agent, self.budgets.get(agent) or self.budgets.get("*") or {}), ("cycle", self.budgets.get("cycle") or {})]
+        for scope, limits in scopes:
+            if not limits:
+                continue
+            totals = cycle.totals(None if scope == "cycle" else agent)
+            for metric, limit in limits.items():
+                if totals[metric] <= limit or any(a["scope"] == scope and a["metric"] == metric for a in cycle.alerts):
+                    continue
+                alert = {"cycle_id": cycle.cycle_id, "asset": cycle.asset, "scope": scope, "metric": metric,
+                         "value": totals[metric], "limit": limit}
+                cycle.alerts.append(alert)
+                logger.warning("LLM budget exceeded in cycle %s (%s): %s %s = %s > %s",
+                               cycle.cycle_id, cycle.asset, scope, metric, totals[metric], limit)
+                if self.on_alert is not None:
+                    self.on_alert(alert)
+
+    def _finish(self, cycle: CycleUsage):
+        breakdown = cycle.breakdown()
+        self.recent_cycles.append(breakdown)
+        total = breakdown["total"]
+        logger.info("LLM usage of cycle %s (%s): %d calls, %d errors, %d tokens, %.1fs, $%.4f",
+                    cycle.cycle_id, cycle.asset, total["model_calls"], total["model_errors"], total["total_tokens"],
+                    total["latency_seconds"], total["cost_usd"])
+        directory = os.getenv("TRACING_EXPORT_DIR")
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, USAGE_FILE_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps({**breakdown, "calls": [asdict(call) for call in cycle.calls]}) + "\n")
@@ -0,0 +1,347 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .recorder import recorded
+from .single_flight import Flight
+
+logger = logging.getLogger("root_agent")
+
+COINGECKO_ENDPOINT = "https://api.coingecko.com/api/v3"
+HTTP_POOL_SIZE = 16
+
+# (fresh_seconds, stale_seconds) per CoinGecko endpoint family.
+# Within `fresh_seconds` a cached response is served as-is; for a further
+# `stale_seconds` it is still served, but a background refresh is started.
+ENDPOINT_TTLS = {
+    "simple/price": (30, 90),
+    "coins": (60, 240),
+    "coins/markets": (60, 120),
+    "market_chart": (120, 480),
+    "default": (30, 0),
+}
+
+
+def _make_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Creates a requests session that keeps up to `pool_size` connections alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _endpoint_family(path: str) -> str:
+    """Maps a CoinGecko path (e.g. 'coins/bitcoin/market_chart') to its TTL family."""
+    path = path.strip("/")
+    if path.startswith("simple/price"):
+        return "simple/price"
+    if path == "coins/markets":
+        return "coins/markets"
+    if path.startswith("coins/") and path.endswith("/market_chart"):
+        return "market_chart"
+    if path.startswith("coins/") and path.count("/") == 1:
+        return "coins"
+    return "default"
+
+
+class MarketDataCache:
+    """In-process cache for CoinGecko responses.
+
+    Every CoinGecko caller goes through this object so that one decision cycle
+    does not fetch the same data several times. It provides per-endpoint TTLs,
+    stale-while-revalidate and single-flight coalescing (concurrent requests for
+    the same key share one HTTP call).
+    """
+
+    def __init__(self, ttls: dict | None = None, base_url: str = COINGECKO_ENDPOINT):
+        self.ttls = dict(ENDPOINT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.base_url = base_url
+        self.session = _make_session()
+        self._entries = {}  # key -> (value, fetched_at)
+        self._inflight = {}  # key -> Flight
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "http_requests": 0,
+            "errors": 0,
+        }
+
+    # Internal helpers
+
+    def _count(self, name: str, n: int = 1):
+        # Caller must hold self._lock
+        self._counters[name] += n
+
+    def _state(self, key, family: str, now: float) -> str:
+        """Returns 'fresh', 'stale' or 'missing' for a cache key. Caller must hold self._lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "missing"
+        fresh_ttl, stale_ttl = self.ttls.get(family, self.ttls["default"])
+        age = now - entry[1]
+        if age < fresh_ttl:
+            return "fresh"
+        if age < fresh_ttl + stale_ttl:
+            return "stale"
+        return "missing"
+
+    def _http_get(self, path: str, params: dict | None, timeout: float):
+        url = f"{self.base_url}/{path.strip('/')}"
+        with self._lock:
+            self._count("http_requests")
+
+        def fetch():
+            response = self.session.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        return recorded("coingecko", {"path": path.strip("/"), "params": params}, fetch, route=path.strip("/"))
+
+    def _refresh_in_background(self, key, flight: Flight, fetch):
+        def run():
+            try:
+                value = fetch()
+            except Exception as e:
+                logger.warning("Background CoinGecko refresh failed for %s: %s", key, e)
+                with self._lock:
+                    self._count("errors")
+                    self._inflight.pop(key, None)
+                flight.resolve(error=e)
+                return
+            with self._lock:
+                self._entries[key] = (value, time.monotonic())
+                self._inflight.pop(key, None)
+            flight.resolve(value=value)
+
+        threading.Thread(target=run, name="market-data-refresh", daemon=True).start()
+
+    # Public API
+
+    def get(self, path: str, params: dict | None = None, timeout: float = 10):
+        """Returns the JSON body of a CoinGecko GET request, served from cache when possible.
+
+        Args:
+            path (str): Endpoint path relative to the API root (e.g. 'coins/bitcoin').
+            params (dict, optional): Query parameters.
+            timeout (float, optional): HTTP timeout in seconds. Defaults to 10.
+        Returns:
+            The decoded JSON response.
+        Raises:
+            Exception: Propagates the HTTP error when nothing usable is cached.
+        """
+        path = path.strip("/")
+        family = _endpoint_family(path)
+        key = (path, tuple(sorted((params or {}).items())))
+
+        def fetch():
+            return self._http_get(path, params, timeout)
+
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(key, family, now)
+            if state == "fresh":
+                self._count("hits")
+                return self._entries[key][0]
+            if state == "stale":
+                self._count("stale_hits")
+                if key not in self._inflight:
+                    self._count("refreshes")
+                    flight = Flight()
+                    self._inflight[key] = flight
+                    self._refresh_in_background(key, flight, fetch)
+                return self._entries[key][0]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self._count("coalesced")
+                leader = False
+            else:
+                self._count("misses")
+                flight = Flight()
+                self._inflight[key] = flight
+                leader = True
+
+        if not leader:
+            return flight.wait(timeout)
+
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self._count("errors")
+                self._inflight.pop(key, None)
+            flight.resolve(error=e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._inflight.pop(key, None)
+        flight.resolve(value=value)
+        return value
+
+    def fetch(self, path: str, params: dict | None = None, timeout: float = 10):
+        """Performs a CoinGecko GET request without caching its response.
+
+        For requests that are never repeated, such as market chart ranges with
+        second-level timestamps, which would only add entries nobody reads.
+        """
+        return self._http_get(path.strip("/"), params, timeout)
+
+    def get_simple_prices(self, coin_ids: list[str], currency: str = "usd", timeout: float = 10) -> dict:
+        """Returns current prices for several coins, caching each coin separately.
+
+        Prices are cached per (coin, currency), so a single-coin lookup and a
+        portfolio-wide batch lookup share the same entries. All coins missing from
+        the cache are fetched together in one `/simple/price` request.
+
+        Args:
+            coin_ids (list[str]): CoinGecko coin IDs.
+            currency (str, optional): Quote currency. Defaults to "usd".
+            timeout (float, optional): HTTP timeout in seconds. Defaults to 10.
+        Returns:
+            dict: Mapping in the `/simple/price` shape, e.g. {"bitcoin": {"usd": 67000.0}}.
+        """
+        currency = currency.lower()
+        family = "simple/price"
+        result = {}
+        to_fetch = []
+        to_refresh = []
+        waiting = {}
+
+        with self._lock:
+            now = time.monotonic()
+            for coin_id in dict.fromkeys(coin_ids):
+                key = ("simple/price", coin_id, currency)
+                state = self._state(key, family, now)
+                if state == "fresh":
+                    self._count("hits")
+                    result[coin_id] = self._entries[key][0]
+                elif state == "stale":
+                    self._count("stale_hits")
+                    result[coin_id] = self._entries[key][0]
+                    if key not in self._inflight:
+                        to_refresh.append(coin_id)
+                elif key in self._inflight:
+                    self._count("coalesced")
+                    waiting[coin_id] = self._inflight[key]
+                else:
+                    self._count("misses")
+                    to_fetch.append(coin_id)
+
+            flights = {}
+            for coin_id in to_fetch + to_refresh:
+                flight = Flight()
+                self._inflight[("simple/price", coin_id, currency)] = flight
+                flights[coin_id] = flight
+            if to_refresh:
+                self._count("refreshes", len(to_refresh))
+
+        def fetch_batch(ids):
+            data = self._http_get("simple/price", {"ids": ",".join(ids), "vs_currencies": currency}, timeout)
+            fetched_at = time.monotonic()
+            with self._lock:
+                for coin_id in ids:
+                    key = ("simple/price", coin_id, currency)
+                    if coin_id in data:
+                        self._entries[key] = (data[coin_id], fetched_at)
+                    self._inflight.pop(key, None)
+            for coin_id in ids:
+                flights[coin_id].resolve(value=data.get(coin_id))
+            return data
+
+        def fail_batch(ids, error):
+            with self._lock:
+                self._count("errors")
+                for coin_id in ids:
+                    self._inflight.pop(("simple/price", coin_id, currency), None)
+            for coin_id in ids:
+                flights[coin_id].resolve(error=error)
+
+        if to_refresh:
+            def refresh():
+                try:
+                    fetch_batch(to_refresh)
+                except Exception as e:
+                    logger.warning("Background price refresh failed for %s: %s", to_refresh, e)
+                    fail_batch(to_refresh, e)
+
+            threading.Thread(target=refresh, name="market-data-refresh", daemon=True).start()
+
+        if to_fetch:
+            try:
+                data = fetch_batch(to_fetch)
+            except Exception as e:
+                fail_batch(to_fetch, e)
+                raise
+            for coin_id in to_fetch:
+                if coin_id in data:
+                    result[coin_id] = data[coin_id]
+
+        for coin_id, flight in waiting.items():
+            value = flight.wait(timeout)
+            if value is not None:
+                result[coin_id] = value
+
+        return result
+
+    def prime_prices(self, prices: dict, currency: str = "usd"):
+        """Stores known prices as fresh `/simple/price` entries (e.g. simulated prices in a backtest).
+
+        Args:
+            prices (dict): Mapping of CoinGecko ID to price, e.g. {"bitcoin": 67000.0}.
+            currency (str, optional): Quote currency. Defaults to "usd".
+        """
+        currency = currency.lower()
+        fetched_at = time.monotonic()
+        with self._lock:
+            for coin_id, price in prices.items():
+                self._entries[("simple/price", coin_id, currency)] = ({currency: price}, fetched_at)
+
+    def stats(self) -> dict:
+        """Returns a copy of the hit/miss counters plus the current number of entries."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"] + stats["coalesced"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drops all cached entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+# Shared instance used by every CoinGecko caller in the package
+market_data_cache = MarketDataCache()
+
+
+def coingecko_get(path: str, params: dict | None = None, timeout: float = 10):
+    """Fetches a CoinGecko endpoint through the shared market-data cache."""
+    return market_data_cache.get(path, params=params, timeout=timeout)
+
+
+def coingecko_fetch(path: str, params: dict | None = None, timeout: float = 10):
+    """Fetches a CoinGecko endpoint through the shared session, bypassing the cache."""
+    return market_data_cache.fetch(path, params=params, timeout=timeout)
+
+
+def get_cached_prices(coin_ids: list[str], currency: str = "usd", timeout: float = 10) -> dict:
+    """Fetches current prices for several coins through the shared market-data cache."""
+    return market_data_cache.get_simple_prices(coin_ids, currency=currency, timeout=timeout)
+
+
+def get_market_data_cache_stats() -> dict:
+    """Returns the hit/miss counters of the shared market-data cache."""
+    return market_data_cache.stats()
@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from .market_data_cache import coingecko_get
+from .numbers import compact_number
+from .tracing import submit_in_context, traced
+
+logger = logging.getLogger("root_agent")
+
+# Columns of the snapshot table, in order
+SNAPSHOT_COLUMNS = [
+    "symbol", "price", "market_cap", "market_cap_rank", "volume_24h",
+    "change_24h_pct", "change_7d_pct", "high_24h", "low_24h", "range_24h_pct",
+]
+# /coins/markets returns at most this many coins per request
+MARKETS_PAGE_SIZE = 250
+
+# Shared pool for the per-coin fallback requests
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-snapshot")
+
+
+def _range_pct(high, low):
+    if not isinstance(high, (int, float)) or not isinstance(low, (int, float)) or not low:
+        return None
+    return (high - low) / low * 100
+
+
+def _first(*values):
+    return next((value for value in values if value is not None), None)
+
+
+def _row_from_markets(coin: dict) -> list:
+    """A snapshot row from one entry of the /coins/markets response."""
+    high, low = coin.get("high_24h"), coin.get("low_24h")
+    values = {
+        "symbol": coin.get("symbol"),
+        "price": coin.get("current_price"),
+        "market_cap": coin.get("market_cap"),
+        "market_cap_rank": coin.get("market_cap_rank"),
+        "volume_24h": coin.get("total_volume"),
+        "change_24h_pct": _first(coin.get("price_change_percentage_24h_in_currency"), coin.get("price_change_percentage_24h")),
+        "change_7d_pct": coin.get("price_change_percentage_7d_in_currency"),
+        "high_24h": high,
+        "low_24h": low,
+        "range_24h_pct": _range_pct(high, low),
+    }
+    return [compact_number(column, values[column]) for column in SNAPSHOT_COLUMNS]
+
+
+def _row_from_coin(coin_data: dict, currency: str) -> list:
+    """A snapshot row from a /coins/{id} response (the per-coin fallback)."""
+    market_data = coin_data.get("market_data") or {}
+
+    def quoted(field):
+        return (market_data.get(field) or {}).get(currency)
+
+    high, low = quoted("high_24h"), quoted("low_24h")
+    values = {
+        "symbol": coin_data.get("symbol"),
+        "price": quoted("current_price"),
+        "market_cap": quoted("market_cap"),
+        "market_cap_rank": coin_data.get("market_cap_rank"),
+        "volume_24h": quoted("total_volume"),
+        "change_24h_pct": _first(quoted("price_change_percentage_24h_in_currency"), market_data.get("price_change_percentage_24h")),
+        "change_7d_pct": _first(quoted("price_change_percentage_7d_in_currency"), market_data.get("price_change_percentage_7d")),
+        "high_24h": high,
+        "low_24h": low,
+        "range_24h_pct": _range_pct(high, low),
+    }
+    return [compact_number(column, values[column]) for column in SNAPSHOT_COLUMNS]
+
+
+def _fetch_markets(coin_ids: list[str], currency: str) -> dict:
+    """Rows of every coin returned by /coins/markets, one request per page of ids."""
+    rows = {}
+    for start in range(0, len(coin_ids), MARKETS_PAGE_SIZE):
+        # Sorted ids keep the cache key stable whatever order the caller uses
+        page = sorted(coin_ids[start:start + MARKETS_PAGE_SIZE])
+        data = coingecko_get("coins/markets", {
+            "vs_currency": currency,
+            "ids": ",".join(page),
+            "price_change_percentage": "24h,7d",
+            "per_page": MARKETS_PAGE_SIZE,
+        })
+        for coin in data or []:
+            if coin.get("id") in page:
+                rows[coin["id"]] = _row_from_markets(coin)
+    return rows
+
+
+def _fetch_coin_row(coin_id: str, currency: str) -> list:
+    # Same request (and cache entry) as get_crypto_technical_data, so a later analysis of the coin is served from cache
+    return _row_from_coin(coingecko_get(f"coins/{coin_id}"), currency)
+
+
+@traced
+def get_market_snapshot(coin_ids: list[str], currency: str = "usd") -> dict:
+    """Fetches a market overview of several cryptocurrencies in a single CoinGecko request.
+
+    Uses the batch /coins/markets endpoint, so screening the whole whitelist costs
+    one call. Coins the batch does not return (or all of them, when it fails) are
+    fetched one by one from /coins/{id} instead. The result is a compact table:
+    the column names are listed once and every coin has one row of values in that
+    order (null where a value is unavailable).
+
+    Args:
+        coin_ids (list[str]): CoinGecko IDs (e.g., ['bitcoin', 'ethereum', 'solana']).
+        currency (str, optional): The fiat currency to quote in. Defaults to "usd".
+    Returns:
+        dict: {"currency", "columns", "rows": {coin_id: [...]}}, plus "fallback" (coins
+        fetched one by one) and "errors" for coins that could not be fetched.
+    """
+    currency = currency.lower()
+    coin_ids = list(dict.fromkeys(coin_id.strip().lower() for coin_id in coin_ids if coin_id.strip()))
+    logger.info("Getting market snapshot for coins: %s", coin_ids)
+
+    try:
+        rows = _fetch_markets(coin_ids, currency)
+    except Exception as e:
+        logger.warning("CoinGecko /coins/markets failed, falling back to per-coin requests: %s", e)
+        rows = {}
+
+    fallback = [coin_id for coin_id in coin_ids if coin_id not in rows]
+    errors = {}
+    if fallback:
+        futures = {coin_id: submit_in_context(_executor, _fetch_coin_row, coin_id, currency) for coin_id in fallback}
+        for coin_id, future in futures.items():
+            try:
+                rows[coin_id] = future.result()
+            except Exception as e:
+                errors[coin_id] = str(e)
+
+    snapshot = {
+        "currency": currency,
+        "columns": SNAPSHOT_COLUMNS,
+        "rows": {coin_id: rows[coin_id] for coin_id in coin_ids if coin_id in rows},
+    }
+    if fallback:
+        snapshot["fallback"] = fallback
+    if errors:
+        snapshot["errors"] = errors
+    return snapshot
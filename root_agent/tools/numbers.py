@@ -0,0 +1,19 @@
+import math
+
+
+def compact_number(key: str, value):
+    """Rounds a tool output value to meaningful precision, judged by its key.
+
+    Percentages ('pct' in the key) and volatilities to 2 decimals, integers and
+    large amounts to integers, other numbers (prices) to 6 significant digits.
+    Non-finite numbers become None; other values are returned unchanged.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    if not math.isfinite(value):
+        return None
+    if "pct" in key or key.startswith("volatility"):
+        return round(value, 2)
+    if isinstance(value, int) or abs(value) >= 1e5:
+        return int(round(value))
+    return float(f"{value:.6g}")
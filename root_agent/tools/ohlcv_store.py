@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+
+import numpy as np
+
+from .lazy import LazyResource
+from .market_data_cache import coingecko_fetch
+
+logger = logging.getLogger("root_agent")
+
+OHLCV_STORE_DIR = pathlib.Path(__file__).parent / "ohlcv_store"
+# HTTP timeout (seconds) of one range request unless the caller passes its own deadline
+OHLCV_FETCH_TIMEOUT_SECONDS = 10.0
+
+# Point layout stored per (coin, currency, resolution): one row per CoinGecko data point
+POINT_DTYPE = np.dtype([("t", "<i8"), ("price", "<f8"), ("market_cap", "<f8"), ("volume", "<f8")])
+
+# CoinGecko picks the granularity from the requested range: up to 1 day back from now is
+# 5-minutely, up to 90 days is hourly, longer ranges are daily. Each resolution is stored
+# separately and requested with ranges that keep CoinGecko at that granularity: shorter
+# gaps are requested with a longer range and only the points inside the gap are kept.
+RESOLUTIONS = {
+    #     point spacing (s), min request range (s), max request range (s), available back from now (s)
+    "5m": (300, 0, 86400, 86400),
+    "1h": (3600, 86400 + 3600, 90 * 86400, None),
+    "1d": (86400, 91 * 86400, 365 * 86400, None),
+}
+
+def resolution_for_days(days: float) -> str:
+    """The finest resolution CoinGecko serves for a window of `days` ending now."""
+    if days <= 1:
+        return "5m"
+    if days <= 90:
+        return "1h"
+    return "1d"
+
+def _subtract(start: int, end: int, covered: list) -> list:
+    """Returns the parts of [start, end] not inside any of the sorted `covered` intervals."""
+    gaps, cursor = [], start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+def _merge(intervals: list) -> list:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class OHLCVStore:
+    """Local columnar store of CoinGecko market-chart points with gap-only fetching.
+
+    Points of each (coin, currency, resolution) live in one `.npy` file of
+    POINT_DTYPE rows sorted by time, read through a memory map. A JSON sidecar
+    records which time ranges have been fetched, so a request for a window only
+    downloads the ranges that are missing (via `market_chart/range`) and can be
+    served entirely offline once covered. All times are epoch seconds.
+    """
+
+    def __init__(self, root_dir: str | pathlib.Path = OHLCV_STORE_DIR, fetch_range=None):
+        """
+        Args:
+            root_dir: Directory holding the `.npy` files and coverage sidecars.
+            fetch_range (callable, optional): fetch_range(coin_id, currency, start, end, timeout) returning
+                the CoinGecko market_chart JSON for that range. Defaults to a CoinGecko request.
+        """
+        self.root_dir = pathlib.Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self._fetch_range = fetch_range or self._fetch_range_from_coingecko
+        self._lock = threading.RLock()  # guards _maps and _series_locks
+        self._series_locks = {}  # (coin, currency, resolution) -> lock held while that series is fetched
+        self._maps = {}  # path -> (mtime_ns, memmap)
+        self.fetches = 0
+
+    @staticmethod
+    def _fetch_range_from_coingecko(coin_id: str, currency: str, start: int, end: int, timeout: float) -> dict:
+        # Ranges end at the current second and are never requested twice, so they bypass the response cache
+        return coingecko_fetch(
+            f"coins/{coin_id}/market_chart/range",
+            params={"vs_currency": currency, "from": start, "to": end},
+            timeout=timeout,
+        )
+
+    def _series_lock(self, coin_id: str, currency: str, resolution: str) -> threading.Lock:
+        with self._lock:
+            return self._series_locks.setdefault((coin_id, currency, resolution), threading.Lock())
+
+    def _paths(self, coin_id: str, currency: str, resolution: str):
+        stem = f"{coin_id}_{currency}_{resolution}".replace("/", "_")
+        return self.root_dir / f"{stem}.npy", self.root_dir / f"{stem}.coverage.json"
+
+    def _coverage(self, coverage_path) -> list:
+        try:
+            with open(coverage_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _points(self, data_path) -> np.ndarray:
+        """Memory-maps the stored points, re-opening the map only when the file changed."""
+        try:
+            mtime_ns = os.stat(data_path).st_mtime_ns
+        except FileNotFoundError:
+            return np.empty(0, dtype=POINT_DTYPE)
+        with self._lock:
+            cached = self._maps.get(data_path)
+            if cached is None or cached[0] != mtime_ns:
+                cached = (mtime_ns, np.load(data_path, mmap_mode="r"))
+                self._maps[data_path] = cached
+            return cached[1]
+
+    @staticmethod
+    def _to_points(chart: dict) -> np.ndarray:
+        prices = chart.get("prices") or []
+        points = np.zeros(len(prices), dtype=POINT_DTYPE)
+        if not prices:
+            return points
+        points["t"] = [int(p[0]) // 1000 for p in prices]
+        points["price"] = [p[1] for p in prices]
+        for field, key in (("market_cap", "market_caps"), ("volume", "total_volumes")):
+            values = {int(p[0]) // 1000: p[1] for p in chart.get(key) or [] if p[1] is not None}
+            points[field] = [values.get(t, np.nan) for t in points["t"]]
+        return points
+
+    def _write(self, data_path, coverage_path, points: np.ndarray, coverage: list):
+        """Atomically replaces the points file and its coverage sidecar."""
+        temporary = data_path.with_suffix(".tmp.npy")
+        np.save(temporary, points)
+        os.replace(temporary, data_path)
+        temporary = coverage_path.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(coverage, f)
+        os.replace(temporary, coverage_path)
+        with self._lock:
+            self._maps.pop(data_path, None)
+
+    def missing_ranges(self, coin_id: str, start: int, end: int, resolution: str = "1h", currency: str = "usd") -> list:
+        """Returns the (start, end) ranges of the window that have not been fetched yet."""
+        spacing = RESOLUTIONS[resolution][0]
+        _, coverage_path = self._paths(coin_id, currency, resolution)
+        gaps = _subtract(int(start), int(end), self._coverage(coverage_path))
+        # Gaps shorter than one point spacing cannot contain a new point
+        return [(gap_start, gap_end) for gap_start, gap_end in gaps if gap_end - gap_start >= spacing]
+
+    def ensure(self, coin_id: str, start: int, end: int, resolution: str = "1h", currency: str = "usd",
+               timeout: float = OHLCV_FETCH_TIMEOUT_SECONDS) -> int:
+        """Fetches the missing parts of [start, end] from CoinGecko. Returns the number of requests made.
+
+        Only requests for the same series (coin, currency, resolution) wait for each other.
+        `timeout` applies to each request.
+        """
+        spacing, min_range, max_range, available_seconds = RESOLUTIONS[resolution]
+        now = int(time.time())
+        end = min(int(end), now)
+        if available_seconds is not None:
+            start = max(int(start), now - available_seconds)
+        data_path, coverage_path = self._paths(coin_id, currency, resolution)
+
+        with self._series_lock(coin_id, currency, resolution):
+            gaps = self.missing_ranges(coin_id, start, end, resolution, currency)
+            if not gaps:
+                return 0
+            new_points, new_coverage, requests = [], [], 0
+            for gap_start, gap_end in gaps:
+                for chunk_start in range(gap_start, gap_end, max_range):
+                    chunk_end = min(chunk_start + max_range, gap_end)
+                    chart = self._fetch_range(coin_id, currency, min(chunk_start, chunk_end - min_range), chunk_end, timeout)
+                    requests += 1
+                    chunk_points = self._to_points(chart)
+                    chunk_points = chunk_points[(chunk_points["t"] >= chunk_start) & (chunk_points["t"] <= chunk_end)]
+                    new_points.append(chunk_points)
+                    if chunk_end > now - spacing:
+                        # The newest point may not be published yet: only the part up to the
+                        # last returned point counts as covered, the rest is fetched again
+                        chunk_end = int(chunk_points["t"].max()) if len(chunk_points) else chunk_start
+                    if chunk_end > chunk_start:
+                        new_coverage.append([chunk_start, chunk_end])
+
+            points = np.concatenate([np.asarray(self._points(data_path))] + new_points)
+            points = np.sort(points, order="t")
+            keep = np.ones(len(points), dtype=bool)
+            keep[1:] = points["t"][1:] != points["t"][:-1]
+            coverage = _merge(self._coverage(coverage_path) + new_coverage)
+            self._write(data_path, coverage_path, points[keep], coverage)
+            with self._lock:
+                self.fetches += requests
+            logger.info("OHLCV store: fetched %d range(s) of %s/%s %s", requests, coin_id, currency, resolution)
+            return requests
+
+    def window(self, coin_id: str, start: int, end: int, resolution: str = "1h", currency: str = "usd",
+               fetch_missing: bool = True, timeout: float = OHLCV_FETCH_TIMEOUT_SECONDS) -> np.ndarray:
+        """Returns the stored points with start <= t <= end (a read-only view of the memory map).
+
+        Args:
+            fetch_missing (bool, optional): Fetch uncovered ranges first. With False the window is
+                served offline from whatever is stored. Defaults to True.
+            timeout (float, optional): HTTP timeout of each range request, in seconds.
+        """
+        if fetch_missing:
+            self.ensure(coin_id, start, end, resolution, currency, timeout)
+        data_path, _ = self._paths(coin_id, currency, resolution)
+        points = self._points(data_path)
+        lo = np.searchsorted(points["t"], int(start), side="left")
+        hi = np.searchsorted(points["t"], int(end), side="right")
+        return points[lo:hi]
+
+    def recent(self, coin_id: str, seconds: int, resolution: str | None = None, currency: str = "usd",
+               fetch_missing: bool = True, timeout: float = OHLCV_FETCH_TIMEOUT_SECONDS) -> np.ndarray:
+        """Points of the last `seconds`, at the finest resolution available for that span by default."""
+        end = int(time.time())
+        resolution = resolution or resolution_for_days(seconds / 86400)
+        return self.window(coin_id, end - seconds, end, resolution, currency, fetch_missing, timeout)
+
+    @staticmethod
+    def as_market_chart(points: np.ndarray) -> list:
+        """[[timestamp_ms, price], ...] pairs, the shape of CoinGecko's `prices` series."""
+        return np.column_stack([points["t"].astype(float) * 1000, points["price"]]).tolist()
+
+
+_ohlcv_store = LazyResource(lambda: OHLCVStore(OHLCV_STORE_DIR), "OHLCV store")
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Returns the shared OHLCV store."""
+    return _ohlcv_store.get()
@@ -0,0 +1,253 @@
+"""Record/replay of the external interactions of agent cycles.
+
+Every call that leaves the process goes through `recorded` (or
+`recorded_async`) with the name of its service and a key describing the
+request:
+- "coingecko"          MarketDataCache._http_get
+- "cryptopanic"        the CryptoPanic posts endpoint (see cryptopanic_feed.CryptoPanicFeed)
+- "telegram"           get_telegram_news (telethon returns live objects, so whole fetches are recorded)
+- "openai_embeddings"  rag_tool.embed_texts
+- "binance"            the exchange client (see exchange_backend.RecordedExchange)
+- "gemini"             model responses of every LlmAgent (see llm_recorder.LlmRecorderPlugin)
+
+Every call is also reported to the current tracing span (see tracing.py).
+Without an active cassette `recorded` just calls the function. With a
+cassette in "record" mode the response (or error) and the latency are
+appended to it; in "replay" mode the recorded response is served instead,
+after sleeping the recorded latency times `latency_scale`, so a whole cycle
+runs offline with realistic (or scaled) timings.
+
+Fixtures are gzipped JSON lines: a header followed by one entry per call
+with the service, a short hash of the key, an optional route (a coarser key
+such as the CoinGecko path), the latency and the response.
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from .tracing import record_outbound
+
+logger = logging.getLogger("root_agent")
+
+FIXTURE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode for a call that was not recorded."""
+
+
+class RecordedError(RuntimeError):
+    """A recorded call failure, raised again on replay."""
+
+
+def request_key(key) -> str:
+    """Short stable hash of a request description (any JSON-serialisable value)."""
+    canonical = json.dumps(key, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """Recorded external calls of one or more cycles.
+
+    In replay mode each call takes the next unused entry with the same service
+    and key; when all of them have been used the last one is served again. A
+    call whose key was never recorded falls back to the next entry with the
+    same route (requests whose parameters depend on the current time, such as
+    CoinGecko ranges, keep their route), and otherwise raises CassetteMiss.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0):
+        """
+        Args:
+            path (str): Fixture file (conventionally *.jsonl.gz).
+            mode (str, optional): "record" or "replay". Defaults to "replay".
+            latency_scale (float, optional): Multiplier of the recorded latencies
+                on replay; 0 serves responses immediately. Defaults to 1.0.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Available: {CASSETTE_MODES}")
+        self.path = str(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.entries = []
+        self.calls = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self._load()
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FIXTURE_VERSION:
+                raise ValueError(f"Unsupported fixture version {header.get('version')} in {self.path}")
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        self.rewind()
+
+    def rewind(self):
+        """Marks every entry unused again, so the recording can be replayed once more."""
+        with self._lock:
+            self._used = set()
+            self._by_key = defaultdict(list)
+            self._by_route = defaultdict(list)
+            for i, entry in enumerate(self.entries):
+                self._by_key[(entry["service"], entry["key"])].append(i)
+                if entry.get("route") is not None:
+                    self._by_route[(entry["service"], entry["route"])].append(i)
+
+    def _next(self, candidates: list):
+        # Caller must hold self._lock
+        for i in candidates:
+            if i not in self._used:
+                self._used.add(i)
+                return self.entries[i]
+        return self.entries[candidates[-1]] if candidates else None
+
+    def lookup(self, service: str, key, route: str | None = None) -> dict:
+        """The recorded entry to serve for a call (replay mode)."""
+        hashed = request_key(key)
+        with self._lock:
+            self.calls[service] += 1
+            entry = self._next(self._by_key.get((service, hashed), []))
+            if entry is None and route is not None:
+                entry = self._next(self._by_route.get((service, route), []))
+            if entry is None:
+                self.misses[service] += 1
+        if entry is None:
+            raise CassetteMiss(f"No recorded {service} call for {route or key!r} in {self.path}")
+        return entry
+
+    def add(self, service: str, key, route: str | None = None, latency: float = 0.0, response=None,
+            error: BaseException | None = None):
+        """Appends one call to the recording (record mode)."""
+        entry = {"service": service, "key": request_key(key), "latency": round(latency, 4)}
+        if route is not None:
+            entry["route"] = route
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        else:
+            entry["response"] = response
+        with self._lock:
+            self.calls[service] += 1
+            self.entries.append(entry)
+
+    def delay(self, entry: dict) -> float:
+        """Seconds to wait before serving a replayed entry."""
+        return max(entry.get("latency", 0.0) * self.latency_scale, 0.0)
+
+    @staticmethod
+    def result(entry: dict):
+        """The recorded response of an entry, or its error raised again."""
+        if "error" in entry:
+            raise RecordedError(entry["error"])
+        return entry.get("response")
+
+    def call(self, service: str, key, fn, route: str | None = None):
+        """Runs `fn()` (recording its outcome) or serves its recording, depending on the mode."""
+        if self.mode == "replay":
+            entry = self.lookup(service, key, route)
+            delay = self.delay(entry)
+            if delay:
+                time.sleep(delay)
+            return self.result(entry)
+
+        started = time.perf_counter()
+        try:
+            response = fn()
+        except Exception as e:
+            self.add(service, key, route, time.perf_counter() - started, error=e)
+            raise
+        self.add(service, key, route, time.perf_counter() - started, response)
+        return response
+
+    async def acall(self, service: str, key, fn, route: str | None = None):
+        """Async variant of `call`: `fn()` returns an awaitable."""
+        if self.mode == "replay":
+            entry = self.lookup(service, key, route)
+            delay = self.delay(entry)
+            if delay:
+                await asyncio.sleep(delay)
+            return self.result(entry)
+
+        started = time.perf_counter()
+        try:
+            response = await fn()
+        except Exception as e:
+            self.add(service, key, route, time.perf_counter() - started, error=e)
+            raise
+        self.add(service, key, route, time.perf_counter() - started, response)
+        return response
+
+    def save(self):
+        """Writes the recording to `path`."""
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": FIXTURE_VERSION, "recorded_at": time.time(), "calls": len(entries)}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        logger.info("Recorded %d external calls to %s", len(entries), self.path)
+
+    def stats(self) -> dict:
+        """Calls per service in this session, and replay misses."""
+        with self._lock:
+            return {"calls": dict(self.calls), "misses": dict(self.misses), "entries": len(self.entries)}
+
+
+_active_cassette = None
+
+
+def active_cassette() -> Cassette | None:
+    """The cassette external calls currently go through, if any."""
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(cassette: Cassette):
+    """Routes all recorded external calls through `cassette`; a recording is saved on exit."""
+    global _active_cassette
+    previous, _active_cassette = _active_cassette, cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = previous
+        if cassette.mode == "record":
+            cassette.save()
+
+
+def recorded(service: str, key, fn, route: str | None = None):
+    """Calls `fn()` through the active cassette, or directly when there is none.
+
+    Args:
+        service (str): Name of the external service (e.g. "coingecko").
+        key: JSON-serialisable description of the request; must not contain secrets.
+        fn: Performs the call and returns a JSON-serialisable response.
+        route (str, optional): Coarser key used on replay when `key` was not recorded.
+    """
+    cassette = _active_cassette
+    try:
+        response = fn() if cassette is None else cassette.call(service, key, fn, route)
+    except Exception as e:
+        record_outbound(service, error=e)
+        raise
+    record_outbound(service, response)
+    return response
+
+
+async def recorded_async(service: str, key, fn, route: str | None = None):
+    """Async variant of `recorded`: `fn()` returns an awaitable."""
+    cassette = _active_cassette
+    try:
+        response = await (fn() if cassette is None else cassette.acall(service, key, fn, route))
+    except Exception as e:
+        record_outbound(service, error=e)
+        raise
+    record_outbound(service, response)
+    return response
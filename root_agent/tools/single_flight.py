@@ -0,0 +1,29 @@
+import threading
+
+
+class Flight:
+    """A single in-progress fetch that concurrent callers can wait on.
+
+    The caller that starts a fetch registers a Flight under the fetch's key and
+    resolves it when done; callers asking for the same key meanwhile `wait()`
+    on it instead of sending their own request.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def resolve(self, value=None, error=None):
+        """Publishes the fetch's result (or its exception) to every waiter."""
+        self.value = value
+        self.error = error
+        self.done.set()
+
+    def wait(self, timeout=None):
+        """Returns the fetch's result, raising its exception, or TimeoutError after `timeout` seconds."""
+        if not self.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for an in-flight request")
+        if self.error is not None:
+            raise self.error
+        return self.value
@@ -0,0 +1,353 @@
+"""Per-tool tracing spans and outbound-call accounting.
+
+Tool functions are wrapped with `@traced`; AgentTool invocations get their
+spans from tracing_plugin.TracingPlugin. Spans nest through a context
+variable, so a tool called by another tool (e.g. validate_policy inside
+submit_trade) or inside an AgentTool becomes its child, and all spans of one
+agent cycle share a trace id.
+
+Every external call goes through root_agent.tools.recorder, which reports it
+here: the call, its service and whether it failed are added to the current
+span and its ancestors, so a span's counts include those of the tools it
+called. The size of the response (the JSON payload) is only measured while an
+export is configured (TRACING_EXPORT_DIR), since it costs a serialisation.
+
+Tools that fan out to a thread pool submit their tasks with
+`submit_in_context`, so the tasks run in the caller's span.
+
+Finished spans are kept in memory (the latest MAX_FINISHED_SPANS) and
+aggregated into per-tool metrics. `export_traces` appends them to an
+OpenTelemetry (OTLP/JSON lines) file and drops them from memory, and writes
+the metrics as a Prometheus text file; set TRACING_EXPORT_DIR to export after
+every agent cycle.
+"""
+from bisect import bisect_left
+from collections import Counter, deque
+import contextvars
+from dataclasses import dataclass, field
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger("root_agent")
+
+MAX_FINISHED_SPANS = 10_000
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+OTLP_FILE_NAME = "spans.otlp.jsonl"
+PROMETHEUS_FILE_NAME = "tool_metrics.prom"
+SERVICE_NAME = "root_agent"
+
+
+@dataclass
+class Span:
+    """One timed tool or AgentTool invocation."""
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent: "Span | None" = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    error: str | None = None
+    http_requests: int = 0
+    http_errors: int = 0
+    bytes_received: int = 0
+    outbound: Counter = field(default_factory=Counter)
+
+    @property
+    def duration_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    @property
+    def status(self) -> str:
+        return "error" if self.error is not None else "ok"
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+_current_trace_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_trace_id", default=None)
+
+
+def _new_id(bits: int) -> str:
+    # Trace ids need uniqueness, not secrecy; getrandbits avoids a syscall per span
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def current_span() -> Span | None:
+    """The innermost span open in the current context."""
+    return _current_span.get()
+
+
+def _payload_bytes(response) -> int:
+    if response is None:
+        return 0
+    if isinstance(response, (bytes, str)):
+        return len(response)
+    return len(json.dumps(response, separators=(",", ":"), default=str))
+
+
+class Tracer:
+    """Collects finished spans and per-tool metrics (thread-safe)."""
+
+    def __init__(self, max_spans: int = MAX_FINISHED_SPANS, measure_payloads: bool | None = None):
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max_spans)
+        self._metrics = {}
+        # None: measure response sizes only while TRACING_EXPORT_DIR is set
+        self.measure_payloads = measure_payloads
+
+    def _measuring_payloads(self) -> bool:
+        if self.measure_payloads is None:
+            return bool(os.getenv("TRACING_EXPORT_DIR"))
+        return self.measure_payloads
+
+    def start_trace(self) -> str:
+        """Starts a new trace in the current context (e.g. one per agent cycle) and returns its id."""
+        trace_id = _new_id(128)
+        _current_trace_id.set(trace_id)
+        return trace_id
+
+    def start_span(self, name: str, kind: str = "tool") -> Span:
+        """Starts a span, child of the current one, and makes it current. Close it with `end_span`."""
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id = parent.trace_id
+        else:
+            trace_id = _current_trace_id.get() or _new_id(128)
+        span = Span(name=name, kind=kind, trace_id=trace_id, span_id=_new_id(64), parent=parent)
+        _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, error: BaseException | None = None):
+        """Finishes `span`, makes its parent current again and adds it to the metrics."""
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        _current_span.set(span.parent)
+        with self._lock:
+            self._spans.append(span)
+            metrics = self._metrics.get((span.name, span.kind))
+            if metrics is None:
+                metrics = self._metrics[(span.name, span.kind)] = {
+                    "calls": Counter(), "seconds": 0.0, "buckets": [0] * len(DURATION_BUCKETS),
+                    "http_requests": Counter(), "http_errors": 0, "bytes_received": 0,
+                }
+            duration = span.duration_seconds
+            metrics["calls"][span.status] += 1
+            metrics["seconds"] += duration
+            # Cumulative buckets: the first one the duration fits in, and every larger one
+            buckets = metrics["buckets"]
+            for i in range(bisect_left(DURATION_BUCKETS, duration), len(buckets)):
+                buckets[i] += 1
+            if span.http_requests:
+                metrics["http_requests"].update(span.outbound)
+                metrics["http_errors"] += span.http_errors
+                metrics["bytes_received"] += span.bytes_received
+
+    def record_outbound(self, service: str, response=None, error: BaseException | None = None):
+        """Adds one external call to the current span and its ancestors (no-op outside a span)."""
+        span = _current_span.get()
+        if span is None:
+            return
+        size = _payload_bytes(response) if error is None and self._measuring_payloads() else 0
+        with self._lock:
+            while span is not None:
+                span.http_requests += 1
+                span.outbound[service] += 1
+                span.bytes_received += size
+                if error is not None:
+                    span.http_errors += 1
+                span = span.parent
+
+    def finished_spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def drain_spans(self) -> list[Span]:
+        """Returns the finished spans and drops them from memory (the metrics are kept)."""
+        with self._lock:
+            spans = list(self._spans)
+            self._spans.clear()
+        return spans
+
+    def clear(self):
+        """Drops the finished spans and the metrics."""
+        with self._lock:
+            self._spans.clear()
+            self._metrics.clear()
+
+    def to_otlp_json(self, spans: list[Span] | None = None) -> dict:
+        """`spans` (by default the finished spans) as an OTLP/JSON ExportTraceServiceRequest."""
+        otlp_spans = []
+        for span in self.finished_spans() if spans is None else spans:
+            attributes = [
+                _attribute("tool.kind", span.kind),
+                _attribute("outbound.requests", span.http_requests),
+                _attribute("outbound.errors", span.http_errors),
+                _attribute("outbound.bytes_received", span.bytes_received),
+            ]
+            attributes += [_attribute(f"outbound.requests.{service}", count) for service, count in span.outbound.items()]
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": attributes,
+                "status": {"code": 2, "message": span.error} if span.error is not None else {"code": 1},
+            }
+            if span.parent is not None:
+                otlp_span["parentSpanId"] = span.parent.span_id
+            otlp_spans.append(otlp_span)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+        }]}
+
+    def to_prometheus(self) -> str:
+        """Per-tool metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = {key: {**value, "calls": Counter(value["calls"]), "http_requests": Counter(value["http_requests"]),
+                             "buckets": list(value["buckets"])} for key, value in self._metrics.items()}
+        lines = [
+            "# HELP root_agent_tool_calls_total Tool and AgentTool invocations by status.",
+            "# TYPE root_agent_tool_calls_total counter",
+        ]
+        for (name, kind), m in sorted(metrics.items()):
+            for status, count in sorted(m["calls"].items()):
+                lines.append(f'root_agent_tool_calls_total{{tool="{name}",kind="{kind}",status="{status}"}} {count}')
+        lines += [
+            "# HELP root_agent_tool_duration_seconds Wall time of tool and AgentTool invocations.",
+            "# TYPE root_agent_tool_duration_seconds histogram",
+        ]
+        for (name, kind), m in sorted(metrics.items()):
+            labels = f'tool="{name}",kind="{kind}"'
+            for bound, count in zip(DURATION_BUCKETS, m["buckets"]):
+                lines.append(f'root_agent_tool_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            total = sum(m["calls"].values())
+            lines.append(f'root_agent_tool_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"root_agent_tool_duration_seconds_sum{{{labels}}} {m['seconds']:.6f}")
+            lines.append(f"root_agent_tool_duration_seconds_count{{{labels}}} {total}")
+        lines += [
+            "# HELP root_agent_tool_http_requests_total External calls made by a tool (including its sub-tools).",
+            "# TYPE root_agent_tool_http_requests_total counter",
+        ]
+        for (name, kind), m in sorted(metrics.items()):
+            for service, count in sorted(m["http_requests"].items()):
+                lines.append(f'root_agent_tool_http_requests_total{{tool="{name}",kind="{kind}",service="{service}"}} {count}')
+        lines += [
+            "# HELP root_agent_tool_http_errors_total Failed external calls made by a tool.",
+            "# TYPE root_agent_tool_http_errors_total counter",
+        ]
+        for (name, kind), m in sorted(metrics.items()):
+            lines.append(f'root_agent_tool_http_errors_total{{tool="{name}",kind="{kind}"}} {m["http_errors"]}')
+        lines += [
+            "# HELP root_agent_tool_response_bytes_total Response payload bytes received by a tool.",
+            "# TYPE root_agent_tool_response_bytes_total counter",
+        ]
+        for (name, kind), m in sorted(metrics.items()):
+            lines.append(f'root_agent_tool_response_bytes_total{{tool="{name}",kind="{kind}"}} {m["bytes_received"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+tracer = Tracer()
+
+
+def traced(func=None, *, name: str | None = None, kind: str = "tool"):
+    """Decorator recording a span for every call of a (sync or async) tool function.
+
+    The signature and docstring are kept, so ADK builds the same tool declaration.
+    """
+    if func is None:
+        return functools.partial(traced, name=name, kind=kind)
+    span_name = name or func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            span = tracer.start_span(span_name, kind)
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as e:
+                tracer.end_span(span, e)
+                raise
+            tracer.end_span(span)
+            return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        span = tracer.start_span(span_name, kind)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            tracer.end_span(span, e)
+            raise
+        tracer.end_span(span)
+        return result
+    return wrapper
+
+
+def record_outbound(service: str, response=None, error: BaseException | None = None):
+    """Reports one external call of the current span (see Tracer.record_outbound)."""
+    tracer.record_outbound(service, response, error)
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """Submits `fn(*args, **kwargs)` to `executor`, run in a copy of the current context.
+
+    Pool threads do not inherit context variables, so a task submitted directly
+    runs outside the caller's span and its external calls are not counted.
+    Every executor submit of a tool goes through this helper.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _write_atomically(path: str, text: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def export_traces(directory: str | None = None, spans: list[Span] | None = None) -> dict | None:
+    """Appends the spans (OTLP/JSON) and writes the per-tool metrics (Prometheus text) to `directory`.
+
+    Args:
+        directory (str, optional): Output directory. Defaults to TRACING_EXPORT_DIR;
+            nothing is written when neither is set.
+        spans (list[Span], optional): Spans to export. Defaults to the finished
+            spans, which are then dropped from memory.
+
+    Returns:
+        dict | None: Paths of the written files.
+    """
+    directory = directory or os.getenv("TRACING_EXPORT_DIR")
+    if not directory:
+        return None
+    if spans is None:
+        spans = tracer.drain_spans()
+    os.makedirs(directory, exist_ok=True)
+    paths = {"otlp": os.path.join(directory, OTLP_FILE_NAME),
+             "prometheus": os.path.join(directory, PROMETHEUS_FILE_NAME)}
+    if spans:
+        # One ExportTraceServiceRequest per line, as the OpenTelemetry collector's file exporter writes them
+        with open(paths["otlp"], "a", encoding="utf-8") as f:
+            f.write(json.dumps(tracer.to_otlp_json(spans)) + "\n")
+    # Prometheus' textfile collector may read at any time, so the metrics file is replaced atomically
+    _write_atomically(paths["prometheus"], tracer.to_prometheus())
+    logger.info("Exported tool traces to %s", directory)
+    return paths
@@ -0,0 +1,52 @@
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.adk.plugins.base_plugin import BasePlugin
+
+from .tracing import current_span, export_traces, tracer
+
+
+class TracingPlugin(BasePlugin):
+    """Adds AgentTool spans to the tool tracing of root_agent.tools.tracing.
+
+    Function tools trace themselves (`@traced`); this plugin opens a span for
+    every AgentTool invocation, so the tools of the called agent nest under it.
+    The outermost run of a cycle starts a new trace and, when it finishes, flushes
+    the cycle's spans: they are exported with the metrics when TRACING_EXPORT_DIR
+    is set, and dropped from memory either way.
+    """
+
+    def __init__(self, name: str = "tool_tracing"):
+        super().__init__(name=name)
+        self._spans = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # AgentTools start nested runs, which stay in the trace of their caller
+        if current_span() is None:
+            tracer.start_trace()
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        if current_span() is None:
+            export_traces(spans=tracer.drain_spans())
+        return None
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext) -> dict | None:
+        if isinstance(tool, AgentTool):
+            self._spans[tool_context.function_call_id] = tracer.start_span(tool.name, kind="agent_tool")
+        return None
+
+    async def after_tool_callback(self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext,
+                                  result: dict) -> dict | None:
+        span = self._spans.pop(tool_context.function_call_id, None)
+        if span is not None:
+            tracer.end_span(span)
+        return None
+
+    async def on_tool_error_callback(self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext,
+                                     error: Exception) -> dict | None:
+        span = self._spans.pop(tool_context.function_call_id, None)
+        if span is not None:
+            tracer.end_span(span, error)
+        return None
@@ -0,0 +1,91 @@
+import json
+import logging
+
+from .trade_request_formatter import format_trade_request
+from ..sub_agents.policy_enforcer.tools.policy_validator import validate_policy
+from ..sub_agents.trader.tools.trade import log_policy_rejection, process_trade_request
+from .tracing import traced
+
+logger = logging.getLogger("root_agent")
+
+@traced
+def submit_trade(action: str, coin_id: str, coin_market_cap: float, symbol: str, quantity: float, entry_price: float, stop_price: float, order_type: str, currency: str = "usd", rationale: str = "", volatility_1d: float = 0.0) -> dict:
+    """
+    Formats, validates and executes a trade decision in one deterministic step.
+
+    Runs format_trade_request -> validate_policy -> process_trade_request, or
+    log_policy_rejection when the policy rejects the request, without going
+    through the policy_enforcer and trader agents.
+
+    Parameters:
+        action: "buy", "sell", or "hold"
+        coin_id: CoinGecko coin ID (e.g., "bitcoin")
+        coin_market_cap: Current market capitalization of the coin in USD
+        symbol: Coin symbol (e.g., "btc")
+        quantity: Amount of the coin to trade
+        entry_price: Price at which to enter the trade
+        stop_price: Price at which to set the stop loss
+        order_type: "market", "limit", "stop_loss", "take_profit"
+        currency: Currency for the trade (default "usd")
+        rationale: Explanation for the trade decision
+        volatility_1d: 1-day range volatility in percent (e.g. 4.2); the policy check prefers its own cached estimate
+
+    Returns:
+        dict: {"status": "executed" | "hold_logged" | "rejected" | "error", "trade_request_id",
+        "reason", "policy", "execution", "trade_request"}, plus "log_error" when a rejection
+        could not be written to the trade log.
+    """
+
+    logger.info("Submitting trade: action=%s, symbol=%s", action, symbol)
+
+    try:
+        trade_request = json.loads(format_trade_request(
+            action, coin_id, coin_market_cap, symbol, quantity, entry_price, stop_price,
+            order_type, currency, rationale, volatility_1d,
+        ))
+    except Exception as e:
+        logger.exception("Could not format trade request for %s %s", action, symbol)
+        return {"status": "error", "reason": f"Trade request formatting error: {e}", "trade_request_id": None,
+                "policy": None, "execution": None, "trade_request": None}
+    result = {"trade_request_id": trade_request["id"], "trade_request": trade_request}
+
+    try:
+        policy_response = validate_policy(trade_request)
+    except Exception as e:
+        logger.exception("Policy validation failed for trade request %s", trade_request["id"])
+        policy_response = {"status": "rejected", "reason": f"Policy validation error: {e}"}
+    result["policy"] = policy_response
+
+    if policy_response.get("status") != "approved":
+        rejected = {
+            **result,
+            "status": "rejected",
+            "reason": policy_response.get("reason", "Policy violation"),
+            "execution": None,
+        }
+        try:
+            log_policy_rejection(trade_request, "", [], policy_response)
+        except Exception as e:
+            # The trade was still not placed; the rejection only misses its audit entry
+            logger.exception("Could not log the policy rejection of trade request %s", trade_request["id"])
+            rejected["log_error"] = str(e)
+        return rejected
+
+    try:
+        execution = process_trade_request(trade_request).get("execution") or {}
+    except Exception as e:
+        # e.g. the portfolio or the exchange account could not be loaded
+        logger.exception("Execution failed for trade request %s", trade_request["id"])
+        return {
+            **result,
+            "status": "error",
+            "reason": str(e),
+            "execution": None,
+        }
+    status = {"executed": "executed", "logged_hold": "hold_logged"}.get(execution.get("status"), "error")
+    return {
+        **result,
+        "status": status,
+        "reason": policy_response.get("reason"),
+        "execution": execution,
+    }
@@ -1,13 +1,15 @@
-from datetime import datetime, UTC
 import json
 import uuid
 import logging
 
 from ..sub_agents.trader.tools.portfolio_manager import load_portfolio
-from ..sub_agents.trader.tools.trade import get_trade_history 
+from ..sub_agents.trader.tools.trade import get_trade_journal
+from ..sub_agents.trader.tools.trade_journal import utc_timestamp
+from .tracing import traced
 
 logger = logging.getLogger("root_agent")
 
+@traced
 def format_trade_request(action: str, coin_id: str, coin_market_cap: float, symbol: str, quantity: float, entry_price: float, stop_price: float, order_type: str, currency: str = "usd", rationale: str = "", volatility_1d: float = 0.0):
     """
     Creates a `TradeRequest` dict matching the required schema.
@@ -23,7 +25,7 @@ def format_trade_request(action: str, coin_id: str, coin_market_cap: float, symb
         order_type: "market", "limit", "stop_loss", "take_profit"
         currency: Currency for the trade (default "usd")
         rationale: Explanation for the trade decision
-        volatility_1d: 1-day annualized volatility (e.g. 50%)
+        volatility_1d: 1-day range volatility in percent (e.g. 4.2); the policy check prefers its own cached estimate
 
     Returns:
     - A JSON string representing the TradeRequest object.
@@ -36,13 +38,12 @@ def format_trade_request(action: str, coin_id: str, coin_market_cap: float, symb
 
     position_size_percent = (quantity * entry_price / float(full_portfolio_value_usd) * 100) if full_portfolio_value_usd else 0.0
 
-    # Get today's trade count
-    trade_history_data = get_trade_history(limit=1)  # We only need the count, so limit=1 is fine
-    today_trade_count = trade_history_data.get("today_trade_count", 0)
+    # Get today's trade count (per-day counter lookup in the trade journal)
+    today_trade_count = get_trade_journal().trade_count()
 
     trade = {
         "id": str(uuid.uuid4()),
-        "timestamp": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "timestamp": utc_timestamp(),
         "action": action.lower(),
         "asset": {
             "symbol": symbol.lower(),
@@ -0,0 +1,4 @@
+from .events import NewsItem, PriceTick, Trigger
+from .sources import CoinGeckoPriceSource, CryptoPanicNewsSource, ReplaySource, TelegramNewsSource
+from .triggers import NewsBurstTrigger, PriceMoveTrigger, VolatilitySpikeTrigger
+from .watcher import Watcher, run_agent_cycle
@@ -0,0 +1,69 @@
+"""Event-driven trigger mode.
+
+Usage (from the repository root):
+    python -m root_agent.watcher                              # live CoinGecko + CryptoPanic
+    python -m root_agent.watcher --telegram-channels bitcoin cointelegraph
+    python -m root_agent.watcher --replay events.jsonl --dry-run
+
+Instead of running the full root agent workflow on a schedule, the watcher
+polls cheap sources and only starts a cycle for an asset when a trigger fires:
+a price move above --price-move percent, a volatility spike, or a burst of
+news about a whitelisted asset. With --dry-run, triggers are only logged.
+"""
+import argparse
+import logging
+import os
+
+from .sources import CoinGeckoPriceSource, CryptoPanicNewsSource, ReplaySource, TelegramNewsSource
+from .triggers import NewsBurstTrigger, PriceMoveTrigger, VolatilitySpikeTrigger
+from .watcher import WATCHER_COOLDOWN_SECONDS, Watcher, run_agent_cycle
+from ..sub_agents.policy_enforcer.tools.policy_loading import get_compiled_policy
+from ..sub_agents.trader.tools.portfolio_manager import ALLOWED_ASSETS
+
+logger = logging.getLogger("root_agent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replay", help="JSON-lines file of recorded events to replay instead of live sources")
+    parser.add_argument("--telegram-channels", nargs="*", default=[], help="Telegram channels to watch for news")
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    parser.add_argument("--max-polls", type=int, default=None)
+    parser.add_argument("--price-move", type=float, default=3.0, help="Price move trigger threshold in percent")
+    parser.add_argument("--price-window", type=float, default=3600, help="Price move window in seconds")
+    parser.add_argument("--volatility-ratio", type=float, default=2.5)
+    parser.add_argument("--news-burst", type=int, default=3, help="News items within --news-window that trigger")
+    parser.add_argument("--news-window", type=float, default=1800)
+    parser.add_argument("--cooldown", type=float, default=WATCHER_COOLDOWN_SECONDS)
+    parser.add_argument("--dry-run", action="store_true", help="Log triggers without running agent cycles")
+    args = parser.parse_args()
+
+    policy = get_compiled_policy(os.getenv("TRADING_STRATEGY", "aggressive"))
+    whitelist = sorted(policy.whitelist)
+    assets = {symbol: ALLOWED_ASSETS[symbol] for symbol in whitelist if symbol in ALLOWED_ASSETS}
+
+    if args.replay:
+        sources = [ReplaySource.from_jsonl(args.replay, batch_size=100)]
+        poll_interval = 0.0
+    else:
+        sources = [CoinGeckoPriceSource(assets), CryptoPanicNewsSource(assets)]
+        if args.telegram_channels:
+            sources.append(TelegramNewsSource(args.telegram_channels, assets))
+        poll_interval = args.poll_interval
+
+    triggers = [
+        PriceMoveTrigger(args.price_move, args.price_window),
+        VolatilitySpikeTrigger(args.volatility_ratio),
+        NewsBurstTrigger(whitelist, args.news_burst, args.news_window),
+    ]
+    on_trigger = (lambda trigger: None) if args.dry_run else run_agent_cycle
+
+    logger.info("Watching %s (policy '%s')", ", ".join(whitelist), policy.policy_type)
+    watcher = Watcher(sources, triggers, whitelist, on_trigger=on_trigger, cooldown_seconds=args.cooldown)
+    watcher.run(poll_interval=poll_interval, max_polls=args.max_polls)
+    for trigger in watcher.fired:
+        print(f"{trigger.timestamp:.0f} {trigger.asset} {trigger.kind}: {trigger.reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+import time
+
+
+@dataclass(frozen=True)
+class PriceTick:
+    """Latest price of one asset (upper-case symbol, e.g. "BTC")."""
+    asset: str
+    price: float
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class NewsItem:
+    """A news post or channel message mentioning one or more assets."""
+    id: str
+    source: str
+    title: str
+    assets: tuple[str, ...]
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class Trigger:
+    """A deterministic condition that warrants an agent cycle for `asset`."""
+    asset: str
+    kind: str
+    reason: str
+    value: float
+    threshold: float
+    timestamp: float
+
+
+def event_from_dict(data: dict):
+    """Builds a PriceTick or NewsItem from its JSON form (as written by `event_to_dict`)."""
+    if data.get("type") == "price":
+        return PriceTick(asset=data["asset"].upper(), price=float(data["price"]), timestamp=float(data["timestamp"]))
+    if data.get("type") == "news":
+        return NewsItem(
+            id=str(data["id"]),
+            source=data.get("source", "replay"),
+            title=data.get("title", ""),
+            assets=tuple(a.upper() for a in data.get("assets", [])),
+            timestamp=float(data["timestamp"]),
+        )
+    raise ValueError(f"Unknown event type: {data.get('type')!r}")
+
+
+def event_to_dict(event) -> dict:
+    if isinstance(event, PriceTick):
+        return {"type": "price", "asset": event.asset, "price": event.price, "timestamp": event.timestamp}
+    return {
+        "type": "news",
+        "id": event.id,
+        "source": event.source,
+        "title": event.title,
+        "assets": list(event.assets),
+        "timestamp": event.timestamp,
+    }
@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import json
+import logging
+import re
+import time
+
+from .events import NewsItem, PriceTick, event_from_dict
+from .watcher import run_on_watcher_loop
+
+logger = logging.getLogger("root_agent")
+
+
+def asset_aliases(assets: dict) -> dict:
+    """Maps upper-case symbols to the lower-case words that identify them in text.
+
+    Args:
+        assets (dict): {symbol: coingecko_id}, e.g. {"BTC": "bitcoin"}.
+    """
+    return {symbol.upper(): {symbol.lower(), coin_id.lower()} for symbol, coin_id in assets.items()}
+
+
+def mentioned_assets(text: str, aliases: dict) -> tuple[str, ...]:
+    """Returns the symbols whose symbol or name appears as a word in `text`."""
+    words = set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+    return tuple(symbol for symbol, names in aliases.items() if words & names)
+
+
+class CoinGeckoPriceSource:
+    """Polls CoinGecko prices of the watched assets through the shared market data cache."""
+
+    def __init__(self, assets: dict, currency: str = "usd"):
+        """
+        Args:
+            assets (dict): {symbol: coingecko_id} of the assets to watch.
+            currency (str, optional): Quote currency. Defaults to "usd".
+        """
+        self.assets = {symbol.upper(): coin_id for symbol, coin_id in assets.items()}
+        self.currency = currency
+
+    def poll(self) -> list:
+        from ..tools.market_data_cache import get_cached_prices
+
+        try:
+            prices = get_cached_prices(list(self.assets.values()), self.currency, timeout=10)
+        except Exception as e:
+            logger.warning("Watcher price poll failed: %s", e)
+            return []
+        now = time.time()
+        ticks = []
+        for symbol, coin_id in self.assets.items():
+            price = prices.get(coin_id, {}).get(self.currency)
+            if price:
+                ticks.append(PriceTick(asset=symbol, price=float(price), timestamp=now))
+        return ticks
+
+
+class CryptoPanicNewsSource:
+    """Polls the CryptoPanic news feed and emits posts not seen before."""
+
+    seen_ids_limit = 10000
+
+    def __init__(self, assets: dict, fetch_posts=None):
+        """
+        Args:
+            assets (dict): {symbol: coingecko_id} used to detect which assets a post mentions.
+            fetch_posts (callable, optional): Returns the latest CryptoPanic posts (list of dicts).
+                Defaults to the latest posts of the shared CryptoPanic feed.
+        """
+        self.aliases = asset_aliases(assets)
+        self._fetch_posts = fetch_posts or self._fetch_latest_posts
+        self._seen = OrderedDict()  # ids of recent posts, oldest first
+
+    @staticmethod
+    def _fetch_latest_posts() -> list:
+        from ..tools.cryptopanic_feed import cryptopanic_feed
+
+        # Always refetched (the watcher wants new posts as soon as possible); the refresh also serves the agents
+        return cryptopanic_feed.posts(limit=20, max_age_seconds=0)
+
+    def _post_assets(self, post: dict) -> tuple[str, ...]:
+        from ..tools.cryptopanic_feed import post_currencies
+
+        codes = post_currencies(post)
+        text = f"{post.get('title', '')} {post.get('description', '')}"
+        return tuple(dict.fromkeys(codes + mentioned_assets(text, self.aliases)))
+
+    def poll(self) -> list:
+        try:
+            posts = self._fetch_posts()
+        except Exception as e:
+            logger.warning("Watcher CryptoPanic poll failed: %s", e)
+            return []
+        items = []
+        for post in posts:
+            post_id = str(post.get("id") or post.get("slug") or post.get("title"))
+            if post_id in self._seen:
+                continue
+            self._seen[post_id] = None
+            if len(self._seen) > self.seen_ids_limit:
+                self._seen.popitem(last=False)
+            try:
+                timestamp = datetime.fromisoformat(post["published_at"].replace("Z", "+00:00")).timestamp()
+            except (KeyError, AttributeError, TypeError, ValueError):
+                timestamp = time.time()
+            items.append(NewsItem(
+                id=post_id,
+                source="cryptopanic",
+                title=post.get("title", ""),
+                assets=self._post_assets(post),
+                timestamp=timestamp,
+            ))
+        return items
+
+
+class TelegramNewsSource:
+    """Syncs Telegram channels into the local message store and emits new messages."""
+
+    def __init__(self, channels: list, assets: dict, limit: int = 20):
+        self.channels = channels
+        self.aliases = asset_aliases(assets)
+        self.limit = limit
+        self._last_seen = {}
+
+    async def _sync(self):
+        from ..sub_agents.business_analyst_2.tools.get_telegram_news import get_channel_news, get_telegram_client
+
+        client = get_telegram_client()
+        if not client.is_connected():
+            await client.connect()
+        await asyncio.gather(*(get_channel_news(channel, client, limit=self.limit) for channel in self.channels))
+
+    def poll(self) -> list:
+        from ..sub_agents.business_analyst_2.tools.get_telegram_news import get_message_store
+
+        try:
+            # The shared Telegram client stays connected to the watcher's loop between polls
+            run_on_watcher_loop(self._sync())
+        except Exception as e:
+            logger.warning("Watcher Telegram poll failed: %s", e)
+        store = get_message_store()
+        items = []
+        for channel in self.channels:
+            messages = store.latest(channel, self.limit)
+            last_seen = self._last_seen.get(channel, 0)
+            for message in messages:
+                if message["id"] <= last_seen:
+                    continue
+                try:
+                    timestamp = datetime.fromisoformat(message["date"]).timestamp()
+                except (TypeError, ValueError):
+                    timestamp = time.time()
+                items.append(NewsItem(
+                    id=f"{channel}/{message['id']}",
+                    source="telegram",
+                    title=(message["message"] or "")[:200],
+                    assets=mentioned_assets(message["message"], self.aliases),
+                    timestamp=timestamp,
+                ))
+            if messages:
+                self._last_seen[channel] = max(last_seen, messages[0]["id"])
+        return items
+
+
+class ReplaySource:
+    """Local stand-in for the live sources: emits prepared events in order.
+
+    Each poll returns the next `batch_size` events; `exhausted` turns True once
+    everything has been emitted.
+    """
+
+    def __init__(self, events, batch_size: int = 1):
+        self._events = list(events)
+        self._position = 0
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_jsonl(cls, path, batch_size: int = 1) -> "ReplaySource":
+        """Loads events from a JSON-lines file of {"type": "price" | "news", ...} objects."""
+        with open(path, "r", encoding="utf-8") as f:
+            events = [event_from_dict(json.loads(line)) for line in f if line.strip()]
+        return cls(sorted(events, key=lambda event: event.timestamp), batch_size)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._position >= len(self._events)
+
+    def poll(self) -> list:
+        batch = self._events[self._position:self._position + self.batch_size]
+        self._position += len(batch)
+        return batch
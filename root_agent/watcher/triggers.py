@@ -0,0 +1,127 @@
+from collections import OrderedDict, defaultdict, deque
+import math
+
+from .events import NewsItem, PriceTick, Trigger
+
+
+class PriceMoveTrigger:
+    """Fires when an asset's price moved more than `threshold_percent` within `window_seconds`."""
+
+    kind = "price_move"
+
+    def __init__(self, threshold_percent: float = 3.0, window_seconds: float = 3600):
+        self.threshold_percent = threshold_percent
+        self.window_seconds = window_seconds
+        self._prices = defaultdict(deque)  # asset -> deque[(timestamp, price)]
+
+    def observe(self, event) -> list[Trigger]:
+        if not isinstance(event, PriceTick) or event.price <= 0:
+            return []
+        prices = self._prices[event.asset]
+        prices.append((event.timestamp, event.price))
+        while prices and prices[0][0] < event.timestamp - self.window_seconds:
+            prices.popleft()
+
+        reference = prices[0][1]
+        move_percent = (event.price / reference - 1.0) * 100
+        if abs(move_percent) <= self.threshold_percent:
+            return []
+        return [Trigger(
+            asset=event.asset,
+            kind=self.kind,
+            reason=f"{event.asset} moved {move_percent:+.2f}% in the last {self.window_seconds / 60:.0f} min",
+            value=move_percent,
+            threshold=self.threshold_percent,
+            timestamp=event.timestamp,
+        )]
+
+
+class VolatilitySpikeTrigger:
+    """Fires when short-window return volatility exceeds `ratio` times the baseline.
+
+    Volatility is the standard deviation of log returns between consecutive ticks,
+    over the last `short_ticks` returns versus the last `baseline_ticks` returns.
+    """
+
+    kind = "volatility_spike"
+
+    def __init__(self, ratio: float = 2.5, short_ticks: int = 10, baseline_ticks: int = 120):
+        self.ratio = ratio
+        self.short_ticks = short_ticks
+        self.baseline_ticks = baseline_ticks
+        self._last_price = {}
+        self._returns = defaultdict(lambda: deque(maxlen=baseline_ticks))
+
+    @staticmethod
+    def _std(values) -> float:
+        mean = sum(values) / len(values)
+        return math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+
+    def observe(self, event) -> list[Trigger]:
+        if not isinstance(event, PriceTick) or event.price <= 0:
+            return []
+        last_price = self._last_price.get(event.asset)
+        self._last_price[event.asset] = event.price
+        if last_price is None:
+            return []
+
+        returns = self._returns[event.asset]
+        returns.append(math.log(event.price / last_price))
+        if len(returns) < max(self.short_ticks * 2, self.baseline_ticks // 2):
+            return []  # not enough history for a baseline
+
+        baseline = self._std(returns)
+        recent = self._std(list(returns)[-self.short_ticks:])
+        if baseline == 0 or recent / baseline <= self.ratio:
+            return []
+        return [Trigger(
+            asset=event.asset,
+            kind=self.kind,
+            reason=f"{event.asset} short-term volatility is {recent / baseline:.1f}x its baseline",
+            value=recent / baseline,
+            threshold=self.ratio,
+            timestamp=event.timestamp,
+        )]
+
+
+class NewsBurstTrigger:
+    """Fires when at least `min_posts` distinct news items mention an asset within `window_seconds`.
+
+    Only assets in `whitelist` (upper-case symbols) are considered.
+    """
+
+    kind = "news_burst"
+    seen_ids_limit = 10000
+
+    def __init__(self, whitelist, min_posts: int = 3, window_seconds: float = 1800):
+        self.whitelist = frozenset(a.upper() for a in whitelist)
+        self.min_posts = min_posts
+        self.window_seconds = window_seconds
+        self._posts = defaultdict(deque)  # asset -> deque[(timestamp, id)]
+        self._seen = OrderedDict()  # (source, id) of recent items, oldest first
+
+    def observe(self, event) -> list[Trigger]:
+        if not isinstance(event, NewsItem) or (event.source, event.id) in self._seen:
+            return []
+        self._seen[(event.source, event.id)] = None
+        if len(self._seen) > self.seen_ids_limit:
+            self._seen.popitem(last=False)
+
+        fired = []
+        for asset in event.assets:
+            if asset not in self.whitelist:
+                continue
+            posts = self._posts[asset]
+            posts.append((event.timestamp, event.id))
+            while posts and posts[0][0] < event.timestamp - self.window_seconds:
+                posts.popleft()
+            if len(posts) >= self.min_posts:
+                fired.append(Trigger(
+                    asset=asset,
+                    kind=self.kind,
+                    reason=f"{len(posts)} news items about {asset} in the last {self.window_seconds / 60:.0f} min",
+                    value=len(posts),
+                    threshold=self.min_posts,
+                    timestamp=event.timestamp,
+                ))
+        return fired
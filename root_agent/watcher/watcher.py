@@ -0,0 +1,171 @@
+from collections import deque
+from dataclasses import asdict
+import asyncio
+import logging
+import threading
+import time
+
+from .events import Trigger
+
+logger = logging.getLogger("root_agent")
+
+WATCHER_COOLDOWN_SECONDS = 1800
+# Fired triggers kept in `Watcher.fired`
+WATCHER_MAX_FIRED = 1000
+
+
+class _LoopThread:
+    """One event loop, running in a daemon thread, for every coroutine the watcher runs.
+
+    Asyncio clients shared across polls and cycles, such as the Telethon client,
+    are bound to the loop they were connected on; a fresh `asyncio.run`
+    per poll would leave them on a closed loop.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="watcher-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coroutine, timeout: float | None = None):
+        """Runs `coroutine` on the shared loop and returns its result (blocking the caller)."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result(timeout)
+
+
+_watcher_loop = _LoopThread()
+
+
+def run_on_watcher_loop(coroutine, timeout: float | None = None):
+    """Runs a coroutine on the watcher's persistent event loop and returns its result."""
+    return _watcher_loop.run(coroutine, timeout)
+
+
+def build_cycle_message(trigger: Trigger) -> str:
+    """The user message that starts a root agent cycle for a triggered asset."""
+    return (
+        f"Event trigger ({trigger.kind}): {trigger.reason}. "
+        f"Skip the broad market discovery of Phase 0 apart from load_policy: the asset to research is {trigger.asset}. "
+        f"Run the full workflow (Phases 1-4) for {trigger.asset} only."
+    )
+
+
+async def run_agent_cycle_async(trigger: Trigger, agent=None, plugins=None) -> str:
+    """Runs one root agent cycle for the triggered asset and returns its final text.
+
+    `plugins` (ADK runner plugins, e.g. the LLM recorder) apply to every agent of
+    the cycle, after those of the root_agent app (tool tracing, LLM usage) when `agent` is not given.
+    """
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    if agent is None:
+        from ..agent import app
+        agent = app.root_agent
+        plugins = [*app.plugins, *(plugins or [])]
+
+    runner = InMemoryRunner(agent=agent, app_name=agent.name, plugins=plugins)
+    session = await runner.session_service.create_session(
+        app_name=agent.name, user_id="watcher", state={"trigger": asdict(trigger)}
+    )
+    message = types.Content(role="user", parts=[types.Part(text=build_cycle_message(trigger))])
+
+    final_text = ""
+    async for event in runner.run_async(user_id="watcher", session_id=session.id, new_message=message):
+        if event.is_final_response() and event.content and event.content.parts:
+            final_text = "\n".join(part.text for part in event.content.parts if part.text)
+    await runner.close()
+    return final_text
+
+
+def run_agent_cycle(trigger: Trigger) -> str:
+    """Synchronous wrapper of `run_agent_cycle_async`, the watcher's default trigger handler."""
+    logger.info("Starting root agent cycle for %s: %s", trigger.asset, trigger.reason)
+    started = time.perf_counter()
+    report = run_on_watcher_loop(run_agent_cycle_async(trigger))
+    logger.info("Root agent cycle for %s finished in %.1fs", trigger.asset, time.perf_counter() - started)
+    return report
+
+
+class Watcher:
+    """Event loop that starts agent cycles only when a deterministic trigger fires.
+
+    Every poll collects events (price ticks, news items) from the sources and
+    feeds them to the triggers. Events for assets outside the whitelist are
+    dropped. A fired trigger calls `on_trigger` for its asset, after which that
+    asset is ignored for `cooldown_seconds` (measured in event time, so replays
+    behave exactly like live runs).
+    """
+
+    def __init__(self, sources, triggers, whitelist, on_trigger=run_agent_cycle,
+                 cooldown_seconds: float = WATCHER_COOLDOWN_SECONDS):
+        self.sources = list(sources)
+        self.triggers = list(triggers)
+        self.whitelist = frozenset(asset.upper() for asset in whitelist)
+        self.on_trigger = on_trigger
+        self.cooldown_seconds = cooldown_seconds
+        self._last_fired = {}  # asset -> event timestamp of the last started cycle
+        self.events_seen = 0
+        self.fired = deque(maxlen=WATCHER_MAX_FIRED)  # the latest fired triggers
+
+    def _relevant(self, event) -> bool:
+        assets = getattr(event, "assets", None)
+        if assets is None:
+            return event.asset in self.whitelist
+        return any(asset in self.whitelist for asset in assets)
+
+    def process(self, event) -> list[Trigger]:
+        """Feeds one event to the triggers and handles whatever fires."""
+        self.events_seen += 1
+        if not self._relevant(event):
+            return []
+
+        started = []
+        for trigger_rule in self.triggers:
+            for trigger in trigger_rule.observe(event):
+                if trigger.asset not in self.whitelist:
+                    continue
+                last_fired = self._last_fired.get(trigger.asset)
+                if last_fired is not None and trigger.timestamp - last_fired < self.cooldown_seconds:
+                    continue
+                self._last_fired[trigger.asset] = trigger.timestamp
+                logger.info("Watcher trigger %s for %s: %s", trigger.kind, trigger.asset, trigger.reason)
+                self.fired.append(trigger)
+                started.append(trigger)
+                try:
+                    self.on_trigger(trigger)
+                except Exception:
+                    logger.exception("Agent cycle for %s failed", trigger.asset)
+        return started
+
+    def poll_once(self) -> list[Trigger]:
+        """Polls every source once and processes the events in time order.
+
+        A failing source is logged and skipped; the events of the others are still processed.
+        """
+        events = []
+        for source in self.sources:
+            try:
+                events.extend(source.poll())
+            except Exception:
+                logger.exception("Watcher source %s failed", type(source).__name__)
+        events.sort(key=lambda event: event.timestamp)
+        return [trigger for event in events for trigger in self.process(event)]
+
+    def run(self, poll_interval: float = 30.0, max_polls: int | None = None):
+        """Polls until every source is exhausted (replays) or `max_polls` is reached."""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.poll_once()
+            polls += 1
+            if self.sources and all(getattr(source, "exhausted", False) for source in self.sources):
+                break
+            if poll_interval:
+                time.sleep(poll_interval)
+        logger.info("Watcher stopped after %d polls, %d events, %d triggers", polls, self.events_seen, len(self.fired))
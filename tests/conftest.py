@@ -0,0 +1,56 @@
+import pytest
+
+from root_agent.tools import ohlcv_store
+from root_agent.tools.lazy import LazyResource
+from root_agent.tools.market_data_cache import COINGECKO_ENDPOINT, market_data_cache
+
+
+class FakeCoinGecko:
+    """Stand-in for the shared CoinGecko session.
+
+    `responses` maps an API path (e.g. 'coins/bitcoin') to its JSON body, or to
+    an exception to raise. Market chart ranges are generated: 5-minute points
+    whose price is `chart_price(coin_id, t)`.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        self.chart_price = lambda coin_id, t: 100.0 + (t // 300) % 10
+
+    def get(self, url, params=None, timeout=None):
+        path = url[len(COINGECKO_ENDPOINT):].strip("/")
+        self.requests.append(path)
+        if path.endswith("/market_chart/range"):
+            coin_id = path.split("/")[1]
+            start, end = int(params["from"]), int(params["to"])
+            times = range(-(-start // 300) * 300, end + 1, 300)
+            body = {"prices": [[t * 1000, self.chart_price(coin_id, t)] for t in times]}
+        else:
+            body = self.responses[path]
+            if isinstance(body, Exception):
+                raise body
+        return FakeResponse(body)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def coingecko(monkeypatch, tmp_path):
+    """Routes the shared market-data cache to a FakeCoinGecko and the OHLCV store to a temporary directory."""
+    fake = FakeCoinGecko()
+    monkeypatch.setattr(market_data_cache, "session", fake)
+    monkeypatch.setattr(ohlcv_store, "_ohlcv_store",
+                        LazyResource(lambda: ohlcv_store.OHLCVStore(tmp_path / "ohlcv"), "test OHLCV store"))
+    market_data_cache.clear()
+    yield fake
+    market_data_cache.clear()
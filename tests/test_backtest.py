@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from root_agent.backtest.data import synthetic_history
+from root_agent.backtest.engine import Backtester
+from root_agent.backtest.strategies import Decision, sma_crossover
+from root_agent.sub_agents.trader.tools.simulated_exchange import SimulatedExchange, SimulatedExchangeError
+
+START = 1_767_225_600  # 2026-01-01T00:00:00Z
+
+
+def history():
+    return synthetic_history(["BTC", "ETH"], days=2, interval_seconds=300, start=START,
+                             start_prices={"BTC": 60000.0, "ETH": 3000.0}, seed=7)
+
+
+# Simulated exchange
+
+def test_market_order_fills_at_the_current_price_minus_commission():
+    exchange = SimulatedExchange({"USDT": 1000.0}, {"BTC": 50000.0}, fee_rate=0.001)
+
+    order = exchange.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+
+    assert order["status"] == "FILLED"
+    assert float(order["cummulativeQuoteQty"]) == pytest.approx(500.0)
+    assert exchange.holdings() == {"USDT": pytest.approx(500.0), "BTC": pytest.approx(0.01 * 0.999)}
+    assert order["fills"][0]["commissionAsset"] == "BTC"
+
+
+def test_resting_limit_order_locks_funds_until_crossed():
+    exchange = SimulatedExchange({"USDT": 1000.0}, {"BTC": 50000.0})
+    order = exchange.create_order(symbol="BTCUSDT", side="BUY", type="LIMIT", quantity=0.01, price=45000)
+
+    assert order["status"] == "NEW"
+    assert exchange.get_account()["balances"][0] == {"asset": "USDT", "free": "550.00000000", "locked": "450.00000000"}
+    assert exchange.set_prices({"BTC": 47000.0}, low={"BTC": 46000.0}) == []
+
+    filled = exchange.set_prices({"BTC": 46000.0}, low={"BTC": 44900.0})
+
+    assert [o["orderId"] for o in filled] == [order["orderId"]]
+    assert exchange.get_order(symbol="BTCUSDT", orderId=order["orderId"])["status"] == "FILLED"
+    assert exchange.trades[-1]["price"] == 45000
+    assert exchange.get_open_orders() == []
+
+
+def test_cancel_releases_locked_funds():
+    exchange = SimulatedExchange({"USDT": 0.0, "BTC": 1.0}, {"BTC": 50000.0})
+    order = exchange.create_order(symbol="BTCUSDT", side="SELL", type="STOP_LOSS", quantity=0.5, stopPrice=45000)
+
+    canceled = exchange.cancel_order(symbol="BTCUSDT", orderId=order["orderId"])
+
+    assert canceled["status"] == "CANCELED"
+    assert exchange.holdings()["BTC"] == 1.0
+    assert exchange.set_prices({"BTC": 40000.0}) == []
+
+
+@pytest.mark.parametrize("params, code", [
+    ({"type": "MARKET", "quantity": 1.0}, -2010),  # insufficient balance
+    ({"type": "STOP_LOSS", "quantity": 0.01, "stopPrice": 55000}, -2010),  # would trigger immediately
+    ({"type": "LIMIT", "quantity": 0.01}, -1102),  # no price
+    ({"type": "OCO", "quantity": 0.01}, -1116),
+    ({"type": "MARKET", "quantity": 0}, -1013),
+])
+def test_invalid_orders_are_rejected(params, code):
+    exchange = SimulatedExchange({"USDT": 1000.0, "BTC": 0.1}, {"BTC": 50000.0})
+    side = "SELL" if params["type"] == "STOP_LOSS" else "BUY"
+
+    with pytest.raises(SimulatedExchangeError) as error:
+        exchange.create_order(symbol="BTCUSDT", side=side, **params)
+
+    assert error.value.code == code
+    assert exchange.trades == []
+
+
+# Backtest
+
+def test_synthetic_history_is_deterministic():
+    first, second = history(), history()
+
+    assert np.array_equal(first.times, second.times)
+    assert np.array_equal(first.prices, second.prices)
+    assert first.times[0] == START and first.interval_seconds == 300
+
+
+def test_backtest_is_deterministic():
+    decisions = sma_crossover(history(), fast=6, slow=24, size=20.0)
+    assert decisions
+
+    first = Backtester(history(), decisions, policy_type="aggressive", equity_every=12).run()
+    second = Backtester(history(), decisions, policy_type="aggressive", equity_every=12).run()
+
+    assert first.decisions == len(decisions)
+    assert first.statuses.get("executed", 0) > 0
+    assert first.statuses == second.statuses
+    assert first.rejections_by_field == second.rejections_by_field
+    assert first.fills == second.fills
+    assert np.array_equal(first.equity_times, second.equity_times)
+    assert np.array_equal(first.equity, second.equity)
+    assert first.equity[0] == pytest.approx(10000.0)
+
+
+def test_backtest_skips_decisions_outside_the_history():
+    decisions = [
+        Decision(timestamp=START - 86400, symbol="BTC", action="buy"),
+        Decision(timestamp=START + 3600, symbol="DOGE", action="buy"),
+        Decision(timestamp=START + 3600, symbol="BTC", action="buy", size=10.0),
+    ]
+
+    result = Backtester(history(), decisions, policy_type="aggressive").run()
+
+    assert result.statuses == {"skipped": 2, "executed": 1}
+    assert result.decisions == 1
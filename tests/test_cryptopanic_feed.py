@@ -0,0 +1,211 @@
+from types import SimpleNamespace
+import threading
+import time
+
+import pytest
+
+from root_agent.sub_agents.business_analyst_1.tools import cryptopanic_news_tool
+from root_agent.sub_agents.business_analyst_1.tools.cryptopanic_news_tool import get_news_from_cryptopanic
+from root_agent.tools.cryptopanic_feed import CryptoPanicFeed, post_currencies, post_id
+from root_agent.tools.single_flight import Flight
+
+
+def post(i, *codes):
+    return {"id": i, "title": f"post {i}", "instruments": [{"code": code} for code in codes or ("BTC",)]}
+
+
+class FakeFeed(CryptoPanicFeed):
+    """Feed whose CryptoPanic pages are set by the test: pages[(filter, page)] -> posts (None = error)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = {}
+        self.requests = []
+        self.delay = 0.0
+
+    def _request(self, params, page):
+        self.requests.append((params.get("currencies"), params.get("filter"), page))
+        if self.delay:
+            time.sleep(self.delay)
+        results = self.pages[(params.get("filter"), page)]
+        if results is None:
+            raise ConnectionError("HTTP 503")
+        return {"results": results, "next": "more" if (params.get("filter"), page + 1) in self.pages else None}
+
+
+def ids(posts):
+    return [post["id"] for post in posts]
+
+
+def test_post_helpers():
+    assert post_id({"id": 7}) == "7"
+    assert post_id({"slug": "a-b"}) == "a-b"
+    assert post_currencies({"currencies": [{"code": "eth"}, {"title": "no code"}]}) == ("ETH",)
+
+
+def test_first_page_is_cached_until_the_ttl():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+
+    assert ids(feed.posts(limit=5)) == [0, 1, 2, 3, 4]
+    assert ids(feed.posts(limit=5)) == [0, 1, 2, 3, 4]
+    assert feed.requests == [(None, None, 1)]
+    assert feed.stats()["hits"] == 1
+
+    feed.posts(limit=5, max_age_seconds=0)
+    assert len(feed.requests) == 2
+
+
+def test_deeper_pages_are_fetched_only_when_needed():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+    feed.pages[(None, 2)] = [post(i) for i in range(18, 40)]  # overlaps page 1
+    feed.pages[(None, 3)] = [post(i) for i in range(40, 60)]
+
+    feed.posts(limit=20)
+    assert [request[2] for request in feed.requests] == [1]
+
+    posts = feed.posts(limit=35)
+
+    assert ids(posts) == list(range(35))
+    assert [request[2] for request in feed.requests] == [1, 2]
+    assert feed.stats()["duplicates"] == 2
+
+
+def test_pagination_restarts_on_refresh():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+    feed.posts(limit=30)
+    query = feed._queries[(None, None, "news")]
+    assert query.next_page is None  # CryptoPanic had no second page
+
+    feed.pages[(None, 1)] = [post(i) for i in range(100, 120)]
+    feed.pages[(None, 2)] = [post(i) for i in range(120, 140)]
+    posts = feed.posts(limit=30, max_age_seconds=0)
+
+    # Twenty new posts pushed the cached ones to later pages; page 2 is fetched again
+    assert ids(posts) == list(range(100, 130))
+    assert feed.requests[-2:] == [(None, None, 1), (None, None, 2)]
+
+
+def test_refresh_merges_new_posts_in_front():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(10, 20)]
+    feed.posts()
+
+    feed.pages[(None, 1)] = [post(i) for i in range(5, 15)]
+    assert ids(feed.posts(limit=15, max_age_seconds=0)) == list(range(5, 20))
+
+
+def test_consumers_are_not_sent_a_post_twice():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+
+    assert ids(feed.posts(limit=5, consumer="cycle-1:analyst")) == [0, 1, 2, 3, 4]
+    assert ids(feed.posts(limit=5, consumer="cycle-1:analyst")) == [5, 6, 7, 8, 9]
+    assert ids(feed.posts(limit=5, consumer="cycle-2:analyst")) == [0, 1, 2, 3, 4]
+    assert ids(feed.posts(limit=5)) == [0, 1, 2, 3, 4]
+
+
+def test_currency_query_is_served_from_the_global_view_with_the_same_filter():
+    feed = FakeFeed()
+    feed.pages[("hot", 1)] = [post(i, "BTC" if i % 2 else "ETH") for i in range(40)]
+    feed.posts(filter="hot", limit=40)
+
+    btc = feed.posts(currencies="btc", filter="hot", limit=10)
+
+    assert ids(btc) == list(range(1, 20, 2))
+    assert feed.stats()["global_view_hits"] == 1
+    assert len(feed.requests) == 1
+
+    # A different filter is a different ranking, so it is not served from the "hot" view
+    feed.pages[("rising", 1)] = [post(100)]
+    assert ids(feed.posts(currencies="btc", filter="rising", limit=1)) == [100]
+    assert feed.requests[-1] == ("BTC", "rising", 1)
+
+
+def test_concurrent_callers_share_one_request():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+    feed.delay = 0.1
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(ids(feed.posts(limit=3)))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [[0, 1, 2]] * 5
+    assert feed.requests == [(None, None, 1)]
+    assert feed.stats()["http_requests"] == 1
+
+
+def test_lock_is_not_held_during_requests():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = [post(1)]
+    entered = threading.Event()
+
+    def slow_request(params, page):
+        entered.set()
+        time.sleep(0.3)
+        return {"results": [post(2)], "next": None}
+
+    feed._request = slow_request
+    thread = threading.Thread(target=feed.posts)
+    thread.start()
+    entered.wait(5)
+    started = time.monotonic()
+    feed.stats()
+    assert time.monotonic() - started < 0.2
+    thread.join(5)
+
+
+def test_errors_propagate_without_cache_and_serve_stale_posts_otherwise():
+    feed = FakeFeed()
+    feed.pages[(None, 1)] = None
+    with pytest.raises(ConnectionError):
+        feed.posts()
+
+    feed.pages[(None, 1)] = [post(1)]
+    feed.posts()
+    feed.pages[(None, 1)] = None
+    assert ids(feed.posts(max_age_seconds=0)) == [1]
+    assert feed.stats()["errors"] == 2
+
+
+def test_window_keeps_at_most_max_posts():
+    feed = FakeFeed(max_posts=15)
+    feed.pages[(None, 1)] = [post(i) for i in range(20)]
+
+    assert len(feed.posts(limit=20)) == 15
+    assert feed.stats()["posts"] == 15
+
+
+def test_flight_shares_one_result_between_waiters():
+    flight = Flight()
+    with pytest.raises(TimeoutError):
+        flight.wait(0.01)
+
+    threading.Timer(0.05, flight.resolve, args=("posts",)).start()
+    assert flight.wait(5) == "posts"
+
+    failed = Flight()
+    failed.resolve(error=ConnectionError("HTTP 503"))
+    with pytest.raises(ConnectionError):
+        failed.wait(0)
+
+
+def test_news_tool_only_mentions_returned_posts_when_there_were_some(monkeypatch):
+    feed = FakeFeed()
+    feed.pages[("hot", 1)] = [post(i, "BTC") for i in range(3)]
+    feed.pages[("hot", 2)] = []
+    monkeypatch.setattr(cryptopanic_news_tool, "cryptopanic_feed", feed)
+    context = SimpleNamespace(invocation_id="cycle-1", agent_name="analyst")
+
+    assert "post 0" in get_news_from_cryptopanic("BTC", tool_context=context)
+    assert get_news_from_cryptopanic("BTC", tool_context=context) == (
+        "No news found for BTC besides the posts already returned in this conversation.")
+
+    feed.pages[("hot", 1)] = []  # CryptoPanic has nothing about SOL
+    assert get_news_from_cryptopanic("SOL", tool_context=context) == "No news found for SOL."
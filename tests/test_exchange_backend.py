@@ -0,0 +1,90 @@
+import pytest
+
+from root_agent.sub_agents.trader.tools import exchange_backend
+from root_agent.sub_agents.trader.tools.exchange_backend import (
+    RecordedExchange, create_exchange_client, register_exchange_backend,
+)
+from root_agent.sub_agents.trader.tools.simulated_exchange import SimulatedExchange, SimulatedExchangeError
+from root_agent.tools.recorder import Cassette, use_cassette
+
+
+def outcomes(seed):
+    exchange = SimulatedExchange({"USDT": 1e6}, {"BTC": 50000.0}, error_rate=0.3, lost_response_rate=0.3, seed=seed)
+    codes = []
+    for _ in range(40):
+        try:
+            exchange.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.001)
+            codes.append(0)
+        except SimulatedExchangeError as e:
+            codes.append(e.code)
+    return exchange, codes
+
+
+def test_injected_failures_are_reproducible_with_a_seed():
+    first, codes = outcomes(seed=3)
+    second, same_codes = outcomes(seed=3)
+
+    assert codes == same_codes
+    assert {-1001, -1007, 0} == set(codes)
+    assert first.injected_errors == second.injected_errors
+    assert first.calls["create_order"] == 40
+
+
+def test_lost_response_still_executes_the_order():
+    exchange, codes = outcomes(seed=3)
+
+    # -1001 never reaches the exchange, -1007 loses the response of an executed order
+    assert len(exchange.trades) == codes.count(0) + codes.count(-1007)
+    assert exchange.injected_errors["lost_response"] == codes.count(-1007)
+
+
+def test_simulated_backend_takes_overrides(monkeypatch):
+    monkeypatch.delenv("EXCHANGE_BACKEND", raising=False)
+
+    client = create_exchange_client("Simulated", balances={"USDT": 500.0}, prices={"ETH": 2500.0}, price_source=None)
+
+    assert isinstance(client, SimulatedExchange)
+    assert client.holdings() == {"USDT": 500.0}
+    assert client.price("ETH") == 2500.0
+
+
+def test_backend_is_selected_from_the_environment(monkeypatch):
+    monkeypatch.setitem(exchange_backend.EXCHANGE_BACKENDS, "paper", lambda **overrides: ("paper", overrides))
+    monkeypatch.setenv("EXCHANGE_BACKEND", "PAPER")
+
+    assert create_exchange_client(fee_rate=0.0) == ("paper", {"fee_rate": 0.0})
+
+
+def test_registered_backend_and_unknown_backend(monkeypatch):
+    monkeypatch.setattr(exchange_backend, "EXCHANGE_BACKENDS", dict(exchange_backend.EXCHANGE_BACKENDS))
+    register_exchange_backend("Mock", lambda: "mock client")
+
+    assert create_exchange_client("mock") == "mock client"
+    with pytest.raises(ValueError, match="Unknown exchange backend 'kraken'"):
+        create_exchange_client("kraken")
+
+
+def test_client_is_recorded_and_replayed_without_the_exchange(monkeypatch, tmp_path):
+    created = []
+
+    def factory(**overrides):
+        created.append(overrides)
+        return SimulatedExchange({"USDT": 1000.0}, {"BTC": 50000.0})
+
+    def unreachable(**overrides):
+        raise AssertionError("the exchange was contacted during replay")
+
+    path = str(tmp_path / "exchange.jsonl.gz")
+    monkeypatch.setitem(exchange_backend.EXCHANGE_BACKENDS, "recorded-test", factory)
+    with use_cassette(Cassette(path, mode="record")):
+        client = create_exchange_client("recorded-test")
+        assert isinstance(client, RecordedExchange) and created == []  # created on the first call only
+        order = client.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+
+    monkeypatch.setitem(exchange_backend.EXCHANGE_BACKENDS, "recorded-test", unreachable)
+    with use_cassette(Cassette(path, mode="replay", latency_scale=0)):
+        replayed = create_exchange_client("recorded-test").create_order(
+            symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+
+    assert len(created) == 1
+    assert replayed == order
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from root_agent.sub_agents.technical_analyst.tools import get_technical_indicators as tool
+from root_agent.sub_agents.technical_analyst.tools.indicators import (
+    IndicatorEngine, align_candles, atr, bollinger, ema, macd, pivot_levels, rsi, sma, to_candles,
+)
+
+HOUR = 3600
+
+
+def random_walk(coins=2, candles=200, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, (coins, candles)), axis=1))
+    high = close * (1 + rng.uniform(0, 0.01, close.shape))
+    low = close * (1 - rng.uniform(0, 0.01, close.shape))
+    return np.arange(candles, dtype=np.int64) * HOUR, high, low, close
+
+
+def test_to_candles_drops_the_forming_bucket():
+    prices = [[(t * 300) * 1000, price] for t, price in enumerate([10, 12, 9, 11, 13, 14, 15])]
+
+    candles = to_candles(prices, 900)
+
+    assert candles == {0: (10, 12, 9, 9), 900: (11, 14, 11, 14)}
+    assert to_candles([], 900) == {}
+
+
+def test_align_candles_keeps_common_buckets_in_coin_order():
+    times, open_, high, low, close = align_candles({
+        "bitcoin": {0: (1, 2, 0.5, 1.5), 3600: (1.5, 3, 1, 2)},
+        "ethereum": {3600: (10, 11, 9, 10.5), 7200: (10.5, 12, 10, 11)},
+    })
+
+    assert times.tolist() == [3600]
+    assert close.tolist() == [[2.0], [10.5]]
+    assert high.shape == (2, 1)
+
+
+def test_moving_averages():
+    x = np.arange(1, 31, dtype=float)
+
+    assert np.isnan(sma(x)[18]) and sma(x)[19] == pytest.approx(10.5)
+    assert sma(x)[-1] == pytest.approx(20.5)
+    assert np.all(ema(np.full(30, 7.0), 12)[11:] == 7.0)
+    assert np.isnan(ema(x, 12)[10]) and ema(x, 12)[11] == pytest.approx(6.5)
+    assert ema(x, 12)[12] == pytest.approx(2 / 13 * 13 + 11 / 13 * 6.5)
+
+
+def test_oscillators_and_bands():
+    rising = np.arange(1, 41, dtype=float)
+    flat = np.full(40, 5.0)
+
+    assert rsi(rising)[-1] == 100.0
+    assert rsi(flat)[-1] == 50.0
+    assert np.isnan(rsi(rising)[13]) and not np.isnan(rsi(rising)[14])  # 14 changes need 15 closes
+    line, signal, histogram = macd(flat)
+    assert line[-1] == 0.0 and signal[-1] == 0.0 and histogram[-1] == 0.0
+    middle, upper, lower = bollinger(flat)
+    assert (middle[-1], upper[-1], lower[-1]) == (5.0, 5.0, 5.0)
+    # Constant 2-wide candles without gaps: the true range is their width
+    assert atr(flat + 1, flat - 1, flat)[-1] == pytest.approx(2.0)
+
+
+def test_pivot_levels_around_the_last_close():
+    high = np.array([10, 11, 12, 15, 12, 11, 10, 9, 10, 11, 12.0])
+    low = high - 1
+    low[7] = 6.0
+    close = np.full_like(high, 11.0)
+
+    [levels] = pivot_levels(high, low, close)
+
+    assert levels == {"support": [6.0], "resistance": [15.0]}
+
+
+def test_incremental_updates_match_a_full_recompute():
+    times, high, low, close = random_walk()
+    engine = IndicatorEngine(["bitcoin", "ethereum"])
+    engine.seed(times[:150], high[:, :150], low[:, :150], close[:, :150])
+    for i in range(150, len(times)):
+        engine.update(times[i], high[:, i], low[:, i], close[:, i])
+
+    full = IndicatorEngine(["bitcoin", "ethereum"])
+    full.seed(times, high, low, close)
+
+    assert engine.last_time == full.last_time == times[-1]
+    incremental, recomputed = engine.snapshot(), full.snapshot()
+    for coin in ("bitcoin", "ethereum"):
+        for name, value in recomputed[coin].items():
+            assert incremental[coin][name] == pytest.approx(value, rel=1e-9), name
+    assert recomputed["bitcoin"]["rsi_14"] == pytest.approx(rsi(close)[0, -1])
+    assert recomputed["ethereum"]["atr_14"] == pytest.approx(atr(high, low, close)[1, -1])
+
+
+def test_updates_during_warm_up_reseed_from_the_window():
+    times, high, low, close = random_walk(coins=1, candles=40)
+    engine = IndicatorEngine(["bitcoin"])
+    engine.seed(times[:5], high[:, :5], low[:, :5], close[:, :5])
+    for i in range(5, 40):
+        engine.update(times[i], high[:, i], low[:, i], close[:, i])
+
+    assert engine.snapshot()["bitcoin"]["ema_26"] == pytest.approx(ema(close, 26)[0, -1])
+    assert engine.snapshot()["bitcoin"]["macd_signal"] == pytest.approx(macd(close)[1][0, -1])
+
+
+def test_engines_are_reused_and_bounded(coingecko, monkeypatch):
+    monkeypatch.setattr(tool, "_engines", OrderedDict())
+    monkeypatch.setattr(tool, "INDICATOR_ENGINES_LIMIT", 2)
+
+    first = tool.get_technical_indicators(["bitcoin"], days=1)
+    engine = tool._engines[(("bitcoin",), "usd", HOUR)]
+    assert tool.get_technical_indicators(["bitcoin"], days=1) == first
+    assert tool._engines[(("bitcoin",), "usd", HOUR)] is engine
+
+    tool.get_technical_indicators(["ethereum"], days=1)
+    tool.get_technical_indicators(["bitcoin"], days=1)  # most recently used again
+    tool.get_technical_indicators(["solana"], days=1)
+
+    assert list(tool._engines) == [(("bitcoin",), "usd", HOUR), (("solana",), "usd", HOUR)]
+    assert first["candle_interval"] == "1h" and first["indicators"]["bitcoin"]["close"] is not None
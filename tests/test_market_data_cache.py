@@ -0,0 +1,130 @@
+import threading
+import time
+
+from root_agent.tools.market_data_cache import MarketDataCache
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Counts GET requests and answers each with {"url", "n"}; `gate` holds requests until set."""
+
+    def __init__(self):
+        self.requests = []
+        self.gate = None
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self._lock:
+            self.requests.append((url, params))
+            return FakeResponse({"url": url, "n": len(self.requests)})
+
+
+def make_cache(ttls=None):
+    cache = MarketDataCache(ttls=ttls, base_url="https://coingecko.test")
+    cache.session = FakeSession()
+    return cache
+
+
+def test_fresh_entry_is_served_from_cache():
+    cache = make_cache()
+
+    first = cache.get("coins/bitcoin")
+    second = cache.get("/coins/bitcoin/")
+
+    assert first == second == {"url": "https://coingecko.test/coins/bitcoin", "n": 1}
+    assert len(cache.session.requests) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"], stats["http_requests"]) == (1, 1, 1)
+
+
+def test_different_params_are_cached_separately():
+    cache = make_cache()
+
+    cache.get("simple/price", {"ids": "bitcoin", "vs_currencies": "usd"})
+    cache.get("simple/price", {"ids": "ethereum", "vs_currencies": "usd"})
+    cache.get("simple/price", {"vs_currencies": "usd", "ids": "bitcoin"})
+
+    assert len(cache.session.requests) == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_stale_entry_is_served_while_refreshed_in_background():
+    # Never fresh, stale for a minute: every lookup is a stale hit
+    cache = make_cache(ttls={"coins": (0, 60)})
+    first = cache.get("coins/bitcoin")
+
+    stale = cache.get("coins/bitcoin")
+    assert stale == first
+    flight = cache._inflight.get(("coins/bitcoin", ()))
+    if flight is not None:
+        flight.wait(5)
+
+    assert cache.get("coins/bitcoin")["n"] == 2
+    stats = cache.stats()
+    assert stats["stale_hits"] == 2
+    assert stats["refreshes"] >= 1
+
+
+def test_expired_entry_is_fetched_again():
+    cache = make_cache(ttls={"coins": (0, 0)})
+
+    cache.get("coins/bitcoin")
+    assert cache.get("coins/bitcoin")["n"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_concurrent_misses_share_one_request():
+    cache = make_cache()
+    cache.session.gate = threading.Event()
+    results = []
+
+    def lookup():
+        results.append(cache.get("coins/ethereum"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    # Let every thread reach the cache before the single request is answered
+    while cache.stats()["misses"] + cache.stats()["coalesced"] < 4:
+        time.sleep(0.01)
+    cache.session.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(cache.session.requests) == 1
+    assert results == [results[0]] * 4
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"]) == (1, 3)
+
+
+def test_uncached_fetch_adds_no_entry():
+    cache = make_cache()
+
+    cache.fetch("coins/bitcoin/market_chart/range", {"from": 1, "to": 2})
+
+    assert len(cache.session.requests) == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_simple_prices_share_per_coin_entries():
+    cache = make_cache()
+    cache.session.get = lambda url, params=None, timeout=None: FakeResponse(
+        {coin_id: {"usd": 1.0} for coin_id in params["ids"].split(",")})
+
+    cache.get_simple_prices(["bitcoin", "ethereum"])
+    prices = cache.get_simple_prices(["ethereum"])
+
+    assert prices == {"ethereum": {"usd": 1.0}}
+    assert cache.stats()["http_requests"] == 1
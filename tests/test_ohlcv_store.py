@@ -0,0 +1,139 @@
+import threading
+import time
+
+import numpy as np
+
+from root_agent.tools.ohlcv_store import OHLCVStore, _merge, _subtract
+
+HOUR = 3600
+DAY = 86400
+
+
+class FakeChart:
+    """fetch_range stand-in serving hourly points (price = t / 1000) and recording every request."""
+
+    def __init__(self, delay: float = 0.0):
+        self.requests = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, coin_id, currency, start, end, timeout):
+        with self._lock:
+            self.requests.append((coin_id, currency, start, end, timeout))
+        if self.delay:
+            time.sleep(self.delay)
+        times = range(-(-start // HOUR) * HOUR, end + 1, HOUR)
+        return {
+            "prices": [[t * 1000, t / 1000] for t in times],
+            "market_caps": [[t * 1000, 1e9] for t in times],
+            "total_volumes": [[t * 1000, 1e6] for t in times],
+        }
+
+
+def past_window(days_ago: int, days: int):
+    """A window of whole hours well in the past, away from the unpublished latest point."""
+    end = (int(time.time()) // HOUR) * HOUR - days_ago * DAY
+    return end - days * DAY, end
+
+
+def test_covered_window_is_served_without_fetching(tmp_path):
+    chart = FakeChart()
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(20, 10)
+
+    first = store.window("bitcoin", start, end)
+    second = store.window("bitcoin", start, end)
+
+    assert len(chart.requests) == 1
+    assert store.fetches == 1
+    assert len(first) == len(second) == 10 * 24 + 1
+    assert np.array_equal(first, second)
+    assert first["t"][0] == start and first["t"][-1] == end
+    assert np.all(np.diff(first["t"]) == HOUR)
+    assert store.missing_ranges("bitcoin", start, end) == []
+
+
+def test_only_gaps_are_fetched(tmp_path):
+    chart = FakeChart()
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(20, 10)
+    store.window("bitcoin", start, end)
+
+    wider = store.window("bitcoin", start - 3 * DAY, end + 2 * DAY)
+
+    assert store.fetches == 3
+    assert store.missing_ranges("bitcoin", start - 3 * DAY, end + 2 * DAY) == []
+    # Both edges were fetched separately, and the stored points have no duplicates
+    assert len(wider) == 15 * 24 + 1
+    assert len(np.unique(wider["t"])) == len(wider)
+    assert np.allclose(wider["price"], wider["t"] / 1000)
+
+
+def test_short_gaps_use_the_minimum_range_and_keep_only_gap_points(tmp_path):
+    chart = FakeChart()
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(20, 10)
+    store.window("bitcoin", start, end)
+
+    store.window("bitcoin", start, end + 3 * HOUR)
+
+    _, _, request_start, request_end, _ = chart.requests[-1]
+    # A 3-hour gap is requested as more than a day, so CoinGecko keeps answering hourly
+    assert request_end - request_start > DAY
+    assert len(store.window("bitcoin", start, end + 3 * HOUR, fetch_missing=False)) == 10 * 24 + 4
+
+
+def test_long_gaps_are_split_into_chunks(tmp_path):
+    chart = FakeChart()
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(5, 200)
+
+    store.ensure("bitcoin", start, end, resolution="1h")
+
+    assert len(chart.requests) == 3  # at most 90 days per hourly request
+    assert all(request[3] - request[2] <= 90 * DAY for request in chart.requests)
+
+
+def test_store_is_reopened_offline(tmp_path):
+    start, end = past_window(20, 2)
+    OHLCVStore(tmp_path, fetch_range=FakeChart()).window("ethereum", start, end, currency="eur")
+
+    def unreachable(*args):
+        raise AssertionError("covered window was fetched again")
+
+    reopened = OHLCVStore(tmp_path, fetch_range=unreachable)
+    points = reopened.window("ethereum", start, end, currency="eur")
+
+    assert len(points) == 2 * 24 + 1
+    assert len(reopened.window("ethereum", start, end, currency="usd", fetch_missing=False)) == 0
+
+
+def test_timeout_is_passed_to_every_request(tmp_path):
+    chart = FakeChart()
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(20, 2)
+
+    store.window("bitcoin", start, end, timeout=2.5)
+
+    assert [request[4] for request in chart.requests] == [2.5]
+
+
+def test_concurrent_requests_for_a_series_fetch_once(tmp_path):
+    chart = FakeChart(delay=0.1)
+    store = OHLCVStore(tmp_path, fetch_range=chart)
+    start, end = past_window(20, 2)
+
+    threads = [threading.Thread(target=store.window, args=("bitcoin", start, end)) for _ in range(4)]
+    threads.append(threading.Thread(target=store.window, args=("solana", start, end)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(request[0] for request in chart.requests) == ["bitcoin", "solana"]
+
+
+def test_interval_helpers():
+    assert _subtract(0, 100, [[10, 20], [50, 60]]) == [(0, 10), (20, 50), (60, 100)]
+    assert _subtract(0, 100, [[0, 100]]) == []
+    assert _merge([[50, 60], [0, 10], [5, 20]]) == [[0, 20], [50, 60]]
@@ -0,0 +1,130 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from root_agent.tools.recorder import (
+    Cassette, CassetteMiss, RecordedError, active_cassette, recorded, recorded_async, request_key, use_cassette,
+)
+
+
+def record(path, calls):
+    """Records `calls` ((service, key, route, fn) tuples) and returns their outcomes."""
+    outcomes = []
+    with use_cassette(Cassette(path, mode="record")):
+        for service, key, route, fn in calls:
+            try:
+                outcomes.append(recorded(service, key, fn, route=route))
+            except Exception as e:
+                outcomes.append(e)
+    return outcomes
+
+
+def unreachable():
+    raise AssertionError("a replayed call reached the network")
+
+
+def fail():
+    raise ConnectionError("HTTP 503")
+
+
+def test_request_key_ignores_dict_order():
+    assert request_key({"a": 1, "b": [1, 2]}) == request_key({"b": [1, 2], "a": 1})
+    assert request_key({"a": 1}) != request_key({"a": 2})
+    assert len(request_key("x")) == 16
+
+
+def test_record_and_replay_round_trip(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    record(path, [
+        ("coingecko", {"path": "coins/bitcoin"}, "coins/bitcoin", lambda: {"id": "bitcoin", "price": 1.5}),
+        ("cryptopanic", {"kind": "news"}, "posts", lambda: {"results": []}),
+    ])
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+    assert header["calls"] == 2
+
+    cassette = Cassette(path, latency_scale=0)
+    with use_cassette(cassette):
+        assert active_cassette() is cassette
+        assert recorded("coingecko", {"path": "coins/bitcoin"}, unreachable) == {"id": "bitcoin", "price": 1.5}
+        assert recorded("cryptopanic", {"kind": "news"}, unreachable) == {"results": []}
+    assert active_cassette() is None
+    assert cassette.stats() == {"calls": {"coingecko": 1, "cryptopanic": 1}, "misses": {}, "entries": 2}
+
+
+def test_repeated_calls_replay_in_order_then_repeat_the_last(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    responses = iter([1, 2])
+    record(path, [("svc", "same", None, lambda: next(responses))] * 2)
+
+    with use_cassette(Cassette(path, latency_scale=0)):
+        assert [recorded("svc", "same", unreachable) for _ in range(3)] == [1, 2, 2]
+
+
+def test_errors_are_recorded_and_raised_again(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    outcomes = record(path, [("coingecko", "down", None, fail)])
+    assert isinstance(outcomes[0], ConnectionError)
+
+    with use_cassette(Cassette(path, latency_scale=0)):
+        with pytest.raises(RecordedError, match="ConnectionError: HTTP 503"):
+            recorded("coingecko", "down", unreachable)
+
+
+def test_unrecorded_key_falls_back_to_its_route(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    record(path, [("coingecko", {"from": 100}, "market_chart/range", lambda: {"prices": [[1, 2]]})])
+
+    cassette = Cassette(path, latency_scale=0)
+    with use_cassette(cassette):
+        # Range requests depend on the current time, so only their route matches on replay
+        assert recorded("coingecko", {"from": 200}, unreachable, route="market_chart/range") == {"prices": [[1, 2]]}
+        with pytest.raises(CassetteMiss):
+            recorded("coingecko", {"from": 300}, unreachable, route="coins/bitcoin")
+    assert cassette.stats()["misses"] == {"coingecko": 1}
+
+
+def test_replay_sleeps_the_scaled_latency(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+    record(path, [("svc", "slow", None, lambda: "ok")])
+    cassette = Cassette(path, latency_scale=2.0)
+    entry = cassette.lookup("svc", "slow")
+
+    assert cassette.delay({**entry, "latency": 0.25}) == 0.5
+    assert Cassette(path, latency_scale=0).delay({**entry, "latency": 0.25}) == 0.0
+
+
+def test_async_calls_are_recorded_and_replayed(tmp_path):
+    path = str(tmp_path / "cycle.jsonl.gz")
+
+    async def fetch():
+        return {"messages": 3}
+
+    async def unreachable_async():
+        raise AssertionError("a replayed call reached the network")
+
+    async def run(mode, fn):
+        with use_cassette(Cassette(path, mode=mode, latency_scale=0)):
+            return await recorded_async("telegram", {"channel": "news"}, fn)
+
+    assert asyncio.run(run("record", fetch)) == {"messages": 3}
+    assert asyncio.run(run("replay", unreachable_async)) == {"messages": 3}
+
+
+def test_without_a_cassette_calls_go_through():
+    assert active_cassette() is None
+    assert recorded("svc", "key", lambda: 42) == 42
+
+
+def test_unknown_mode_and_fixture_version_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cassette mode"):
+        Cassette(str(tmp_path / "x.jsonl.gz"), mode="rewrite")
+
+    path = str(tmp_path / "old.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"version": 0}) + "\n")
+    with pytest.raises(ValueError, match="Unsupported fixture version"):
+        Cassette(path)
@@ -0,0 +1,60 @@
+from root_agent.sub_agents.technical_analyst.tools.get_crypto_technical_data import (
+    _range_volatility, get_crypto_technical_data, get_crypto_technical_data_table,
+)
+
+
+def coin_response(symbol, price, **market_data):
+    return {"symbol": symbol, "market_cap_rank": 3,
+            "market_data": {"current_price": {"usd": price}, "ath": {"usd": price * 2, symbol: 1.0}, **market_data}}
+
+
+def test_range_volatility_is_zero_safe():
+    assert _range_volatility([[0, 100.0], [1, 110.0], [2, 105.0]]) == 10.0
+    assert _range_volatility([[0, 100.0]]) == 0.0
+    assert _range_volatility([[0, 0.0], [1, 110.0]]) == 0.0
+
+
+def test_compact_technical_data(coingecko):
+    coingecko.responses["coins/bitcoin"] = coin_response("btc", 60000.123456, high_24h={"usd": 61000.0})
+
+    data = get_crypto_technical_data("bitcoin", "btc")
+
+    assert data["current_price_usd"] == 60000.1
+    assert (data["ath_usd"], data["ath_coin"], data["high_24h_usd"]) == (120000, 1.0, 61000.0)
+    assert data["volatility_1d_valid"] is True and data["volatility_1d"] > 0
+    assert "missing_fields" not in data and "low_24h_usd" not in data
+
+
+def test_null_nested_objects_are_treated_as_missing(coingecko):
+    coingecko.responses["coins/delisted"] = {"symbol": "dls", "market_data": {"current_price": None, "ath": None}}
+    coingecko.responses["coins/empty"] = {"symbol": "emp", "market_data": None}
+
+    delisted = get_crypto_technical_data("delisted", "dls")
+    empty = get_crypto_technical_data("empty", "emp")
+
+    assert "error" not in delisted and "current_price_usd" not in delisted
+    assert "error" not in empty and "ath_usd" not in empty
+    assert empty["volatility_1d_valid"] is True
+
+
+def test_zero_prices_make_the_volatility_invalid(coingecko):
+    coingecko.responses["coins/bitcoin"] = coin_response("btc", 60000.0)
+    coingecko.chart_price = lambda coin_id, t: 0.0 if t % 900 == 0 else 100.0
+
+    data = get_crypto_technical_data("bitcoin", "btc")
+
+    assert data["volatility_1d"] == 0.0
+    assert data["volatility_1d_valid"] is False
+
+
+def test_unexpected_data_is_reported_per_coin(coingecko):
+    coingecko.responses["coins/bitcoin"] = coin_response("btc", 60000.0)
+    coingecko.responses["coins/broken"] = ["not", "a", "coin"]
+
+    assert get_crypto_technical_data("broken", "brk")["error"].startswith("unexpected CoinGecko data: AttributeError")
+
+    table = get_crypto_technical_data_table(["bitcoin", "broken"])
+
+    assert list(table["rows"]) == ["bitcoin"]
+    assert table["errors"]["broken"].startswith("unexpected CoinGecko data")
+    assert table["rows"]["bitcoin"][table["columns"].index("current_price_usd")] == 60000.0
@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from root_agent.sub_agents.technical_analyst.tools.get_crypto_technical_data import (
+    get_crypto_technical_data, get_crypto_technical_data_table,
+)
+from root_agent.tools.market_snapshot import get_market_snapshot
+from root_agent.tools.recorder import recorded
+from root_agent.tools.tracing import Tracer, export_traces, submit_in_context, traced, tracer
+
+
+def coin_response(coin_id, symbol, price):
+    return {"id": coin_id, "symbol": symbol, "market_cap_rank": 1,
+            "market_data": {"current_price": {"usd": price}, "high_24h": {"usd": price * 1.1},
+                            "low_24h": {"usd": price * 0.9}}}
+
+
+def finished(name):
+    return [span for span in tracer.drain_spans() if span.name == name]
+
+
+def test_tasks_submitted_in_context_count_towards_the_callers_span():
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    @traced
+    def fan_out():
+        futures = [submit_in_context(pool, recorded, "svc", i, lambda: {"ok": True}) for i in range(3)]
+        return [future.result() for future in futures]
+
+    @traced
+    def fan_out_without_context():
+        return pool.submit(recorded, "svc", 0, lambda: {"ok": True}).result()
+
+    tracer.drain_spans()
+    fan_out()
+    fan_out_without_context()
+    pool.shutdown()
+
+    spans = {span.name: span for span in tracer.drain_spans()}
+    assert spans["fan_out"].outbound == {"svc": 3}
+    assert spans["fan_out_without_context"].http_requests == 0
+
+
+def test_fan_out_tools_report_their_outbound_calls(coingecko):
+    coingecko.responses["coins/bitcoin"] = coin_response("bitcoin", "btc", 60000.0)
+    coingecko.responses["coins/ethereum"] = coin_response("ethereum", "eth", 3000.0)
+    tracer.drain_spans()
+
+    get_crypto_technical_data("bitcoin", "btc")
+    [span] = finished("get_crypto_technical_data")
+    # /coins/bitcoin and the market chart range, both fetched on pool threads
+    assert span.outbound == {"coingecko": 2}
+    assert span.http_requests == 2
+
+    get_crypto_technical_data_table(["bitcoin", "ethereum"])
+    [span] = finished("get_crypto_technical_data_table")
+    # bitcoin is served from the cache and the store; ethereum needs both requests
+    assert span.outbound == {"coingecko": 2}
+
+
+def test_snapshot_fallback_reports_its_outbound_calls(coingecko):
+    coingecko.responses["coins/markets"] = ConnectionError("HTTP 503")
+    coingecko.responses["coins/solana"] = coin_response("solana", "sol", 150.0)
+    tracer.drain_spans()
+
+    snapshot = get_market_snapshot(["solana"])
+
+    assert snapshot["fallback"] == ["solana"]
+    [span] = finished("get_market_snapshot")
+    assert span.outbound == {"coingecko": 2}
+    assert span.http_errors == 1
+
+
+def test_payload_bytes_are_measured_only_when_exporting(monkeypatch, tmp_path):
+    local = Tracer(measure_payloads=None)
+    monkeypatch.delenv("TRACING_EXPORT_DIR", raising=False)
+    span = local.start_span("tool")
+    local.record_outbound("svc", {"a": 1})
+    local.end_span(span)
+    assert (span.http_requests, span.bytes_received) == (1, 0)
+
+    monkeypatch.setenv("TRACING_EXPORT_DIR", str(tmp_path))
+    span = local.start_span("tool")
+    local.record_outbound("svc", {"a": 1})
+    local.end_span(span)
+    assert span.bytes_received == len('{"a":1}')
+
+
+def test_export_appends_each_batch_of_spans_once(tmp_path):
+    @traced
+    def tool():
+        return None
+
+    tracer.drain_spans()
+    tool()
+    export_traces(str(tmp_path))
+    tool()
+    tool()
+    export_traces(str(tmp_path))
+    export_traces(str(tmp_path))
+
+    lines = (tmp_path / "spans.otlp.jsonl").read_text().splitlines()
+    counts = [len(json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]) for line in lines]
+    assert counts == [1, 2]
+    assert tracer.finished_spans() == []
+    assert 'root_agent_tool_calls_total{tool="tool",kind="tool",status="ok"}' in (tmp_path / "tool_metrics.prom").read_text()
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from root_agent.sub_agents.trader.tools.trade_journal import TradeJournal, parse_log_line
+
+
+def test_record_and_history_round_trip():
+    journal = TradeJournal(":memory:")
+    details = {"quantity": 0.5, "rationale": "breakout"}
+
+    journal.record("trade", action="BUY", coin_id="Bitcoin", symbol="BTC", price="67000.5", currency="usd",
+                   details=details, timestamp="2026-01-02T10:00:00Z")
+
+    assert journal.history() == [{
+        "timestamp": "2026-01-02T10:00:00Z",
+        "kind": "trade",
+        "action": "buy",
+        "coin_id": "bitcoin",
+        "symbol": "btc",
+        "price": 67000.5,
+        "currency": "usd",
+        "details": details,
+    }]
+
+
+def test_daily_counters_follow_entry_kinds():
+    journal = TradeJournal(":memory:")
+    day = "2026-01-02"
+    for kind, action in (("trade", "buy"), ("trade", "sell"), ("hold", "hold"), ("rejection", "buy"), ("execution", "buy")):
+        journal.record(kind, action=action, coin_id="bitcoin", timestamp=f"{day}T12:00:00Z")
+    journal.record("trade", action="buy", coin_id="bitcoin", timestamp="2026-01-03T00:00:01Z")
+
+    assert journal.daily_counts(day) == {"day": day, "trades": 2, "holds": 1, "rejections": 1}
+    assert journal.trade_count("2026-01-03") == 1
+    assert journal.trade_count("2026-01-04") == 0
+
+
+def test_history_filters_newest_first():
+    journal = TradeJournal(":memory:")
+    journal.record("trade", action="buy", coin_id="bitcoin", timestamp="2026-01-01T00:00:00Z")
+    journal.record("trade", action="sell", coin_id="ethereum", timestamp="2026-01-02T00:00:00Z")
+    journal.record("trade", action="sell", coin_id="bitcoin", timestamp="2026-01-02T01:00:00Z")
+
+    assert [e["timestamp"] for e in journal.history(coin_id="BITCOIN")] == ["2026-01-02T01:00:00Z", "2026-01-01T00:00:00Z"]
+    assert [e["coin_id"] for e in journal.history(action="sell")] == ["bitcoin", "ethereum"]
+    assert [e["coin_id"] for e in journal.history(day="2026-01-02", limit=1)] == ["bitcoin"]
+
+
+def test_unknown_kind_is_rejected():
+    journal = TradeJournal(":memory:")
+    with pytest.raises(ValueError):
+        journal.record("transfer")
+    assert journal.history() == []
+
+
+def test_entries_persist_across_reopen(tmp_path):
+    db_path = str(tmp_path / "journal.sqlite")
+    journal = TradeJournal(db_path)
+    journal.record("hold", action="hold", coin_id="solana", timestamp="2026-01-02T00:00:00Z")
+    journal.close()
+
+    reopened = TradeJournal(db_path)
+    assert reopened.history()[0]["coin_id"] == "solana"
+    assert reopened.daily_counts("2026-01-02")["holds"] == 1
+    reopened.close()
+
+
+def test_legacy_log_is_imported_once(tmp_path):
+    log_path = tmp_path / "trade_log.txt"
+    rejection = {"timestamp": "2026-01-02T09:00:00Z", "policy_status": "REJECTED",
+                 "trade_request": {"action": "buy", "asset": {"coin_id": "bitcoin", "symbol": "btc"}}}
+    log_path.write_text(
+        "2026-01-02T08:00:00Z - BOUGHT - bitcoin (btc) at 67000.0 usd\n"
+        "not a log line\n"
+        + json.dumps(rejection) + "\n",
+        encoding="utf-8",
+    )
+    db_path = str(tmp_path / "journal.sqlite")
+
+    TradeJournal(db_path, legacy_log_path=str(log_path)).close()
+    journal = TradeJournal(db_path, legacy_log_path=str(log_path))
+
+    assert [e["kind"] for e in journal.history()] == ["rejection", "trade"]
+    assert journal.daily_counts("2026-01-02") == {"day": "2026-01-02", "trades": 1, "holds": 0, "rejections": 1}
+    journal.close()
+
+
+def test_parse_log_line_keeps_rejection_reason():
+    parsed = parse_log_line("2026-01-02T08:00:00Z - REJECTED - ethereum (eth) at 3500 usd - Reason: daily limit")
+
+    assert parsed[:7] == ("rejection", "2026-01-02T08:00:00Z", None, "ethereum", "eth", "3500", "usd")
+    assert parsed[7]["rejection_reason"] == "daily limit"
+    assert parse_log_line("   ") is None
@@ -0,0 +1,92 @@
+import pytest
+
+from root_agent.backtest.engine import replay_environment
+from root_agent.sub_agents.technical_analyst.tools.volatility import pin_volatility_table
+from root_agent.sub_agents.trader.tools.simulated_exchange import SimulatedExchange
+from root_agent.tools import trade_pipeline
+from root_agent.tools.market_data_cache import market_data_cache
+from root_agent.tools.trade_pipeline import submit_trade
+
+
+@pytest.fixture
+def stack(tmp_path):
+    """A simulated exchange and in-memory journal behind the trading stack, as in a backtest."""
+    exchange = SimulatedExchange({"USDT": 10000.0}, {"BTC": 50000.0})
+    with replay_environment(exchange, "aggressive", str(tmp_path)) as journal:
+        market_data_cache.prime_prices({"bitcoin": 50000.0})
+        pin_volatility_table({"BTC": {"1d": {"range": 4.0, "valid": True, "bars": 288}}})
+        yield exchange, journal
+
+
+def buy(quantity=0.01, **overrides):
+    return submit_trade(**{"action": "buy", "coin_id": "bitcoin", "coin_market_cap": 1e12, "symbol": "BTC",
+                           "quantity": quantity, "entry_price": 50000.0, "stop_price": 47500.0,
+                           "order_type": "market", **overrides})
+
+
+def test_approved_request_is_executed(stack):
+    exchange, journal = stack
+
+    result = buy()
+
+    assert result["status"] == "executed"
+    assert result["policy"]["status"] == "approved"
+    assert result["trade_request"]["position"]["position_size_percent"] == pytest.approx(5.0)
+    assert len(exchange.trades) == 1
+    assert journal.trade_count() == 1
+
+
+def test_rejected_request_is_logged_and_not_executed(stack):
+    exchange, journal = stack
+
+    result = buy(quantity=0.1)  # 50% of the portfolio, above the 35% limit
+
+    assert result["status"] == "rejected"
+    assert result["policy"]["field"] == "position_size_percent"
+    assert result["execution"] is None and "log_error" not in result
+    assert exchange.trades == []
+    assert [entry["kind"] for entry in journal.history()] == ["rejection"]
+
+
+def test_rejection_stays_rejected_when_it_cannot_be_logged(stack, monkeypatch):
+    exchange, journal = stack
+
+    def broken_log(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(trade_pipeline, "log_policy_rejection", broken_log)
+
+    result = buy(symbol="SHIB", coin_id="shiba-inu")
+
+    assert result["status"] == "rejected"
+    assert result["policy"]["field"] == "asset_symbol"
+    assert result["log_error"] == "disk full"
+    assert exchange.trades == []
+
+
+def test_formatting_and_validation_errors(stack, monkeypatch):
+    exchange, journal = stack
+
+    result = buy(action=None)
+    assert result["status"] == "error"
+    assert result["reason"].startswith("Trade request formatting error")
+
+    def broken_policy(trade_request):
+        raise KeyError("risk_management")
+
+    monkeypatch.setattr(trade_pipeline, "validate_policy", broken_policy)
+    result = buy()
+    assert result["status"] == "rejected"
+    assert result["reason"].startswith("Policy validation error")
+    assert exchange.trades == []
+
+
+def test_unknown_volatility_is_rejected(stack):
+    exchange, journal = stack
+    pin_volatility_table({})  # no estimate for BTC
+
+    result = buy(volatility_1d="N/A")
+
+    assert result["status"] == "rejected"
+    assert result["policy"]["field"] == "volatility_1d"
+    assert exchange.trades == []
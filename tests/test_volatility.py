@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from root_agent.sub_agents.policy_enforcer.tools.policy_loading import compile_policy, policy_path
+from root_agent.sub_agents.policy_enforcer.tools.policy_validator import _validate
+from root_agent.sub_agents.technical_analyst.tools import volatility
+from root_agent.sub_agents.technical_analyst.tools.volatility import (
+    estimate, get_volatility_table, pin_volatility_table, reset_volatility_table,
+)
+
+
+def policy(**trading_rules):
+    with open(policy_path("aggressive"), encoding="utf-8") as f:
+        document = json.load(f)
+    document["trading_rules"].update(trading_rules)  # halt at 100% unless overridden
+    return compile_policy(document, "aggressive")
+
+
+def request(volatility_1d=0.0):
+    return {"action": "buy",
+            "asset": {"symbol": "btc", "coin_market_cap": 1e12, "current_price_usd": 50000.0, "volatility_1d": volatility_1d},
+            "position": {"quantity": 0.01, "position_size_percent": 5.0, "entry_price": 50000.0,
+                         "stop_loss_price": 47500.0, "order_type": "market"}}
+
+
+def pinned(range_percent, valid=True):
+    return {"BTC": {"1d": {"range": range_percent, "valid": valid, "bars": 24}}}
+
+
+@pytest.fixture
+def table():
+    yield pin_volatility_table
+    pin_volatility_table(None)
+    reset_volatility_table()
+
+
+# Policy gate
+
+def test_gate_approves_below_the_halt_and_halts_above_it(table):
+    table(pinned(4.0))
+    approved = _validate(request(volatility_1d=500.0), policy(), 0)
+    assert approved["status"] == "approved"
+    assert "volatility_check" in approved["checked_validations"]
+
+    # The cached table is authoritative over the request's figure
+    table(pinned(150.0))
+    halted = _validate(request(volatility_1d=1.0), policy(), 0)
+    assert (halted["status"], halted["field"], halted["actual"], halted["limit"]) == ("rejected", "volatility_1d", 150.0, 100.0)
+
+
+def test_gate_falls_back_to_the_request_only_for_real_numbers(table):
+    table(pinned(0.0, valid=False))
+
+    assert _validate(request(volatility_1d=120.0), policy(), 0)["actual"] == 120.0
+    assert _validate(request(volatility_1d=3.0), policy(), 0)["status"] == "approved"
+    for unknown in ("N/A", None, float("nan"), 0.0, True):
+        rejected = _validate(request(volatility_1d=unknown), policy(), 0)
+        assert (rejected["status"], rejected["field"], rejected["actual"]) == ("rejected", "volatility_1d", None)
+
+
+def test_unknown_volatility_can_be_allowed_by_the_policy(table):
+    table({})
+
+    result = _validate(request(volatility_1d="N/A"), policy(allow_unknown_volatility=True), 0)
+
+    assert result["status"] == "approved"
+    assert result["unchecked_validations"] == ["volatility_check"]
+
+
+# Estimators
+
+def bars(*closes):
+    """(4, assets, bars) open/high/low/close with each bar's open at the previous close and a +-1% high/low."""
+    close = np.array(closes, dtype=float)
+    open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    return open_, np.maximum(open_, close) * 1.01, np.minimum(open_, close) * 0.99, close
+
+
+def test_estimate_on_synthetic_bars():
+    result = estimate(*bars([100.0, 102.0, 101.0, 103.0, 100.0, 104.0], [50.0] * 6))
+
+    assert result["valid"].tolist() == [True, True]
+    assert result["bars"].tolist() == [6, 6]
+    assert result["range"][0] == pytest.approx((104.0 * 1.01 / (100.0 * 0.99) - 1) * 100, abs=1e-3)
+    assert result["range"][1] == pytest.approx((1.01 / 0.99 - 1) * 100, abs=1e-3)
+    assert result["close_to_close"][1] == 0.0
+    assert result["close_to_close"][0] > result["close_to_close"][1]
+    assert result["parkinson"][0] > 0 and result["garman_klass"][0] > 0
+
+
+def test_estimate_marks_sparse_or_non_positive_bars_invalid():
+    nan = float("nan")
+    sparse = bars([100.0, nan, nan, nan, nan, 101.0])
+    assert not estimate(*sparse)["valid"][0]
+
+    zero = estimate(*bars([100.0, 101.0, 0.0, 102.0, 101.0, 100.0]))
+    assert not zero["valid"][0]
+    assert {name: float(zero[name][0]) for name in volatility.ESTIMATORS} == dict.fromkeys(volatility.ESTIMATORS, 0.0)
+
+
+# Cached table
+
+def test_expired_table_is_served_while_it_refreshes_in_the_background(table, monkeypatch):
+    assets = {"BTC": "bitcoin"}
+    computed, release = [], threading.Event()
+
+    def compute(assets):
+        computed.append(threading.current_thread().name)
+        if len(computed) == 2:
+            release.wait(5)
+        return pinned(float(len(computed)))
+
+    monkeypatch.setattr(volatility, "_whitelisted_assets", lambda: assets)
+    monkeypatch.setattr(volatility, "compute_volatility_table", compute)
+    reset_volatility_table()
+
+    assert get_volatility_table() == pinned(1.0)  # cold: computed synchronously
+    assert get_volatility_table() == pinned(1.0)  # fresh
+    assert len(computed) == 1
+
+    # Expired but within the stale window: the old table is served, one refresh starts
+    assert get_volatility_table(max_age_seconds=0) == pinned(1.0)
+    assert get_volatility_table(max_age_seconds=0) == pinned(1.0)
+    release.set()
+    for _ in range(100):
+        if get_volatility_table() == pinned(2.0):
+            break
+        time.sleep(0.01)
+    assert get_volatility_table() == pinned(2.0)
+    assert computed[1] == "volatility-refresh" and len(computed) == 2
+
+    # Past the stale window the caller waits for a new table
+    assert get_volatility_table(max_age_seconds=0, max_stale_seconds=0) == pinned(3.0)
+    assert computed[2] == threading.current_thread().name
@@ -0,0 +1,113 @@
+import json
+
+from root_agent.watcher import (
+    CryptoPanicNewsSource, NewsBurstTrigger, NewsItem, PriceMoveTrigger, PriceTick, ReplaySource,
+    VolatilitySpikeTrigger, Watcher,
+)
+from root_agent.watcher.events import event_to_dict
+
+
+def news(i, *assets, timestamp=0.0, source="cryptopanic"):
+    return NewsItem(id=str(i), source=source, title=f"post {i}", assets=assets or ("BTC",), timestamp=timestamp)
+
+
+def test_price_move_fires_beyond_the_threshold_within_the_window():
+    trigger = PriceMoveTrigger(threshold_percent=3.0, window_seconds=3600)
+
+    assert trigger.observe(PriceTick("BTC", 100.0, timestamp=0)) == []
+    assert trigger.observe(PriceTick("BTC", 102.9, timestamp=600)) == []
+    [fired] = trigger.observe(PriceTick("BTC", 96.0, timestamp=1200))
+    assert (fired.asset, fired.kind, round(fired.value, 2)) == ("BTC", "price_move", -4.0)
+
+    # The earlier ticks have left the window; 96 -> 98 is a 2% move
+    assert trigger.observe(PriceTick("BTC", 98.0, timestamp=5000)) == []
+
+
+def test_volatility_spike_fires_when_recent_returns_are_wider_than_the_baseline():
+    trigger = VolatilitySpikeTrigger(ratio=2.5, short_ticks=5, baseline_ticks=40)
+    fired = []
+    for t in range(40):
+        price = 100.0 + (0.1 if t % 2 else 0.0)
+        fired += trigger.observe(PriceTick("ETH", price, timestamp=t))
+    assert fired == []
+
+    for t in range(40, 45):
+        fired += trigger.observe(PriceTick("ETH", 100.0 + (3.0 if t % 2 else 0.0), timestamp=t))
+    assert fired and fired[0].kind == "volatility_spike" and fired[0].value > 2.5
+
+
+def test_news_burst_counts_distinct_whitelisted_items():
+    trigger = NewsBurstTrigger(whitelist=["btc"], min_posts=3, window_seconds=1800)
+
+    assert trigger.observe(news(1, "BTC", "DOGE", timestamp=0)) == []
+    assert trigger.observe(news(1, "BTC", timestamp=10)) == []  # same post again
+    assert trigger.observe(news(2, "DOGE", timestamp=20)) == []  # not whitelisted
+    assert trigger.observe(news(3, "BTC", timestamp=30)) == []
+    [fired] = trigger.observe(news(4, "BTC", "DOGE", timestamp=40))
+    assert (fired.asset, fired.value) == ("BTC", 3)
+
+    # The same id from another source is a distinct item
+    assert trigger.observe(news(1, "BTC", timestamp=50, source="telegram"))[0].value == 4
+
+
+def test_watcher_replays_events_and_applies_the_cooldown():
+    ticks = [PriceTick("BTC", price, timestamp=t) for t, price in [(0, 100.0), (60, 105.0), (120, 111.0), (2000, 120.0)]]
+    ticks.append(PriceTick("DOGE", 1.0, timestamp=0))
+    ticks.append(PriceTick("DOGE", 2.0, timestamp=60))
+    cycles = []
+    watcher = Watcher([ReplaySource(sorted(ticks, key=lambda e: e.timestamp), batch_size=2)],
+                      [PriceMoveTrigger(threshold_percent=3.0)], whitelist=["BTC"],
+                      on_trigger=cycles.append, cooldown_seconds=1800)
+
+    watcher.run(poll_interval=0)
+
+    # 120.0 at t=2000 is past the cooldown; DOGE is not whitelisted
+    assert [(trigger.asset, trigger.timestamp) for trigger in cycles] == [("BTC", 60), ("BTC", 2000)]
+    assert watcher.events_seen == 6
+    assert list(watcher.fired) == cycles
+
+
+def test_watcher_keeps_polling_when_a_source_or_a_cycle_fails():
+    class BrokenSource:
+        def poll(self):
+            raise ConnectionError("HTTP 503")
+
+    def failing_cycle(trigger):
+        raise RuntimeError("model unavailable")
+
+    replay = ReplaySource([news(i, timestamp=i) for i in range(3)], batch_size=3)
+    watcher = Watcher([BrokenSource(), replay], [NewsBurstTrigger(["BTC"])], whitelist=["BTC"],
+                      on_trigger=failing_cycle)
+
+    [fired] = watcher.poll_once()
+
+    assert fired.kind == "news_burst"
+    assert replay.exhausted
+
+
+def test_replay_source_loads_jsonl_in_time_order(tmp_path):
+    path = tmp_path / "events.jsonl"
+    events = [news(1, "ETH", timestamp=50), PriceTick("BTC", 100.0, timestamp=10)]
+    path.write_text("".join(json.dumps(event_to_dict(event)) + "\n" for event in events))
+
+    source = ReplaySource.from_jsonl(path, batch_size=1)
+
+    assert source.poll() == [events[1]]
+    assert source.poll() == [events[0]]
+    assert source.exhausted and source.poll() == []
+
+
+def test_cryptopanic_source_emits_new_posts_and_tolerates_bad_timestamps():
+    posts = [
+        {"id": 1, "title": "Bitcoin ETF inflows", "published_at": "2024-05-01T12:00:00Z"},
+        {"id": 2, "title": "Ethereum upgrade", "published_at": None, "instruments": [{"code": "ETH"}]},
+        {"id": 3, "title": "Market wrap", "published_at": "yesterday"},
+    ]
+    source = CryptoPanicNewsSource({"BTC": "bitcoin", "ETH": "ethereum"}, fetch_posts=lambda: posts)
+
+    items = source.poll()
+
+    assert [(item.id, item.assets) for item in items] == [("1", ("BTC",)), ("2", ("ETH",)), ("3", ())]
+    assert items[0].timestamp == 1714564800.0
+    assert items[1].timestamp > items[0].timestamp and items[2].timestamp > items[0].timestamp
+    assert source.poll() == []